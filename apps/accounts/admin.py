@@ -1,11 +1,11 @@
 """
 Purpose: Django admin panel configuration
-Registers: User, Student, Company, University
+Registers: User, Student, Company, University, Skill
 """
 
 
 from django.contrib import admin
-from .models import User, Student, Company, University
+from .models import User, Student, Company, University, Skill, SkillAlias
 
 
 @admin.register(Student)
@@ -37,3 +37,16 @@ class UserAdmin(admin.ModelAdmin):
     list_display = ['username', 'user_type', 'email']
     list_filter = ['user_type']
     search_fields = ['username', 'email']
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    fields = ['alias']
+    extra = 1
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'normalized_name', 'created_at']
+    search_fields = ['name', 'normalized_name', 'aliases__normalized_alias']
+    inlines = [SkillAliasInline]
@@ -0,0 +1,14 @@
+# apps/accounts/apps.py
+"""
+Purpose: App configuration
+"""
+from django.apps import AppConfig
+
+class AccountsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.accounts'
+    label = 'accounts'
+
+    def ready(self):
+        # Connect signal handlers (skill catalogue upkeep)
+        from . import signals  # noqa: F401
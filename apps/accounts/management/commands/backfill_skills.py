@@ -0,0 +1,43 @@
+# apps/accounts/management/commands/backfill_skills.py
+# Populates the Skill catalogue and skill M2M relations from the legacy
+# comma-separated text fields. Works in pk order, one transaction per batch,
+# and prints a checkpoint after each batch; pass it back with --after to
+# resume an interrupted run. Safe to re-run: each batch rebuilds its rows.
+
+from django.core.management.base import BaseCommand
+from apps.accounts.models import Student
+from apps.accounts.skills import skill_sources, sync_skill_tags
+from apps.projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Backfills Skill rows and skill M2M relations for projects and students'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=['project', 'student', 'all'], default='all')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--after', type=int, default=0, help='Resume after this pk (single --model only)')
+
+    def handle(self, *args, **options):
+        models = {'project': [Project], 'student': [Student], 'all': [Project, Student]}[options['model']]
+        for model in models:
+            self.backfill(model, options['batch_size'], options['after'])
+
+    def backfill(self, model, batch_size, after):
+        label = model._meta.model_name
+        total = 0
+        while True:
+            # Only the text columns are needed to rebuild the relations
+            batch = list(
+                model.objects.filter(pk__gt=after).order_by('pk')
+                .only('pk', *[text for text, _ in skill_sources(model)])[:batch_size]
+            )
+            if not batch:
+                break
+            sync_skill_tags(batch)
+            after = batch[-1].pk
+            total += len(batch)
+            self.stdout.write(f'{label}: {total} synced, checkpoint --after {after}')
+
+        self.stdout.write(self.style.SUCCESS(f'{label}: done ({total} rows)'))
+
@@ -0,0 +1,65 @@
+# apps/accounts/management/commands/benchmark_university_students.py
+# Requests the university student management page, plain and with searches,
+# while the university grows, and prints latency and response size of each.
+# Both should stay flat: the page is one keyset page of rows, and a search
+# reads its matches off the LOWER(column) indexes. Rolled back at the end.
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from apps.projects.benchmarks import rolled_back, create_owners, seed_students, time_call
+from apps.projects.counters import reconcile
+
+SEARCHES = {
+    'all': {},
+    'pending': {'status': 'pending'},
+    'usn': {'search': 'USN00000042'},
+    'usn prefix': {'search': 'usn00001'},
+    'email': {'search': 'usn00000042@bench'},
+    'no match': {'search': 'zzz'},
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the university students page and its search as the university grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 50000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()  # lets the test client through ALLOWED_HOSTS
+        try:
+            with rolled_back():
+                self.run(options)
+        finally:
+            teardown_test_environment()
+
+    def run(self, options):
+        university, _ = create_owners()
+        client = Client()
+        client.force_login(university.user)
+        url = reverse('accounts:university_students')
+        seeded = 0
+        self.stdout.write(f'{"students":>9} {"request":<11} {"ms":>8} {"KB":>7} {"rows":>5}')
+
+        for size in sorted(options['sizes']):
+            students = seed_students(size - seeded, university)
+            # seed_students numbers USNs from 0 on every call; keep them unique
+            for student in students:
+                student.student_id = f'USN{seeded + int(student.student_id[3:]):08d}'
+                student.university_email = f'{student.student_id.lower()}@bench.invalid'
+            type(students[0]).objects.bulk_update(students, ['student_id', 'university_email'], batch_size=5000)
+            seeded = size
+            reconcile()
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+            for label, params in SEARCHES.items():
+                response = client.get(url, params)
+                ms = time_call(lambda: client.get(url, params), options['repeat'])
+                rows = len(response.context['students'])
+                self.stdout.write(f'{size:>9} {label:<11} {ms:>8.1f} {len(response.content) / 1024:>7.1f} {rows:>5}')
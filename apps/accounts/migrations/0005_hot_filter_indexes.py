@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_company_company_registration_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['verification_status', 'created_at'], name='company_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['created_at'], name='company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['university', 'verification_status', 'created_at'], name='student_uni_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'skills',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='preferred_domain_tags',
+            field=models.ManyToManyField(blank=True, related_name='interested_students', to='accounts.skill'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='students', to='accounts.skill'),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100)),
+                ('normalized_alias', models.CharField(max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='accounts.skill')),
+            ],
+            options={
+                'verbose_name_plural': 'Skill aliases',
+                'db_table': 'skill_aliases',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_skill_catalogue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['university', 'verification_status', 'student_id'], name='student_uni_status_usn_idx'),
+        ),
+    ]
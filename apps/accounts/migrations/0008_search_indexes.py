@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:22
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_student_roster_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='company_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(django.db.models.functions.text.Lower('company_registration_number'), name='company_reg_no_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(django.db.models.functions.text.Lower('contact_email'), name='company_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['university', 'created_at'], name='student_uni_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(models.F('university'), django.db.models.functions.text.Lower('student_id'), name='student_uni_usn_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(models.F('university'), django.db.models.functions.text.Lower('university_email'), name='student_uni_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('first_name'), name='user_first_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('last_name'), name='user_last_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+    ]
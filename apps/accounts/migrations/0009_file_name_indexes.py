@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='verification_document',
+            field=models.FileField(blank=True, db_index=True, help_text='Upload company registration certificate, GST certificate, or incorporation documents', null=True, upload_to='company_docs/'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='resume',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='resumes/'),
+        ),
+    ]
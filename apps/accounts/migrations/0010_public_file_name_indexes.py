@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_file_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='logo',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='companies/'),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='profile_picture',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='students/'),
+        ),
+        migrations.AlterField(
+            model_name='university',
+            name='logo',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='universities/'),
+        ),
+    ]
@@ -6,11 +6,16 @@ User (custom user model)
 Student (student profile)
 Company (company profile)
 University (university admin profile)
+Skill, SkillAlias (canonical skill catalogue shared with projects)
+AtomicSaveMixin (save() in one transaction with its post_save receivers)
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils.functional import cached_property
 
 #has a one to one connection to each type of user. when any type of user is created like uni etc then the User is also created cause uni is a type of user
 
@@ -30,16 +35,34 @@ class User(AbstractUser):
 
     class Meta:
         db_table = 'users'
+        indexes = [
+            # Student / company management search (apps/accounts/search.py)
+            models.Index(Lower('first_name'), name='user_first_name_lower_idx'),
+            models.Index(Lower('last_name'), name='user_last_name_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.get_user_type_display()})"
 
 
+class AtomicSaveMixin:
+    """
+    Runs save() and its post_save receivers in one transaction, so the status
+    counters they update (apps/projects/counters.py) commit or roll back
+    together with the row, inside a request or not.
+    """
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
 class University(models.Model):
     """University profile and settings"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='university_profile')
     name = models.CharField(max_length=200)
-    logo = models.ImageField(upload_to='universities/', blank=True, null=True)
+    logo = models.ImageField(upload_to='universities/', blank=True, null=True, db_index=True)
     address = models.TextField()
     website = models.URLField(blank=True)
     description = models.TextField(blank=True)
@@ -65,13 +88,61 @@ class University(models.Model):
         return self.name
 
 
+class Skill(models.Model):
+    """Canonical skill, referenced by Student and Project instead of free text"""
+    name = models.CharField(max_length=100)  # display form, as first seen
+    normalized_name = models.CharField(max_length=100, unique=True)  # case-folded lookup key
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'skills'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = Skill.normalize(self.name)
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def normalize(name):
+        """Case-fold and collapse whitespace: ' Machine  learning' -> 'machine learning'"""
+        return ' '.join(name.split()).casefold()[:100]
+
+    @classmethod
+    def lookup(cls, name):
+        """Find a skill by name or alias, or None"""
+        key = cls.normalize(name)
+        return (cls.objects.filter(normalized_name=key).first() or
+                cls.objects.filter(aliases__normalized_alias=key).first())
+
+
+class SkillAlias(models.Model):
+    """Alternative spelling that resolves to a canonical skill (e.g. 'js' -> JavaScript)"""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100)
+    normalized_alias = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        db_table = 'skill_aliases'
+        verbose_name_plural = 'Skill aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+    def save(self, *args, **kwargs):
+        self.normalized_alias = Skill.normalize(self.alias)
+        super().save(*args, **kwargs)
+
+
 # apps/accounts/models.py - UPDATE Company model
 
-class Company(models.Model):
+class Company(AtomicSaveMixin, models.Model):
     """Company profile"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='company_profile')
     name = models.CharField(max_length=200)
-    logo = models.ImageField(upload_to='companies/', blank=True, null=True)
+    logo = models.ImageField(upload_to='companies/', blank=True, null=True, db_index=True)
     industry = models.CharField(max_length=100)
     website = models.URLField(blank=True)
     description = models.TextField()
@@ -116,6 +187,7 @@ class Company(models.Model):
         upload_to='company_docs/',
         blank=True,
         null=True,
+        db_index=True,
         help_text="Upload company registration certificate, GST certificate, or incorporation documents"
     )
     rejection_reason = models.TextField(blank=True)
@@ -132,12 +204,23 @@ class Company(models.Model):
     class Meta:
         db_table = 'companies'
         verbose_name_plural = 'Companies'
+        indexes = [
+            models.Index(fields=['verification_status', 'created_at'], name='company_status_created_idx'),
+            # University companies page lists every company, newest first
+            models.Index(fields=['created_at'], name='company_created_idx'),
+            # University companies page search (apps/accounts/search.py)
+            models.Index(Lower('name'), name='company_name_lower_idx'),
+            models.Index(Lower('company_registration_number'), name='company_reg_no_lower_idx'),
+            models.Index(Lower('contact_email'), name='company_email_lower_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+
 # apps/accounts/models.py - UPDATE the Student model
 
-class Student(models.Model):
+class Student(AtomicSaveMixin, models.Model):
     """Student profile"""
     YEAR_CHOICES = (
         ('1', 'First Year'),
@@ -167,12 +250,15 @@ class Student(models.Model):
 
     # Profile
     bio = models.TextField(blank=True)
-    profile_picture = models.ImageField(upload_to='students/', blank=True, null=True)
-    resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='students/', blank=True, null=True, db_index=True)
+    resume = models.FileField(upload_to='resumes/', blank=True, null=True, db_index=True)
     portfolio_url = models.URLField(blank=True)
 
     # Skills
     skills = models.TextField(help_text="Comma-separated skills", blank=True)  # ← Make blank=True
+    # Canonical versions of skills / preferred_domains, kept in sync on save
+    skill_tags = models.ManyToManyField(Skill, related_name='students', blank=True)
+    preferred_domain_tags = models.ManyToManyField(Skill, related_name='interested_students', blank=True)
 
     # Stats
     projects_completed = models.IntegerField(default=0)
@@ -211,6 +297,19 @@ class Student(models.Model):
 
     class Meta:
         db_table = 'students'
+        indexes = [
+            # University students page: filter by status, newest first
+            models.Index(fields=['university', 'verification_status', 'created_at'],
+                         name='student_uni_status_created_idx'),
+            # Roster import: pending students of a university by USN
+            models.Index(fields=['university', 'verification_status', 'student_id'],
+                         name='student_uni_status_usn_idx'),
+            # University students page, unfiltered: newest first, one page at a time
+            models.Index(fields=['university', 'created_at'], name='student_uni_created_idx'),
+            # University students page search (apps/accounts/search.py)
+            models.Index(F('university'), Lower('student_id'), name='student_uni_usn_lower_idx'),
+            models.Index(F('university'), Lower('university_email'), name='student_uni_email_lower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.student_id if self.student_id else 'No ID'}"
@@ -219,6 +318,11 @@ class Student(models.Model):
         """Return skills as a list"""
         return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
 
+    @cached_property
+    def skills_list(self):
+        """Skills split once per instance (list templates read it several times)"""
+        return self.get_skills_list()
+
     def get_preferred_domains_list(self):
         """Return preferred domains as a list"""
         return [domain.strip() for domain in self.preferred_domains.split(',') if domain.strip()for domain in self.preferred_domains.split(',') if domain.strip()]
\ No newline at end of file
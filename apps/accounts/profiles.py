@@ -0,0 +1,56 @@
+"""
+Purpose: The logged-in user's role profile, loaded with the user
+Contains:
+
+PROFILE_FIELDS (user_type -> reverse one-to-one holding that role's profile)
+ProfileBackend (loads the session user with every profile in one joined query)
+profile_of (user -> their Student / Company / University, or None)
+ProfileMiddleware (sets request.profile)
+
+The session user is normally fetched on its own, and every hasattr(user,
+'student_profile') or user.company_profile after that is another query.
+ProfileBackend.get_user select_related()s the three profile relations, so
+the user and whichever profile they have come back in one query (the other
+two LEFT JOINs are cached as missing and never queried either). Views and
+mixins read request.profile, which is the profile matching user_type, or
+None for anonymous users and users whose profile was never created.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+PROFILE_FIELDS = {
+    'student': 'student_profile',
+    'company': 'company_profile',
+    'university': 'university_profile',
+}
+
+
+class ProfileBackend(ModelBackend):
+    """ModelBackend whose session user comes with its profile already joined"""
+
+    def get_user(self, user_id):
+        User = get_user_model()
+        try:
+            user = User._default_manager.select_related(*PROFILE_FIELDS.values()).get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def profile_of(user):
+    """The profile matching user.user_type, or None"""
+    if not user.is_authenticated:
+        return None
+    field = PROFILE_FIELDS.get(user.user_type)
+    return getattr(user, field, None) if field else None
+
+
+class ProfileMiddleware:
+    """Sets request.profile; goes after AuthenticationMiddleware"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = profile_of(request.user)
+        return self.get_response(request)
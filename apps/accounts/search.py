@@ -0,0 +1,78 @@
+"""
+Purpose: Prefix search for the university's student and company management pages
+Contains:
+
+MIN_SEARCH_LENGTH (shorter searches are ignored)
+prefix_range (case-folded prefix match on one column, as an index range)
+search_students (by name, USN, personal or university email)
+search_companies (by name, registration number or contact email)
+
+Every searchable column has an index on LOWER(column) (migration 0008, and
+the User / Student / Company Meta.indexes). A search term is case-folded and
+matched as a prefix: LOWER(column) >= 'term' AND LOWER(column) < 'tern', a
+range the database reads straight off that index. icontains / LIKE '%term%'
+can use no index, so it scanned every student of the university on every
+keystroke. Each alternative (name, USN, email, ...) is its own index range;
+the database combines them, so a search costs about as much as its matches,
+not as the university's roster.
+"""
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import User
+
+MIN_SEARCH_LENGTH = 2
+
+
+def prefix_range(field, prefix):
+    """Q for LOWER(field) starting with prefix (already lowercased), as a range"""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{'%s__gte' % field: prefix, '%s__lt' % field: upper})
+
+
+def _term(search):
+    search = ' '.join((search or '').split()).lower()
+    return search if len(search) >= MIN_SEARCH_LENGTH else ''
+
+
+def _users(term):
+    """Users whose first name, last name, 'first last' or email start with term"""
+    users = User.objects.alias(
+        first_key=Lower('first_name'), last_key=Lower('last_name'), email_key=Lower('email'),
+    )
+    condition = prefix_range('first_key', term) | prefix_range('last_key', term) | prefix_range('email_key', term)
+    first, _, last = term.partition(' ')
+    if last:
+        condition |= Q(first_key=first) & prefix_range('last_key', last)
+    return users.filter(condition).values('pk')
+
+
+def search_students(queryset, search):
+    """Students of queryset matching search by name, USN or email; all of them for a blank search"""
+    term = _term(search)
+    if not term:
+        return queryset
+    return queryset.alias(
+        usn_key=Lower('student_id'), university_email_key=Lower('university_email'),
+    ).filter(
+        Q(user__in=_users(term)) |
+        prefix_range('usn_key', term) |
+        prefix_range('university_email_key', term)
+    )
+
+
+def search_companies(queryset, search):
+    """Companies of queryset matching search by name, registration number or email"""
+    term = _term(search)
+    if not term:
+        return queryset
+    return queryset.alias(
+        name_key=Lower('name'),
+        registration_key=Lower('company_registration_number'),
+        contact_email_key=Lower('contact_email'),
+    ).filter(
+        prefix_range('name_key', term) |
+        prefix_range('registration_key', term) |
+        prefix_range('contact_email_key', term) |
+        Q(user__in=_users(term))
+    )
@@ -0,0 +1,17 @@
+"""
+Purpose: Model signal handlers for the accounts app
+Contains:
+
+Skill tag upkeep on Student save
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Student
+from .skills import sync_skill_tags
+
+
+@receiver(post_save, sender=Student)
+def sync_student_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'skills', 'preferred_domains'} & set(update_fields):
+        sync_skill_tags([instance])
@@ -0,0 +1,90 @@
+"""
+Purpose: Keep the Skill catalogue and the skill M2M relations in sync
+Contains:
+
+SKILL_SOURCES (which text field feeds which M2M relation)
+parse_skill_names (comma list -> de-duplicated names)
+resolve_skills (names -> Skill rows, creating missing ones in bulk)
+sync_skill_tags (rebuild the M2M rows for a batch of instances)
+
+Used by the post_save signals (one instance at a time) and by the
+backfill_skills command (a few hundred at a time). Either way a batch costs
+a fixed number of queries, not one per skill.
+"""
+from django.db import transaction
+
+from .models import Skill, SkillAlias, Student
+
+
+def skill_sources(model):
+    """[(text field, M2M field), ...] for a model that carries skill text"""
+    from apps.projects.models import Project
+
+    return {
+        Student: [('skills', 'skill_tags'), ('preferred_domains', 'preferred_domain_tags')],
+        Project: [('required_skills', 'skill_tags')],
+    }.get(model, [])
+
+
+def parse_skill_names(text):
+    """'Python, python ,Django' -> ['Python', 'Django'] (first spelling wins)"""
+    names = {}
+    for raw in (text or '').split(','):
+        name = ' '.join(raw.split())
+        key = Skill.normalize(name)
+        if key and key not in names:
+            names[key] = name[:100]
+    return list(names.values())
+
+
+def resolve_skills(names):
+    """Map normalized name -> Skill for every name, honouring aliases"""
+    keys = {Skill.normalize(name): name for name in names}
+    if not keys:
+        return {}
+
+    resolved = {
+        alias.normalized_alias: alias.skill
+        for alias in SkillAlias.objects.filter(normalized_alias__in=keys).select_related('skill')
+    }
+    wanted = [key for key in keys if key not in resolved]
+    existing = {skill.normalized_name: skill for skill in Skill.objects.filter(normalized_name__in=wanted)}
+
+    missing = [key for key in wanted if key not in existing]
+    if missing:
+        Skill.objects.bulk_create(
+            [Skill(name=keys[key], normalized_name=key) for key in missing],
+            ignore_conflicts=True,
+        )
+        existing.update(
+            (skill.normalized_name, skill) for skill in Skill.objects.filter(normalized_name__in=missing)
+        )
+
+    resolved.update(existing)
+    return resolved
+
+
+@transaction.atomic
+def sync_skill_tags(instances):
+    """Rebuild the skill M2M rows of instances (all of one model) from their text fields"""
+    instances = [instance for instance in instances if instance.pk]
+    if not instances:
+        return
+    model = type(instances[0])
+
+    for text_field, relation in skill_sources(model):
+        field = model._meta.get_field(relation)
+        through = field.remote_field.through
+        source_column = field.m2m_field_name() + '_id'
+        skill_column = field.m2m_reverse_field_name() + '_id'
+
+        parsed = {instance.pk: parse_skill_names(getattr(instance, text_field)) for instance in instances}
+        skills = resolve_skills([name for names in parsed.values() for name in names])
+
+        rows = []
+        for pk, names in parsed.items():
+            skill_ids = {skills[Skill.normalize(name)].pk for name in names}
+            rows.extend(through(**{source_column: pk, skill_column: skill_id}) for skill_id in skill_ids)
+
+        through.objects.filter(**{source_column + '__in': list(parsed)}).delete()
+        through.objects.bulk_create(rows, ignore_conflicts=True)
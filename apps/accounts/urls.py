@@ -9,6 +9,7 @@ Routes:
 /accounts/profile/ - View profile
 /accounts/profile/edit/ - Edit profile
 /accounts/university/students/ - Manage students
+/accounts/university/students/roster/ - Verify students from a USN/email roster
 /accounts/university/companies/ - Manage companies
 """
 from django.urls import path
@@ -43,6 +44,9 @@ urlpatterns = [
     path('university/projects/', views.UniversityProjectsView.as_view(), name='university_projects'),  # NEW
     path('university/students/', views.UniversityStudentsView.as_view(), name='university_students'),
     path('university/students/<int:student_id>/verify/',views.StudentVerificationActionView.as_view(),name='student_verification_action'),
+    path('university/students/verify/', views.BulkStudentVerificationView.as_view(),
+         name='bulk_student_verification'),
+    path('university/students/roster/', views.StudentRosterImportView.as_view(), name='student_roster_import'),
     # Company Admin URLs
     path('company/dashboard/', views.CompanyDashboardView.as_view(), name='company_dashboard'),
     path('company/projects/', views.CompanyProjectsView.as_view(), name='company_projects'),
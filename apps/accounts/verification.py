@@ -0,0 +1,182 @@
+"""
+Purpose: Student verification in bulk, by id list or from a university roster
+Contains:
+
+set_verification (approve/reject many students with one UPDATE)
+read_roster (stream (usn, email) rows out of an uploaded CSV or XLSX)
+verify_from_roster (hash-join a roster against pending students, approve matches)
+RosterReport (what verify_from_roster did, for the result page)
+
+Rosters are read row by row (csv.reader over the upload, openpyxl in
+read-only mode), so a 50,000-row sheet is never held as one document.
+Pending students are fetched in chunks with indexed IN lookups on
+(university, verification_status, student_id), keyed by USN in a dict, and
+every roster row is then probed against that dict. All matches are approved
+in batched UPDATEs inside one transaction.
+"""
+import csv
+import io
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from .models import Student
+from ..projects.counters import apply_deltas
+from ..projects.fragments import touch
+
+LOOKUP_CHUNK = 500
+MAX_REPORTED_ROWS = 200
+
+USN_HEADERS = {'usn', 'student_id', 'student id', 'usn / student id', 'roll number', 'roll no'}
+EMAIL_HEADERS = {'email', 'university_email', 'university email', 'official email', 'college email'}
+
+
+class RosterError(ValueError):
+    """The upload is not a roster we can read"""
+
+
+@transaction.atomic
+def set_verification(university, student_ids, action, rejection_reason=''):
+    """Approve or reject the given students of university; returns rows changed"""
+    if action == 'approve':
+        new_status, values = 'approved', dict(
+            is_verified=True, verification_status='approved',
+            verified_by=university, verified_at=timezone.now(), rejection_reason='',
+        )
+    elif action == 'reject':
+        new_status, values = 'rejected', dict(
+            is_verified=False, verification_status='rejected',
+            rejection_reason=rejection_reason or 'No reason provided',
+        )
+    else:
+        raise ValueError('Unknown verification action: %s' % action)
+
+    students = Student.objects.filter(university=university, pk__in=student_ids)
+    # update() skips the signals that keep the status counters; move them here
+    before = Counter(students.select_for_update().values_list('verification_status', flat=True))
+    changed = students.update(**values)
+    deltas = Counter()
+    for status, count in before.items():
+        deltas[('university', university.pk, 'student', status)] -= count
+        deltas[('university', university.pk, 'student', new_status)] += count
+    apply_deltas(deltas)
+    touch([('university', university.pk)] + [('student', pk) for pk in student_ids])
+    return changed
+
+
+def _normalize_usn(value):
+    return ''.join(str(value or '').split()).upper()
+
+
+def _normalize_email(value):
+    return str(value or '').strip().casefold()
+
+
+def _rows(upload):
+    """Raw cell rows of a CSV or XLSX upload, one at a time"""
+    name = upload.name.lower()
+    if name.endswith('.xlsx'):
+        try:
+            workbook = load_workbook(upload, read_only=True, data_only=True)
+        except Exception as exc:  # openpyxl raises several unrelated types for bad files
+            raise RosterError('Could not read the spreadsheet: %s' % exc)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    elif name.endswith('.csv'):
+        text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            yield from csv.reader(text)
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise RosterError('Could not read the CSV file: %s' % exc)
+        finally:
+            text.detach()
+    else:
+        raise RosterError('Upload a .csv or .xlsx file.')
+
+
+def read_roster(upload):
+    """
+    Yield (line number, usn, email) for each roster row. The first row is a
+    header if it names the columns; otherwise USN and email are columns 1 and 2.
+    """
+    usn_column, email_column = 0, 1
+    for line, row in enumerate(_rows(upload), start=1):
+        cells = [str(cell).strip() if cell is not None else '' for cell in (row or ())]
+        if not any(cells):
+            continue
+        if line == 1:
+            headers = [cell.casefold() for cell in cells]
+            if USN_HEADERS & set(headers):
+                usn_column = next(i for i, h in enumerate(headers) if h in USN_HEADERS)
+                email_column = next((i for i, h in enumerate(headers) if h in EMAIL_HEADERS), None)
+                if email_column is None:
+                    raise RosterError('The roster needs an email column next to the USN column.')
+                continue
+        usn = _normalize_usn(cells[usn_column] if usn_column < len(cells) else '')
+        email = _normalize_email(cells[email_column] if email_column < len(cells) else '')
+        yield line, usn, email
+
+
+@dataclass
+class RosterReport:
+    rows: int = 0
+    approved: int = 0
+    # (line, usn, email, reason) for rows that did not approve anyone
+    mismatches: list = field(default_factory=list)
+    mismatch_count: int = 0
+
+    def mismatch(self, line, usn, email, reason):
+        self.mismatch_count += 1
+        if len(self.mismatches) < MAX_REPORTED_ROWS:
+            self.mismatches.append((line, usn, email, reason))
+
+
+def _pending_by_usn(university, usns):
+    """{normalized USN: [pending student, ...]} via indexed lookups in chunks"""
+    pending = Student.objects.filter(university=university, verification_status='pending')
+    by_usn = {}
+    usns = sorted(usns)
+    for start in range(0, len(usns), LOOKUP_CHUNK):
+        chunk = usns[start:start + LOOKUP_CHUNK]
+        # Stored IDs are as the student typed them; try the common spellings
+        spellings = set(chunk) | {usn.lower() for usn in chunk}
+        for student in pending.filter(student_id__in=spellings).only('id', 'student_id', 'university_email'):
+            by_usn.setdefault(_normalize_usn(student.student_id), []).append(student)
+    return by_usn
+
+
+@transaction.atomic
+def verify_from_roster(university, upload):
+    """Approve every pending student whose USN and university email are on the roster"""
+    report = RosterReport()
+    roster = {}
+    for line, usn, email in read_roster(upload):
+        report.rows += 1
+        if not usn or not email:
+            report.mismatch(line, usn, email, 'Missing USN or email')
+        elif usn in roster:
+            report.mismatch(line, usn, email, 'Duplicate USN in roster')
+        else:
+            roster[usn] = (line, email)
+
+    pending = _pending_by_usn(university, roster)
+    matched = []
+    for usn, (line, email) in roster.items():
+        students = pending.get(usn)
+        if not students:
+            report.mismatch(line, usn, email, 'No pending student with this USN')
+            continue
+        hits = [s.pk for s in students if _normalize_email(s.university_email) == email]
+        if hits:
+            matched.extend(hits)
+        else:
+            report.mismatch(line, usn, email, 'University email does not match the student\'s')
+
+    for start in range(0, len(matched), LOOKUP_CHUNK):
+        report.approved += set_verification(university, matched[start:start + LOOKUP_CHUNK], 'approve')
+    return report
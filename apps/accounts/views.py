@@ -22,13 +22,19 @@ from django.contrib import messages
 from django.views.generic import CreateView, UpdateView, DetailView, TemplateView, View, ListView
 from django.urls import reverse_lazy
 from django.http import Http404
-from .models import User, Student, Company, University
+from .models import User, Student, Company
 from .forms import (
     StudentRegistrationForm, CompanyRegistrationForm,
     UniversityRegistrationForm, StudentProfileForm,
     CompanyProfileForm, UniversityProfileForm
 )
 from ..projects.models import Project
+from ..projects.pagination import CursorPaginationMixin
+from ..projects.listing import project_cards
+from .verification import RosterError, set_verification, verify_from_roster
+from .search import search_companies, search_students
+from ..projects.stats import VERIFICATION_GROUPS, conditions, count_by
+from ..projects.counters import owner_counts
 
 
 class RegisterView(View):
@@ -62,7 +68,7 @@ class RegisterView(View):
         if form.is_valid():
             try:
                 user = form.save()
-                login(request, user)
+                login(request, user, backend='apps.accounts.profiles.ProfileBackend')
 
                 # Redirect based on user type
                 if user_type == 'student':
@@ -86,21 +92,14 @@ class RegisterView(View):
 class ProfileView(LoginRequiredMixin, DetailView):
     """View user profile"""
     template_name = 'accounts/profile.html'
+    query_budget = 5
 
     def get_object(self):
         return self.request.user
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-
-        if user.user_type == 'student':
-            context['profile'] = getattr(user, 'student_profile', None)
-        elif user.user_type == 'company':
-            context['profile'] = getattr(user, 'company_profile', None)
-        elif user.user_type == 'university':
-            context['profile'] = getattr(user, 'university_profile', None)
-
+        context['profile'] = self.request.profile
         return context
 
 
@@ -110,18 +109,10 @@ class ProfileEditView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('accounts:profile')
 
     def get_object(self):
-        user = self.request.user
-        try:
-            if user.user_type == 'student':
-                return Student.objects.get(user=user)
-            elif user.user_type == 'company':
-                return Company.objects.get(user=user)
-            elif user.user_type == 'university':
-                return University.objects.get(user=user)
-        except (Student.DoesNotExist, Company.DoesNotExist, University.DoesNotExist):
+        profile = self.request.profile
+        if profile is None:
             messages.error(self.request, 'Profile not found. Please contact support.')
-            return None
-        return None
+        return profile
 
     def get_form_class(self):
         user = self.request.user
@@ -175,11 +166,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
             # Check student verification
             if user.user_type == 'student':
-                if not hasattr(user, 'student_profile'):
+                if request.profile is None:
                     messages.error(request, 'Profile not found. Please contact support.')
                     return redirect('home')
 
-                student = user.student_profile
+                student = request.profile
 
                 if not student.university or not student.student_id or not student.university_email:
                     messages.warning(
@@ -199,11 +190,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
 
             # NEW: Check company verification
             elif user.user_type == 'company':
-                if not hasattr(user, 'company_profile'):
+                if request.profile is None:
                     messages.error(request, 'Profile not found. Please contact support.')
                     return redirect('home')
 
-                company = user.company_profile
+                company = request.profile
 
                 # Check if profile is incomplete
                 if (not company.contact_email or not company.contact_person or
@@ -230,36 +221,66 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         user = self.request.user
 
         if user.user_type == 'student':
-            profile = user.student_profile
+            profile = self.request.profile
+            counts = owner_counts('student', profile.pk, 'assignment', 'application')
             context.update({
                 'profile': profile,
-                'active_projects': profile.assigned_projects.filter(status='in_progress').count(),
+                'active_projects': counts['assignment']['in_progress'],
                 'completed_projects': profile.projects_completed,
-                'pending_applications': profile.applications.filter(status='pending').count(),
+                'pending_applications': counts['application']['pending'],
                 'total_earned': profile.total_earned,
             })
 
         elif user.user_type == 'company':
-            profile = user.company_profile
+            profile = self.request.profile
+            counts = owner_counts('company', profile.pk, 'project')['project']
             context.update({
                 'profile': profile,
-                'active_projects': profile.projects.filter(status__in=['open', 'in_progress']).count(),
-                'pending_review': profile.projects.filter(status='pending_review').count(),
+                'active_projects': counts['active'],
+                'pending_review': counts['pending_review'],
                 'total_projects': profile.total_projects_posted,
                 'rating': profile.rating,
             })
 
         elif user.user_type == 'university':
-            profile = user.university_profile
-            context.update({
-                'profile': profile,
-                'pending_projects': profile.projects.filter(status='pending_review').count(),
-                'active_projects': profile.projects.filter(status__in=['open', 'in_progress']).count(),
-                'total_students': profile.students.count(),
-                'verified_companies': profile.verified_companies.count(),
-            })
+            context.update(university_dashboard_context(self.request.profile))
 
         return context
+
+
+DASHBOARD_LIST_SIZE = 5
+
+
+def university_dashboard_context(profile):
+    """
+    Everything dashboard/university.html shows, in a fixed number of queries:
+    counters for the totals, and short lists with poster names and
+    application counts annotated. The lists that sit in cached fragments are
+    left lazy, so they are only queried when their fragment is rebuilt.
+    """
+    counts = owner_counts('university', profile.pk, 'project', 'student', 'company')
+    projects = project_cards(profile.projects.all(), with_counts=True)
+    return {
+        'profile': profile,
+        'pending_projects': counts['project']['pending_review'],
+        'active_projects': counts['project']['active'],
+        'total_projects': counts['project']['total'],
+        'total_students': counts['student']['total'],
+        'pending_students_count': counts['student']['pending'],
+        'verified_companies': counts['company']['total'],
+        'projects_awaiting_review': list(
+            projects.filter(status='pending_review').order_by('-created_at')[:DASHBOARD_LIST_SIZE]
+        ),
+        'recent_active_projects': (
+            projects.filter(status__in=['open', 'in_progress']).order_by('-created_at')[:DASHBOARD_LIST_SIZE]
+        ),
+        'pending_students': (
+            profile.students.filter(verification_status='pending')
+            .select_related('user').order_by('-created_at')[:DASHBOARD_LIST_SIZE]
+        ),
+    }
+
+
 # Mixins for role-based access control
 class StudentRequiredMixin(UserPassesTestMixin):
     """Only allow students"""
@@ -267,7 +288,7 @@ class StudentRequiredMixin(UserPassesTestMixin):
     def test_func(self):
         return (self.request.user.is_authenticated and
                 self.request.user.user_type == 'student' and
-                hasattr(self.request.user, 'student_profile'))
+                self.request.profile is not None)
 
 
 class CompanyRequiredMixin(UserPassesTestMixin):
@@ -276,7 +297,7 @@ class CompanyRequiredMixin(UserPassesTestMixin):
     def test_func(self):
         return (self.request.user.is_authenticated and
                 self.request.user.user_type == 'company' and
-                hasattr(self.request.user, 'company_profile'))
+                self.request.profile is not None)
 
 
 class UniversityRequiredMixin(UserPassesTestMixin):
@@ -285,7 +306,7 @@ class UniversityRequiredMixin(UserPassesTestMixin):
     def test_func(self):
         return (self.request.user.is_authenticated and
                 self.request.user.user_type == 'university' and
-                hasattr(self.request.user, 'university_profile'))
+                self.request.profile is not None)
 
 
 class CompanyPublicProfileView(DetailView):
@@ -307,49 +328,27 @@ class StudentPublicProfileView(DetailView):
 class UniversityDashboardView(LoginRequiredMixin, UniversityRequiredMixin, TemplateView):
     """University-specific admin dashboard"""
     template_name = 'dashboard/university.html'
+    query_budget = 6
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.request.user.university_profile
-
-        context.update({
-            'profile': profile,
-            'pending_projects': profile.projects.filter(status='pending_review').count(),
-            'active_projects': profile.projects.filter(status__in=['open', 'in_progress']).count(),
-            'total_students': profile.students.count(),
-            'verified_companies': profile.verified_companies.count(),
-            'recent_projects': profile.projects.order_by('-created_at')[:10],
-
-            # NEW: Add pending students count
-            'pending_students_count': profile.students.filter(verification_status='pending').count(),
-        })
+        context.update(university_dashboard_context(self.request.profile))
         return context
 
 
 
 
-class UniversityCompaniesView(LoginRequiredMixin, UniversityRequiredMixin, TemplateView):
-    """University view to manage/verify companies"""
-    template_name = 'accounts/university_companies.html'
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        profile = self.request.user.university_profile
-        context['verified_companies'] = profile.verified_companies.all()
-        context['all_companies'] = Company.objects.all()
-        return context
-
-
-class UniversityProjectsView(LoginRequiredMixin, UniversityRequiredMixin, ListView):
+class UniversityProjectsView(LoginRequiredMixin, UniversityRequiredMixin, CursorPaginationMixin, ListView):
     """University view to see ONLY their own posted projects"""
     model = Project
     template_name = 'accounts/university_projects.html'
     context_object_name = 'projects'
     paginate_by = 10
+    query_budget = 5
 
     def get_queryset(self):
         """Return only projects posted BY this university"""
-        university = self.request.user.university_profile
+        university = self.request.profile
 
         # Only projects posted BY this university (not company projects)
         queryset = Project.objects.filter(
@@ -362,25 +361,20 @@ class UniversityProjectsView(LoginRequiredMixin, UniversityRequiredMixin, ListVi
         if status_filter != 'all':
             queryset = queryset.filter(status=status_filter)
 
-        return queryset
+        return project_cards(queryset, with_counts=True)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        university = self.request.user.university_profile
-
-        # Get all projects posted BY this university (for stats)
-        all_university_projects = Project.objects.filter(
-            university=university,
-            posted_by_university=True
-        )
+        university = self.request.profile
 
-        # Add stats
-        context['total_count'] = all_university_projects.count()
-        context['pending_count'] = all_university_projects.filter(status='pending_review').count()
-        context['open_count'] = all_university_projects.filter(status='open').count()
-        context['in_progress_count'] = all_university_projects.filter(status='in_progress').count()
-        context['completed_count'] = all_university_projects.filter(status='completed').count()
-        context['rejected_count'] = all_university_projects.filter(status='rejected').count()
+        # Stats of the projects posted BY this university
+        counts = owner_counts('university', university.pk, 'posted_project')['posted_project']
+        context['total_count'] = counts['total']
+        context['pending_count'] = counts['pending_review']
+        context['open_count'] = counts['open']
+        context['in_progress_count'] = counts['in_progress']
+        context['completed_count'] = counts['completed']
+        context['rejected_count'] = counts['rejected']
 
         # Current filter
         context['current_filter'] = self.request.GET.get('status', 'all')
@@ -389,32 +383,38 @@ class UniversityProjectsView(LoginRequiredMixin, UniversityRequiredMixin, ListVi
 
 
 # NEW VIEW: University Students Management with Verification
-class UniversityStudentsView(LoginRequiredMixin, UniversityRequiredMixin, TemplateView):
+class UniversityStudentsView(LoginRequiredMixin, UniversityRequiredMixin, CursorPaginationMixin, ListView):
     """University view to manage and verify students"""
+    model = Student
     template_name = 'accounts/university_students.html'
+    context_object_name = 'students'
+    paginate_by = 20
+    pagination_mode = 'cursor'
+    cursor_total = None
+    query_budget = 5
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        profile = self.request.user.university_profile
-
+    def get_queryset(self):
         # Get filter
         status_filter = self.request.GET.get('status', 'all')
 
-        students = profile.students.all()
+        students = self.request.profile.students.select_related('user')
 
-        if status_filter == 'pending':
-            students = students.filter(verification_status='pending')
-        elif status_filter == 'approved':
-            students = students.filter(verification_status='approved')
-        elif status_filter == 'rejected':
-            students = students.filter(verification_status='rejected')
+        if status_filter in ('pending', 'approved', 'rejected'):
+            students = students.filter(verification_status=status_filter)
+
+        return search_students(students, self.request.GET.get('search', '')).order_by('-created_at')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        profile = self.request.profile
 
-        context['students'] = students.order_by('-created_at')
-        context['current_filter'] = status_filter
-        context['pending_count'] = profile.students.filter(verification_status='pending').count()
-        context['approved_count'] = profile.students.filter(verification_status='approved').count()
-        context['rejected_count'] = profile.students.filter(verification_status='rejected').count()
-        context['total_count'] = profile.students.count()
+        context['current_filter'] = self.request.GET.get('status', 'all')
+        context['search'] = self.request.GET.get('search', '')
+        counts = owner_counts('university', profile.pk, 'student')['student']
+        context['pending_count'] = counts['pending']
+        context['approved_count'] = counts['approved']
+        context['rejected_count'] = counts['rejected']
+        context['total_count'] = counts['total']
 
         return context
 
@@ -423,7 +423,7 @@ class StudentVerificationActionView(LoginRequiredMixin, UniversityRequiredMixin,
     """University approves or rejects student verification"""
 
     def post(self, request, student_id):
-        university = request.user.university_profile
+        university = request.profile
         student = get_object_or_404(Student, pk=student_id, university=university)
 
         action = request.POST.get('action')
@@ -455,17 +455,60 @@ class StudentVerificationActionView(LoginRequiredMixin, UniversityRequiredMixin,
         return redirect('accounts:university_students')
 
 
+class BulkStudentVerificationView(LoginRequiredMixin, UniversityRequiredMixin, View):
+    """University approves or rejects many students in one request"""
+
+    def post(self, request):
+        university = request.profile
+        action = request.POST.get('action')
+        try:
+            student_ids = [int(pk) for pk in request.POST.getlist('student_ids')]
+        except ValueError:
+            student_ids = []
+
+        if action not in ('approve', 'reject') or not student_ids:
+            messages.error(request, 'Select at least one student and an action.')
+            return redirect('accounts:university_students')
+
+        changed = set_verification(university, student_ids, action, request.POST.get('rejection_reason', ''))
+        if action == 'approve':
+            messages.success(request, f'✓ Approved {changed} student{"s" if changed != 1 else ""}.')
+        else:
+            messages.warning(request, f'✗ Rejected {changed} student{"s" if changed != 1 else ""}.')
+        if changed < len(student_ids):
+            messages.info(request, f'{len(student_ids) - changed} selected student(s) were not found at your university.')
+        return redirect('accounts:university_students')
+
+
+class StudentRosterImportView(LoginRequiredMixin, UniversityRequiredMixin, View):
+    """University uploads a USN/email roster; matching pending students are approved"""
+    template_name = 'accounts/roster_import_result.html'
+
+    def post(self, request):
+        upload = request.FILES.get('roster')
+        if not upload:
+            messages.error(request, 'Choose a CSV or XLSX roster to upload.')
+            return redirect('accounts:university_students')
+        try:
+            report = verify_from_roster(request.profile, upload)
+        except RosterError as exc:
+            messages.error(request, str(exc))
+            return redirect('accounts:university_students')
+        return render(request, self.template_name, {'report': report, 'filename': upload.name})
+
+
 class CompanyDashboardView(LoginRequiredMixin, CompanyRequiredMixin, TemplateView):
     """Company-specific admin dashboard"""
     template_name = 'dashboard/company.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.request.user.company_profile
+        profile = self.request.profile
+        counts = owner_counts('company', profile.pk, 'project')['project']
         context.update({
             'profile': profile,
-            'active_projects': profile.projects.filter(status__in=['open', 'in_progress']).count(),
-            'pending_review': profile.projects.filter(status='pending_review').count(),
+            'active_projects': counts['active'],
+            'pending_review': counts['pending_review'],
             'total_projects': profile.total_projects_posted,
             'rating': profile.rating,
             'recent_projects': profile.projects.order_by('-created_at')[:10],
@@ -479,23 +522,24 @@ class CompanyDashboardView(LoginRequiredMixin, CompanyRequiredMixin, TemplateVie
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.request.user.company_profile
+        profile = self.request.profile
 
         # Get all company projects
         all_projects = profile.projects.all()
 
         # Calculate stats correctly
+        counts = owner_counts('company', profile.pk, 'project')['project']
         context.update({
             'profile': profile,
-            'active_projects': all_projects.filter(status='in_progress').count(),  # Only in_progress
-            'pending_review': all_projects.filter(status='pending_review').count(),  # Only pending_review
-            'total_projects': all_projects.count(),  # Total
+            'active_projects': counts['in_progress'],  # Only in_progress
+            'pending_review': counts['pending_review'],  # Only pending_review
+            'total_projects': counts['total'],  # Total
             'rating': profile.rating,
             'recent_projects': all_projects.order_by('-created_at')[:10],
 
             # Add additional stats
-            'open_projects': all_projects.filter(status='open').count(),
-            'completed_projects': all_projects.filter(status='completed').count(),
+            'open_projects': counts['open'],
+            'completed_projects': counts['completed'],
         })
         return context
 
@@ -505,12 +549,13 @@ class CompanyProjectsView(LoginRequiredMixin, CompanyRequiredMixin, ListView):
     template_name = 'accounts/company_projects.html'
     context_object_name = 'projects'
     paginate_by = 10
+    query_budget = 5
 
     def get_queryset(self):
         """Return only this company's projects, filtered by status if provided"""
         # Start with only this company's projects
         queryset = Project.objects.filter(
-            company=self.request.user.company_profile
+            company=self.request.profile
         ).order_by('-created_at')
 
         # Apply status filter if provided
@@ -518,22 +563,20 @@ class CompanyProjectsView(LoginRequiredMixin, CompanyRequiredMixin, ListView):
         if status_filter != 'all':
             queryset = queryset.filter(status=status_filter)
 
-        return queryset
+        return project_cards(queryset, with_counts=True)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.request.user.company_profile
-
-        # Get all projects for this company (for stats)
-        all_company_projects = Project.objects.filter(company=profile)
+        profile = self.request.profile
 
-        # Add stats
-        context['total_count'] = all_company_projects.count()
-        context['pending_count'] = all_company_projects.filter(status='pending_review').count()
-        context['open_count'] = all_company_projects.filter(status='open').count()
-        context['in_progress_count'] = all_company_projects.filter(status='in_progress').count()
-        context['completed_count'] = all_company_projects.filter(status='completed').count()
-        context['rejected_count'] = all_company_projects.filter(status='rejected').count()
+        # Stats of all projects of this company
+        counts = owner_counts('company', profile.pk, 'project')['project']
+        context['total_count'] = counts['total']
+        context['pending_count'] = counts['pending_review']
+        context['open_count'] = counts['open']
+        context['in_progress_count'] = counts['in_progress']
+        context['completed_count'] = counts['completed']
+        context['rejected_count'] = counts['rejected']
 
         # Current filter
         context['current_filter'] = self.request.GET.get('status', 'all')
@@ -541,29 +584,19 @@ class CompanyProjectsView(LoginRequiredMixin, CompanyRequiredMixin, ListView):
         return context
 
 
-
-class CompanyProjectsView(LoginRequiredMixin, CompanyRequiredMixin, TemplateView):
-    """Company view to manage their projects"""
-    template_name = 'accounts/company_projects.html'
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        profile = self.request.user.company_profile
-        context['projects'] = profile.projects.all().order_by('-created_at')
-        return context
-
 class StudentDashboardView(LoginRequiredMixin, StudentRequiredMixin, TemplateView):
     """Student-specific dashboard"""
     template_name = 'dashboard/student.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.request.user.student_profile
+        profile = self.request.profile
+        counts = owner_counts('student', profile.pk, 'assignment', 'application')
         context.update({
             'profile': profile,
-            'active_projects': profile.assigned_projects.filter(status='in_progress').count(),
+            'active_projects': counts['assignment']['in_progress'],
             'completed_projects': profile.projects_completed,
-            'pending_applications': profile.applications.filter(status='pending').count(),
+            'pending_applications': counts['application']['pending'],
             'total_earned': profile.total_earned,
         })
         return context
@@ -571,19 +604,24 @@ class StudentDashboardView(LoginRequiredMixin, StudentRequiredMixin, TemplateVie
 
 # apps/accounts/views.py - ADD this new view
 
-class UniversityCompaniesView(LoginRequiredMixin, UniversityRequiredMixin, TemplateView):
+class UniversityCompaniesView(LoginRequiredMixin, UniversityRequiredMixin, CursorPaginationMixin, ListView):
     """University view to manage/verify companies"""
+    model = Company
     template_name = 'accounts/university_companies.html'
+    context_object_name = 'companies'
+    paginate_by = 20
+    pagination_mode = 'cursor'
+    cursor_total = None
+    query_budget = 5
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        profile = self.request.user.university_profile
+    def get_queryset(self):
+        profile = self.request.profile
 
         # Get filter
         status_filter = self.request.GET.get('status', 'all')
 
         # Get ALL companies, not just verified ones
-        companies = Company.objects.all()
+        companies = Company.objects.select_related('verified_by')
 
         if status_filter == 'pending':
             companies = companies.filter(verification_status='pending')
@@ -592,12 +630,22 @@ class UniversityCompaniesView(LoginRequiredMixin, UniversityRequiredMixin, Templ
         elif status_filter == 'rejected':
             companies = companies.filter(verification_status='rejected')
 
-        context['companies'] = companies.order_by('-created_at')
-        context['current_filter'] = status_filter
-        context['pending_count'] = Company.objects.filter(verification_status='pending').count()
-        context['approved_count'] = profile.verified_companies.filter(verification_status='approved').count()
-        context['rejected_count'] = Company.objects.filter(verification_status='rejected').count()
-        context['total_count'] = Company.objects.count()
+        return search_companies(companies, self.request.GET.get('search', '')).order_by('-created_at')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        profile = self.request.profile
+
+        context['current_filter'] = self.request.GET.get('status', 'all')
+        context['search'] = self.request.GET.get('search', '')
+        # Totals by status in one query off the (verification_status, created_at) index;
+        # 'approved' means approved by this university, which is counted per university
+        counts = count_by(Company.objects.all(), conditions(VERIFICATION_GROUPS, 'verification_status'))
+        counts['approved'] = owner_counts('university', profile.pk, 'company')['company']['approved']
+        context['pending_count'] = counts['pending']
+        context['approved_count'] = counts['approved']
+        context['rejected_count'] = counts['rejected']
+        context['total_count'] = counts['total']
 
         return context
 
@@ -606,7 +654,7 @@ class CompanyVerificationActionView(LoginRequiredMixin, UniversityRequiredMixin,
     """University approves or rejects company verification"""
 
     def post(self, request, company_id):
-        university = request.user.university_profile
+        university = request.profile
         company = get_object_or_404(Company, pk=company_id)
 
         action = request.POST.get('action')
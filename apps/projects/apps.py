@@ -9,3 +9,8 @@ class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.projects'        # Python path to the app
     label = 'projects'           # short label used by migrations and reverse()
+
+    def ready(self):
+        # Register the system checks and connect the signal handlers (search index,
+        # skills, facets, recommendations, status counters, fragments, blobs)
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,196 @@
+"""
+Purpose: Synthetic data and timing helpers for the benchmark commands
+Contains:
+
+rolled_back (run a block inside a transaction that is always discarded)
+create_owners / create_university (throwaway university + company accounts)
+seed_projects / seed_students / seed_companies / seed_applications (bulk synthetic rows)
+time_call (median wall time of a callable, in ms)
+
+Nothing seeded here survives: every command wraps its work in rolled_back().
+"""
+import random
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from apps.accounts.models import User, University, Company, Student
+from .models import Project, ProjectApplication
+
+BATCH_SIZE = 5000
+
+WORDS = (
+    'platform analytics mobile website dashboard research campaign survey brand '
+    'prototype pipeline model report automation chatbot inventory portal audit '
+    'strategy content video tracker scheduler recommendation payment onboarding '
+    'student campus community health finance logistics retail energy climate'
+).split()
+
+SKILLS = (
+    'Python, Django, React, Node.js, Figma, SQL, Excel, Tableau, Java, Kotlin, '
+    'Flutter, Swift, Pandas, TensorFlow, SEO, Copywriting, Photoshop, AWS, Docker, '
+    'Power BI, R, Statistics, Market Research, Illustrator, PostgreSQL'
+).split(', ')
+
+
+@contextmanager
+def rolled_back():
+    """Everything written inside the block is rolled back on exit"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def _user(prefix, user_type):
+    return User(
+        username=f'bench_{prefix}_{uuid.uuid4().hex[:10]}',
+        email=f'{prefix}@bench.invalid',
+        user_type=user_type,
+    )
+
+
+def create_university(name='Benchmark University'):
+    uni_user = _user('uni', 'university')
+    uni_user.save()
+    return University.objects.create(
+        user=uni_user, name=name, address='-',
+        admin_name='Bench', admin_email='uni@bench.invalid', admin_phone='0',
+        is_verified=True,
+    )
+
+
+def create_owners():
+    """Create one university and one verified company to own seeded rows"""
+    university = create_university()
+    company_user = _user('company', 'company')
+    company_user.save()
+    company = Company.objects.create(
+        user=company_user, name='Benchmark Co', industry='IT', description='-',
+        contact_person='Bench', contact_email='co@bench.invalid', contact_phone='0',
+        address='-', is_verified=True, verification_status='approved',
+        verified_by=university, company_registration_number='BENCH',
+        verification_document='company_docs/bench.pdf',
+    )
+    return university, company
+
+
+def seed_companies(count, rng=None, **overrides):
+    """Bulk-create count users with company profiles"""
+    rng = rng or random.Random(0)
+    statuses = ['pending', 'approved', 'rejected']
+    created = []
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        users = User.objects.bulk_create([_user('company', 'company') for _ in range(size)])
+        batch = []
+        for user in users:
+            fields = {
+                'user': user,
+                'name': _sentence(rng, 2).title(),
+                'industry': 'IT',
+                'description': '-',
+                'contact_person': 'Bench',
+                'contact_email': 'co@bench.invalid',
+                'contact_phone': '0',
+                'address': '-',
+                'verification_status': rng.choice(statuses),
+            }
+            fields.update(overrides)
+            batch.append(Company(**fields))
+        created.extend(Company.objects.bulk_create(batch))
+    return created
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_projects(count, university, company=None, rng=None, **overrides):
+    """Bulk-create count projects; status/domain etc. are randomized unless overridden"""
+    rng = rng or random.Random(0)
+    statuses = [s for s, _ in Project.STATUS_CHOICES]
+    domains = [d for d, _ in Project.DOMAIN_CHOICES]
+    today = date.today()
+    created = []
+    for start in range(0, count, BATCH_SIZE):
+        batch = []
+        for _ in range(min(BATCH_SIZE, count - start)):
+            fields = {
+                'university': university,
+                'company': company,
+                'poster_type': 'company' if company else 'university',
+                'posted_by_university': company is None,
+                'title': _sentence(rng, 4).title(),
+                'domain': rng.choice(domains),
+                'description': _sentence(rng, 40),
+                'required_skills': ', '.join(rng.sample(SKILLS, rng.randint(2, 5))),
+                'payment_amount': rng.randrange(1000, 100000, 500),
+                'duration_weeks': rng.randint(1, 24),
+                'deadline': today + timedelta(days=rng.randint(7, 180)),
+                'status': rng.choice(statuses),
+            }
+            fields.update(overrides)
+            batch.append(Project(**fields))
+        created.extend(Project.objects.bulk_create(batch))
+    return created
+
+
+def seed_students(count, university, rng=None, **overrides):
+    """Bulk-create count users with student profiles at university"""
+    rng = rng or random.Random(0)
+    years = [y for y, _ in Student.YEAR_CHOICES]
+    created = []
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        users = User.objects.bulk_create([_user('student', 'student') for _ in range(size)])
+        batch = []
+        for offset, user in enumerate(users):
+            fields = {
+                'user': user,
+                'university': university,
+                'student_id': f'USN{start + offset:08d}',
+                'department': 'computer_science',
+                'year': rng.choice(years),
+                'gpa': round(rng.uniform(5, 10), 2),
+                'skills': ', '.join(rng.sample(SKILLS, rng.randint(2, 6))),
+                'verification_status': rng.choice(['pending', 'approved', 'rejected']),
+            }
+            fields.update(overrides)
+            batch.append(Student(**fields))
+        created.extend(Student.objects.bulk_create(batch))
+    return created
+
+
+def seed_applications(projects, students, count, rng=None):
+    """Bulk-create up to count applications over distinct (project, student) pairs"""
+    rng = rng or random.Random(0)
+    statuses = [s for s, _ in ProjectApplication.STATUS_CHOICES]
+    count = min(count, len(projects) * len(students))
+    pairs = set()
+    while len(pairs) < count:
+        pairs.add((rng.randrange(len(projects)), rng.randrange(len(students))))
+    pairs = list(pairs)
+    created = []
+    for start in range(0, len(pairs), BATCH_SIZE):
+        created.extend(ProjectApplication.objects.bulk_create([
+            ProjectApplication(
+                project=projects[p], student=students[s],
+                cover_letter='-', status=rng.choice(statuses),
+            )
+            for p, s in pairs[start:start + BATCH_SIZE]
+        ]))
+    return created
+
+
+def time_call(fn, repeat=5):
+    """Median wall-clock time of fn() over repeat runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
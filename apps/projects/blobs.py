@@ -0,0 +1,319 @@
+"""
+Purpose: Content-addressed, deduplicated storage for uploaded files
+Contains:
+
+FILE_FIELDS (model -> file fields whose uploads are stored as blobs)
+ContentAddressedStorage (the default storage: each distinct upload stored once)
+digest_of (stored file name -> its blob's digest, or None for older uploads)
+snapshot / current_names / stored_names (a row's file names as loaded, now, as saved)
+changes (two snapshots -> blobs gaining and losing a reference)
+retain / release (add / drop references to blobs)
+expected_references / reconcile (recount references from the file fields, repair drift)
+collect (delete blobs nothing has referenced for a while)
+import_legacy (move uploads from before blobs into blob storage)
+
+An upload is hashed (SHA-256) before anything is written. If a blob with
+that digest already exists nothing is written at all; otherwise the content
+is streamed to a temporary file next to the blob and renamed into place, so
+a half-written blob is never visible. The file field then holds
+'<upload_to>/<digest><ext>': the upload directory still says which access
+rule config.media applies and the extension still gives the content type,
+but path() maps every such name to the one file at blobs/<d0d1>/<d2d3>/<digest>.
+Since any directory prefix reaches the blob, config.media only serves a
+name that a row of that directory's model actually holds.
+Disk usage and write I/O therefore grow with distinct content, not with the
+number of uploads.
+
+Each Blob row counts the file fields pointing at it. The signals in
+signals.py hand retain / release the difference between a row's file names
+as loaded and as saved, the same way the status counters are kept, and
+release() on delete. Blobs are never deleted while being written to or read:
+collect (run by the collect_blobs command after reconcile) removes those
+that have had no references for longer than a grace period, which also
+covers uploads whose row was never saved. An upload of content that already
+has a blob locks its row and renews created_at, so collect cannot delete it
+between the upload and the post_save that retains it. Files whose Blob row
+was rolled back with the upload's transaction are swept by age as well.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.accounts.models import Company, Student, University
+from .models import Blob, Deliverable, Project
+
+BLOB_DIR = 'blobs'
+TEMP_PREFIX = '.upload-'
+CHUNK_SIZE = 64 * 1024
+COLLECT_GRACE = timedelta(hours=1)
+
+FILE_FIELDS = {
+    Project: ('attachment',),
+    Deliverable: ('file',),
+    Student: ('resume', 'profile_picture'),
+    Company: ('logo', 'verification_document'),
+    University: ('logo',),
+}
+
+BLOB_NAME_RE = re.compile(r'^([0-9a-f]{64})(\.[a-z0-9]{1,10})?$')
+EXTENSION_RE = re.compile(r'^\.[a-z0-9]{1,10}$')
+
+
+def digest_of(name):
+    """Digest in a blob-backed file name ('deliverables/<digest>.pdf'), or None"""
+    match = BLOB_NAME_RE.match(posixpath.basename(name or ''))
+    return match.group(1) if match else None
+
+
+def blob_path(digest):
+    """Location of the blob under the storage root"""
+    return posixpath.join(BLOB_DIR, digest[:2], digest[2:4], digest)
+
+
+def _hash(content):
+    sha = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks(CHUNK_SIZE):
+        sha.update(chunk)
+        size += len(chunk)
+    return sha.hexdigest(), size
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that keeps one file per distinct content (see the module docstring)"""
+
+    def get_available_name(self, name, max_length=None):
+        # The name is replaced by the digest in _save, so it never collides
+        return name
+
+    def _save(self, name, content):
+        digest, size = _hash(content)
+        target = super().path(blob_path(digest))
+        with transaction.atomic():
+            # update_or_create locks the row collect() deletes under, and the new
+            # created_at keeps collect() off it until post_save has retained it
+            _, created = Blob.objects.update_or_create(
+                digest=digest, defaults={'created_at': timezone.now()}, create_defaults={'size': size},
+            )
+            if created and os.path.exists(target):
+                # A file left by a rolled-back upload: collect() goes by its age
+                try:
+                    os.utime(target)
+                except FileNotFoundError:
+                    pass  # collect() got there first; written below
+            if not os.path.exists(target):
+                self._write(target, content)
+
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(posixpath.dirname(name), digest + (extension if EXTENSION_RE.match(extension) else ''))
+
+    def _write(self, target, content):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        handle, temp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(handle, 'wb') as out:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    out.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp, self.file_permissions_mode)
+            os.replace(temp, target)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def path(self, name):
+        digest = digest_of(name)
+        return super().path(blob_path(digest) if digest else name)
+
+    def delete(self, name):
+        # Other rows may hold the same blob; collect() deletes it once nothing does
+        if not digest_of(name):
+            super().delete(name)
+
+
+def _name(value):
+    return getattr(value, 'name', value) or ''
+
+
+def snapshot(instance):
+    """{field: file name} of the file fields as loaded, or None if any was deferred"""
+    values = instance.__dict__
+    fields = FILE_FIELDS[type(instance)]
+    if any(field not in values for field in fields):
+        return None
+    return {field: _name(values[field]) for field in fields}
+
+
+def current_names(instance, previous):
+    """snapshot(instance), taking fields that are not loaded from previous"""
+    values = instance.__dict__
+    names = {}
+    for field in FILE_FIELDS[type(instance)]:
+        if field in values:
+            names[field] = _name(values[field])
+        elif previous is not None:
+            names[field] = previous[field]
+        else:
+            return None
+    return names
+
+
+def stored_names(instance):
+    """The file fields of instance as they are in the database (None if absent)"""
+    model = type(instance)
+    return model._base_manager.filter(pk=instance.pk).values(*FILE_FIELDS[model]).first()
+
+
+def _digests(names):
+    return Counter(digest for digest in map(digest_of, (names or {}).values()) if digest)
+
+
+def changes(old, new):
+    """(digests gaining a reference, digests losing one) between two snapshots"""
+    old, new = _digests(old), _digests(new)
+    return new - old, old - new
+
+
+def _shift(digests, delta):
+    for digest, count in digests.items():
+        # Never below zero, even if the count had drifted (reconcile repairs it)
+        Blob.objects.filter(digest=digest).update(references=Greatest(F('references') + delta * count, 0))
+
+
+def retain(digests):
+    """Count a reference per digest occurrence (Counter or iterable)"""
+    _shift(Counter(digests), 1)
+
+
+def release(digests):
+    """Drop a reference per digest occurrence; collect() deletes blobs left with none"""
+    _shift(Counter(digests), -1)
+
+
+def expected_references():
+    """{digest: number of file fields holding it}, counted from the model tables"""
+    expected = Counter()
+    for model, fields in FILE_FIELDS.items():
+        for names in model._base_manager.values_list(*fields).iterator():
+            expected.update(digest for digest in map(digest_of, names) if digest)
+    return expected
+
+
+@transaction.atomic
+def reconcile(dry_run=False):
+    """
+    Make Blob.references match expected_references(). Returns the
+    [(digest, stored, expected), ...] that differed; nothing is written on dry_run.
+    """
+    # Lock before counting, so a write committing in between is not overwritten
+    stored = {blob.digest: blob for blob in Blob.objects.select_for_update().only('digest', 'references')}
+    expected = expected_references()
+    drift = [
+        (digest, stored[digest].references if digest in stored else 0, expected.get(digest, 0))
+        for digest in stored.keys() | expected.keys()
+        if (stored[digest].references if digest in stored else 0) != expected.get(digest, 0)
+    ]
+    if dry_run:
+        return drift
+
+    fixed = []
+    for digest, _, count in drift:
+        if digest in stored:
+            stored[digest].references = count
+            fixed.append(stored[digest])
+    # A field pointing at a digest without a row (raw SQL, restored dumps) gets no row:
+    # its file may be gone, so nothing is created here
+    Blob.objects.bulk_update(fixed, ['references'], batch_size=1000)
+    return drift
+
+
+def collect(storage, grace=COLLECT_GRACE, dry_run=False):
+    """
+    Delete blobs unreferenced for longer than grace, and files under BLOB_DIR
+    older than grace that have no Blob row. Returns [(digest, size), ...].
+    """
+    cutoff = timezone.now() - grace
+    stale = Blob.objects.filter(references__lte=0, created_at__lt=cutoff)
+    removed = list(stale.values_list('digest', 'size'))
+    if not dry_run:
+        for digest, _ in removed:
+            with transaction.atomic():
+                # Re-check under the row lock: an upload may have taken it meanwhile
+                if Blob.objects.select_for_update().filter(
+                    digest=digest, references__lte=0, created_at__lt=cutoff,
+                ).delete()[0]:
+                    path = os.path.join(storage.location, blob_path(digest))
+                    if os.path.exists(path):
+                        os.unlink(path)
+    return removed + _collect_orphans(storage, cutoff.timestamp(), dry_run)
+
+
+def _collect_orphans(storage, cutoff, dry_run):
+    """Files with no Blob row (their upload's transaction rolled back) and stale temporary files"""
+    files = {}
+    for directory, _, names in os.walk(os.path.join(storage.location, BLOB_DIR)):
+        for name in names:
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            if stat.st_mtime < cutoff and (BLOB_NAME_RE.match(name) or name.startswith(TEMP_PREFIX)):
+                files[name] = (path, stat.st_size)
+    known = set()
+    digests = [name for name in files if not name.startswith(TEMP_PREFIX)]
+    for start in range(0, len(digests), 500):
+        known.update(Blob.objects.filter(digest__in=digests[start:start + 500]).values_list('digest', flat=True))
+
+    removed = []
+    for name, (path, size) in files.items():
+        if name in known:
+            continue
+        # _save creates the row before touching an existing file, so a file that is
+        # still old here has not been taken by an upload since the query above
+        if not dry_run:
+            try:
+                if os.stat(path).st_mtime >= cutoff:
+                    continue
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+        removed.append((name, size))
+    return removed
+
+
+def import_legacy(storage, dry_run=False):
+    """
+    Store every file uploaded before blobs as a blob, point its rows at it
+    and remove the old copy. Returns [(old name, new name), ...].
+    """
+    moved = {}
+    for model, fields in FILE_FIELDS.items():
+        for field in fields:
+            names = model._base_manager.exclude(**{field: ''}).exclude(**{field + '__isnull': True}) \
+                .order_by().values_list(field, flat=True).distinct()
+            for name in names.iterator():
+                if digest_of(name) or name in moved or not storage.exists(name):
+                    continue
+                if dry_run:
+                    moved[name] = None
+                    continue
+                with storage.open(name) as content:
+                    moved[name] = storage.save(name, content)
+
+    if not dry_run:
+        for model, fields in FILE_FIELDS.items():
+            for field in fields:
+                for old, new in moved.items():
+                    # update(): the references are recounted by reconcile() afterwards
+                    model._base_manager.filter(**{field: old}).update(**{field: new})
+        for old in moved:
+            storage.delete(old)
+    return list(moved.items())
@@ -0,0 +1,134 @@
+"""
+Purpose: Accept / reject / shortlist many applications in one request
+Contains:
+
+ACTIONS (action -> new status and the statuses it may be applied to)
+reviewable_applications (restrict applications to projects a company/university reviews)
+apply_bulk_action (one transaction, fixed number of queries, per-id results)
+
+Whatever the number of ids, a bulk action is: one SELECT of the applications,
+one bulk_update of status/reviewed_at, one bulk_create of assigned_students
+rows and one UPDATE moving newly staffed projects from open to in_progress.
+These writes skip the model signals, so the listing caches, the status
+counters and the fragment cache stamps the signals normally keep up to date
+are adjusted here, with a few more queries that do not grow with the number
+of ids either.
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .facets import invalidate_facets
+from . import counters
+from . import fragments
+from .models import Project, ProjectApplication
+from . import recommendations
+
+# action: (new status, statuses it applies to, stamps reviewed_at)
+ACTIONS = {
+    'accept': ('accepted', ('pending', 'shortlisted'), True),
+    'reject': ('rejected', ('pending', 'shortlisted'), True),
+    'shortlist': ('shortlisted', ('pending',), False),
+}
+
+MAX_BULK_IDS = 1000
+
+
+def reviewable_applications(user_type, profile):
+    """Applications whose project profile may review (owning company, or posting university)"""
+    if profile is None:
+        return ProjectApplication.objects.none()
+    if user_type == 'company':
+        return ProjectApplication.objects.filter(project__company=profile)
+    if user_type == 'university':
+        return ProjectApplication.objects.filter(
+            Q(project__posted_by_university=True) & Q(project__university=profile)
+        )
+    return ProjectApplication.objects.none()
+
+
+@transaction.atomic
+def apply_bulk_action(user_type, profile, application_ids, action):
+    """
+    Apply action to every id profile (request.profile) may review. Returns {id: result}, where
+    result is the new status, 'unchanged', 'not_found' or 'skipped_<status>'.
+    """
+    new_status, from_statuses, stamp = ACTIONS[action]
+    applications = {
+        application.pk: application
+        for application in reviewable_applications(user_type, profile).filter(pk__in=application_ids)
+        .select_for_update().only('id', 'status', 'project_id', 'student_id')
+    }
+
+    now = timezone.now()
+    results, changed, before = {}, [], []
+    for pk in application_ids:
+        application = applications.get(pk)
+        if application is None:
+            results[pk] = 'not_found'
+        elif application.status == new_status:
+            results[pk] = 'unchanged'
+        elif application.status not in from_statuses:
+            results[pk] = 'skipped_%s' % application.status
+        else:
+            before.append(counters.snapshot(application))
+            application.status = new_status
+            application.updated_at = now
+            if stamp:
+                application.reviewed_at = now
+            changed.append(application)
+            results[pk] = new_status
+
+    fields = ['status', 'updated_at'] + (['reviewed_at'] if stamp else [])
+    ProjectApplication.objects.bulk_update(changed, fields)
+    deltas = counters.changes(ProjectApplication, before, [counters.snapshot(a) for a in changed])
+    touched = _fragment_owners(changed)
+
+    if new_status == 'accepted' and changed:
+        Assignment = Project.assigned_students.through
+        pairs = {(a.project_id, a.student_id) for a in changed}
+        existing = set(Assignment.objects.filter(
+            project_id__in={project_id for project_id, _ in pairs},
+            student_id__in={student_id for _, student_id in pairs},
+        ).values_list('project_id', 'student_id'))
+        Assignment.objects.bulk_create(
+            [Assignment(project_id=project_id, student_id=student_id) for project_id, student_id in pairs],
+            ignore_conflicts=True,
+        )
+        deltas.update(counters.diff([], counters.assignment_keys(pairs - existing)))
+
+        staffed = list(Project.objects.filter(
+            pk__in={a.project_id for a in changed}, status='open',
+        ).only(*counters.COUNTED_FIELDS[Project]))
+        if staffed:
+            Project.objects.filter(pk__in=[p.pk for p in staffed]).update(status='in_progress', updated_at=now)
+            # Every student on a staffed project (new or not) moves from open to in_progress
+            assigned = list(Assignment.objects.filter(
+                project_id__in=[p.pk for p in staffed],
+            ).values_list('project_id', 'student_id'))
+            before = [counters.snapshot(p) for p in staffed]
+            deltas.update(counters.changes(Project, before, [{**state, 'status': 'in_progress'} for state in before]))
+            deltas.update(counters.diff(
+                counters.assignment_keys(assigned, 'open'), counters.assignment_keys(assigned, 'in_progress'),
+            ))
+            for project in staffed:
+                transaction.on_commit(lambda project=project: _project_closed(project))
+            touched.update(('student', student_id) for _, student_id in assigned)
+    counters.apply_deltas(deltas)
+    fragments.touch(touched)
+    return results
+
+
+def _fragment_owners(applications):
+    """Fragment owners of the changed applications: their students and project owners"""
+    owners = {('student', a.student_id) for a in applications}
+    if applications:
+        projects = Project.objects.filter(pk__in={a.project_id for a in applications})
+        for company_id, university_id in projects.values_list('company_id', 'university_id'):
+            owners.update((('company', company_id), ('university', university_id)))
+    return owners
+
+
+def _project_closed(project):
+    invalidate_facets(project.university_id)
+    recommendations.project_removed(project)
@@ -0,0 +1,30 @@
+"""
+Purpose: System checks for the settings the projects app relies on
+Contains:
+
+check_shared_cache (projects.W001: the default cache is local to one process)
+
+facets, recommendations and fragments invalidate by replacing version
+tokens in the default cache. With a per-process cache (LocMemCache) only the
+process that handled the write sees the new token; every other worker keeps
+serving stale counts, recommendations and dashboard fragments until they
+expire. That is fine for runserver and single-process deployments, so it is a
+warning, and only with DEBUG off.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        'The default cache (%s) is local to each process; with several worker '
+        'processes, facet counts, recommendations and dashboard fragments go stale.' % backend,
+        hint='Set REDIS_URL, or configure another cache every worker process shares.',
+        id='projects.W001',
+    )]
@@ -0,0 +1,292 @@
+"""
+Purpose: Per-owner status counters behind the dashboards
+Contains:
+
+COUNTED_FIELDS (model -> fields its counter keys depend on)
+snapshot / current_state / stored_state (those fields as loaded, as saved, as stored)
+changes (states of rows before and after a write -> counter deltas)
+assignment_keys ((project, student) pairs -> assigned-project counter keys)
+diff (keys before and after a write -> deltas)
+apply_deltas (add deltas to the counters table)
+forget_owner (drop a deleted owner's counters)
+owner_counts (an owner's breakdowns from a handful of counter rows)
+expected_counts / reconcile (recount from the source tables, repair drift)
+
+A counter key is (owner type, owner id, entity, status), e.g.
+('university', 3, 'student', 'pending'). Every project, application,
+student, verified company and project assignment adds 1 to a few keys. The
+signals in signals.py hand apply_deltas the difference between the keys a
+row had when it was loaded and the keys it has after the write, inside the
+write's transaction (AtomicSaveMixin, or delete()'s own); bulk_actions and accounts.verification, which write
+with update() and skip those signals, do the same explicitly. A dashboard
+then reads at most a few dozen rows through the unique key index, however
+many rows the account has accumulated. reconcile (run periodically by the
+reconcile_status_counters command) recounts everything and fixes drift from
+writes that bypass both, e.g. raw SQL, fixtures or benchmark seeding.
+"""
+from collections import Counter
+from functools import reduce
+import operator
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from apps.accounts.models import Company, Student
+from .models import Project, ProjectApplication, StatusCounter
+from .stats import APPLICATION_GROUPS, PROJECT_GROUPS, VERIFICATION_GROUPS, tally
+
+COUNTED_FIELDS = {
+    Project: ('status', 'company_id', 'university_id', 'posted_by_university'),
+    ProjectApplication: ('status', 'project_id', 'student_id'),
+    Student: ('verification_status', 'university_id'),
+    Company: ('verification_status', 'verified_by_id'),
+}
+
+# entity: breakdown its statuses roll up into
+ENTITY_GROUPS = {
+    'project': PROJECT_GROUPS,
+    'posted_project': PROJECT_GROUPS,
+    'application': APPLICATION_GROUPS,
+    'assignment': PROJECT_GROUPS,
+    'student': VERIFICATION_GROUPS,
+    'company': VERIFICATION_GROUPS,
+}
+
+# Keys per UPDATE; each is an OR term and a CASE arm, and SQLite limits expression depth
+UPDATE_CHUNK = 200
+
+
+def snapshot(instance):
+    """{field: value} of the counted fields, or None if any was deferred"""
+    values = instance.__dict__
+    fields = COUNTED_FIELDS[type(instance)]
+    if any(field not in values for field in fields):
+        return None
+    return {field: values[field] for field in fields}
+
+
+def current_state(instance, previous):
+    """snapshot(instance), taking fields that are not loaded from previous"""
+    values = instance.__dict__
+    state = {}
+    for field in COUNTED_FIELDS[type(instance)]:
+        if field in values:
+            state[field] = values[field]
+        elif previous is not None:
+            state[field] = previous[field]
+        else:
+            return None
+    return state
+
+
+def stored_state(instance):
+    """The counted fields of instance as they are in the database (None if absent)"""
+    model = type(instance)
+    return model._base_manager.filter(pk=instance.pk).values(*COUNTED_FIELDS[model]).first()
+
+
+def _project_keys(states):
+    keys = []
+    for state in states:
+        status, university_id = state['status'], state['university_id']
+        row = [('university', university_id, 'project', status)]
+        if state['company_id']:
+            row.append(('company', state['company_id'], 'project', status))
+        if state['posted_by_university']:
+            row.append(('university', university_id, 'posted_project', status))
+        keys.append(row)
+    return keys
+
+
+def _application_keys(states):
+    # Universities count applications to the projects they posted themselves
+    project_ids = {state['project_id'] for state in states}
+    posted_by = dict(
+        Project.objects.filter(pk__in=project_ids, posted_by_university=True)
+        .values_list('pk', 'university_id')
+    )
+    keys = []
+    for state in states:
+        status, project_id = state['status'], state['project_id']
+        row = [
+            ('student', state['student_id'], 'application', status),
+            ('project', project_id, 'application', status),
+        ]
+        if project_id in posted_by:
+            row.append(('university', posted_by[project_id], 'application', status))
+        keys.append(row)
+    return keys
+
+
+def _student_keys(states):
+    return [
+        [('university', state['university_id'], 'student', state['verification_status'])]
+        for state in states
+    ]
+
+
+def _company_keys(states):
+    return [
+        [('university', state['verified_by_id'], 'company', state['verification_status'])]
+        if state['verified_by_id'] else []
+        for state in states
+    ]
+
+
+# model: states -> [[counter key, ...] per state]
+KEY_FUNCTIONS = {
+    Project: _project_keys,
+    ProjectApplication: _application_keys,
+    Student: _student_keys,
+    Company: _company_keys,
+}
+
+
+def changes(model, before, after):
+    """Deltas for rows of model going from the before states to the after states"""
+    states = [state for state in before + after if state is not None]
+    if not states:
+        return Counter()
+    per_state = iter(KEY_FUNCTIONS[model](states))
+    old = [key for state in before if state is not None for key in next(per_state)]
+    new = [key for state in after if state is not None for key in next(per_state)]
+    return diff(old, new)
+
+
+def assignment_keys(pairs, status=None):
+    """Keys for (project_id, student_id) pairs, at status or each project's current one"""
+    pairs = list(pairs)
+    if status is not None:
+        return [('student', student_id, 'assignment', status) for _, student_id in pairs]
+    statuses = dict(
+        Project.objects.filter(pk__in={project_id for project_id, _ in pairs})
+        .values_list('pk', 'status')
+    ) if pairs else {}
+    return [
+        ('student', student_id, 'assignment', statuses[project_id])
+        for project_id, student_id in pairs if project_id in statuses
+    ]
+
+
+def diff(old_keys, new_keys):
+    deltas = Counter(new_keys)
+    deltas.subtract(old_keys)
+    return deltas
+
+
+def _match(key):
+    owner_type, owner_id, entity, status = key
+    return Q(owner_type=owner_type, owner_id=owner_id, entity=entity, status=status)
+
+
+def apply_deltas(deltas):
+    """Add each delta to its counter, creating missing counters at 0 first"""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    keys = list(deltas)
+    with transaction.atomic():
+        StatusCounter.objects.bulk_create([
+            StatusCounter(owner_type=owner_type, owner_id=owner_id, entity=entity, status=status)
+            for owner_type, owner_id, entity, status in keys
+        ], ignore_conflicts=True)
+        for start in range(0, len(keys), UPDATE_CHUNK):
+            chunk = keys[start:start + UPDATE_CHUNK]
+            StatusCounter.objects.filter(reduce(operator.or_, map(_match, chunk))).update(
+                count=F('count') + Case(
+                    *[When(_match(key), then=Value(deltas[key])) for key in chunk],
+                    default=Value(0),
+                ),
+            )
+
+
+def forget_owner(owner_type, owner_id):
+    """Drop the counters of a deleted owner"""
+    StatusCounter.objects.filter(owner_type=owner_type, owner_id=owner_id).delete()
+
+
+def owner_counts(owner_type, owner_id, *entities):
+    """{entity: breakdown} for one owner, e.g. owner_counts('company', 4, 'project')"""
+    by_status = {entity: {} for entity in entities}
+    rows = StatusCounter.objects.filter(
+        owner_type=owner_type, owner_id=owner_id, entity__in=entities,
+    ).values_list('entity', 'status', 'count')
+    for entity, status, count in rows:
+        by_status[entity][status] = count
+    return {entity: tally(by_status[entity], ENTITY_GROUPS[entity]) for entity in entities}
+
+
+def _grouped(queryset, owner_type, owner_field, entity, status_field='status'):
+    rows = queryset.order_by().values(owner_field, status_field).annotate(n=Count('pk'))
+    return {
+        (owner_type, row[owner_field], entity, row[status_field]): row['n']
+        for row in rows if row[owner_field] is not None
+    }
+
+
+def expected_counts():
+    """{key: count} recomputed from the source tables"""
+    projects = Project.objects.all()
+    applications = ProjectApplication.objects.all()
+    expected = {}
+    expected.update(_grouped(projects, 'company', 'company_id', 'project'))
+    expected.update(_grouped(projects, 'university', 'university_id', 'project'))
+    expected.update(_grouped(
+        projects.filter(posted_by_university=True), 'university', 'university_id', 'posted_project',
+    ))
+    expected.update(_grouped(applications, 'student', 'student_id', 'application'))
+    expected.update(_grouped(applications, 'project', 'project_id', 'application'))
+    expected.update(_grouped(
+        applications.filter(project__posted_by_university=True),
+        'university', 'project__university_id', 'application',
+    ))
+    expected.update(_grouped(
+        Project.assigned_students.through.objects.all(),
+        'student', 'student_id', 'assignment', 'project__status',
+    ))
+    expected.update(_grouped(
+        Student.objects.all(), 'university', 'university_id', 'student', 'verification_status',
+    ))
+    expected.update(_grouped(
+        Company.objects.all(), 'university', 'verified_by_id', 'company', 'verification_status',
+    ))
+    return expected
+
+
+@transaction.atomic
+def reconcile(dry_run=False):
+    """
+    Make the counters table match expected_counts(). Returns the
+    [(key, stored, expected), ...] that differed; nothing is written on dry_run.
+    """
+    # Lock the counters before counting: a write that commits in between would
+    # otherwise have its delta overwritten by the older count
+    stored = {}
+    for row in StatusCounter.objects.select_for_update().iterator():
+        stored[(row.owner_type, row.owner_id, row.entity, row.status)] = row
+    expected = expected_counts()
+
+    drift = []
+    for key in stored.keys() | expected.keys():
+        row, count = stored.get(key), expected.get(key, 0)
+        if (row.count if row else 0) != count:
+            drift.append((key, row.count if row else 0, count))
+    if dry_run:
+        return drift
+
+    fixed, missing = [], []
+    for key, _, count in drift:
+        row = stored.get(key)
+        if row is None:
+            owner_type, owner_id, entity, status = key
+            missing.append(StatusCounter(
+                owner_type=owner_type, owner_id=owner_id, entity=entity, status=status, count=count,
+            ))
+        else:
+            row.count = count
+            fixed.append(row)
+    StatusCounter.objects.bulk_update(fixed, ['count'], batch_size=1000)
+    StatusCounter.objects.bulk_create(missing, batch_size=1000)
+    # Rows of owners that no longer have anything in that status
+    StatusCounter.objects.filter(count=0).delete()
+    return drift
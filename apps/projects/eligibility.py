@@ -0,0 +1,111 @@
+"""
+Purpose: Bitmask encoding of project eligibility (departments and years)
+Contains:
+
+DEPARTMENT_CHOICES / YEAR_CHOICES (the options ProjectForm offers)
+department_mask / year_mask (comma list -> bitmask stored on Project)
+department_bit / year_bit (a student's department/year -> single bit)
+eligible_projects (restrict a Project queryset to what a student may apply to)
+
+Bit n stands for the n-th choice, so both lists are append-only. A mask of 0
+means "open to all". Entries that match no choice (free text from older rows)
+set UNLISTED_BIT, which no student has, so such restrictions fail closed.
+The eligibility check is then a bitwise AND plus a GPA comparison in SQL.
+"""
+from django.db.models import F, Q
+
+# Append only: a choice's position is its bit in the stored masks
+DEPARTMENT_CHOICES = [
+    ('computer_science', 'Computer Science'),
+    ('information_technology', 'Information Technology'),
+    ('electronics', 'Electronics & Communication'),
+    ('mechanical', 'Mechanical Engineering'),
+    ('civil', 'Civil Engineering'),
+    ('electrical', 'Electrical Engineering'),
+    ('chemical', 'Chemical Engineering'),
+    ('biotechnology', 'Biotechnology'),
+    ('mba', 'MBA'),
+    ('bba', 'BBA'),
+    ('bcom', 'B.Com'),
+    ('bca', 'BCA'),
+    ('mca', 'MCA'),
+    ('design', 'Design'),
+    ('architecture', 'Architecture'),
+    ('data_science', 'Data Science'),
+    ('ai_ml', 'AI & Machine Learning'),
+]
+
+# Append only, as above
+YEAR_CHOICES = [
+    ('1', 'First Year'),
+    ('2', 'Second Year'),
+    ('3', 'Third Year'),
+    ('4', 'Fourth Year'),
+    ('graduate', 'Graduate/Masters'),
+]
+
+UNLISTED_BIT = 1 << 30
+
+
+def _normalize(text):
+    return ' '.join((text or '').split()).casefold()
+
+
+def _bits(choices):
+    """Normalized value or label -> bit of that choice"""
+    bits = {}
+    for position, (value, label) in enumerate(choices):
+        bits[_normalize(value)] = bits[_normalize(label)] = 1 << position
+    return bits
+
+
+DEPARTMENT_BITS = _bits(DEPARTMENT_CHOICES)
+YEAR_BITS = _bits(YEAR_CHOICES)
+
+
+def _mask(text, bits):
+    mask = 0
+    for entry in (text or '').split(','):
+        entry = _normalize(entry)
+        if entry:
+            mask |= bits.get(entry, UNLISTED_BIT)
+    return mask
+
+
+def department_mask(eligible_departments):
+    """'computer_science,mba' -> bitmask (0 when blank, i.e. all departments)"""
+    return _mask(eligible_departments, DEPARTMENT_BITS)
+
+
+def year_mask(eligible_years):
+    """'2,3' -> bitmask (0 when blank, i.e. all years)"""
+    return _mask(eligible_years, YEAR_BITS)
+
+
+def department_bit(department):
+    """Bit of a student's department, 0 if it is not one of the choices"""
+    return DEPARTMENT_BITS.get(_normalize(department), 0)
+
+
+def year_bit(year):
+    return YEAR_BITS.get(_normalize(year), 0)
+
+
+def eligibility_key(student):
+    """Everything eligible_projects depends on, e.g. for cache keys"""
+    return '%d:%d:%s' % (department_bit(student.department), year_bit(student.year), student.gpa)
+
+
+def eligible_projects(queryset, student):
+    """Projects in queryset whose department, year and GPA limits student meets"""
+    gpa_ok = Q(min_gpa__isnull=True)
+    if student.gpa is not None:
+        gpa_ok |= Q(min_gpa__lte=student.gpa)
+    return queryset.alias(
+        department_hit=F('eligible_departments_mask').bitand(department_bit(student.department)),
+        year_hit=F('eligible_years_mask').bitand(year_bit(student.year)),
+    ).filter(
+        Q(eligible_departments_mask=0) | ~Q(department_hit=0),
+        Q(eligible_years_mask=0) | ~Q(year_hit=0),
+        gpa_ok,
+    )
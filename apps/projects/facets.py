@@ -0,0 +1,120 @@
+"""
+Purpose: Facet counts for the project list sidebar
+Contains:
+
+FACET_FIELDS (choice fields counted per value)
+PAYMENT_BUCKETS (remuneration ranges counted as one facet)
+FILTER_PARAMS (request params that make up a filter set)
+payment_bucket_filter (bucket key -> Q)
+count_facets (one conditional-aggregate query for every facet value)
+get_facets (count_facets, cached per university and filter set)
+invalidate_facets (drop the cached counts of one university)
+
+All counts come back as a single row: one COUNT(*) FILTER (WHERE ...) per
+facet value over the already-filtered queryset, instead of a COUNT query per
+sidebar entry. Cached entries are keyed by a per-university version token,
+which the Project signals replace whenever an open project changes. With a
+shared cache (settings.CACHES; checks.py warns otherwise) every worker reads
+the same token, so a change made through one process reaches all of them.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils.http import urlencode
+
+from config.metrics import record_cache
+
+from .models import Project
+
+FACET_FIELDS = ('domain', 'job_type', 'team_type', 'payment_type')
+
+# (key, label, lower bound inclusive, upper bound exclusive)
+PAYMENT_BUCKETS = (
+    ('under_5k', 'Under ₹5,000', None, 5000),
+    ('5k_15k', '₹5,000 - ₹15,000', 5000, 15000),
+    ('15k_50k', '₹15,000 - ₹50,000', 15000, 50000),
+    ('50k_plus', '₹50,000+', 50000, None),
+)
+
+FILTER_PARAMS = (
+    'search', 'domain', 'university', 'min_payment', 'max_payment',
+    'job_type', 'team_type', 'payment_type', 'budget', 'eligible',
+)
+
+FACET_CACHE_TIMEOUT = 600
+
+
+def payment_bucket_filter(key):
+    """Q for the PAYMENT_BUCKETS entry called key (empty Q for unknown keys)"""
+    for bucket, _, low, high in PAYMENT_BUCKETS:
+        if bucket == key:
+            condition = Q()
+            if low is not None:
+                condition &= Q(payment_amount__gte=low)
+            if high is not None:
+                condition &= Q(payment_amount__lt=high)
+            return condition
+    return Q()
+
+
+def _facet_options():
+    """[(facet, value, label, condition), ...] in sidebar order"""
+    options = []
+    for field in FACET_FIELDS:
+        for value, label in Project._meta.get_field(field).choices:
+            options.append((field, value, label, Q(**{field: value})))
+    for key, label, _, _ in PAYMENT_BUCKETS:
+        options.append(('budget', key, label, payment_bucket_filter(key)))
+    return options
+
+
+def count_facets(queryset):
+    """{facet: [(value, label, count), ...]} for queryset, in one query"""
+    options = _facet_options()
+    totals = queryset.order_by().aggregate(**{
+        'facet_%d' % index: Count('pk', filter=condition)
+        for index, (_, _, _, condition) in enumerate(options)
+    })
+    facets = {}
+    for index, (facet, value, label, _) in enumerate(options):
+        facets.setdefault(facet, []).append((value, label, totals['facet_%d' % index] or 0))
+    return facets
+
+
+def _version_key(university_id):
+    return 'project_facets:version:%s' % (university_id or 'all')
+
+
+def _version(university_id):
+    return cache.get_or_set(_version_key(university_id), lambda: uuid.uuid4().hex, None)
+
+
+def get_facets(queryset, params, university_id=None):
+    """
+    count_facets(queryset), cached under (university_id, filter params).
+    queryset must be fully determined by university_id and params.
+    """
+    filter_set = urlencode(sorted(
+        (key, value) for key, value in params.items() if key in FILTER_PARAMS and value
+    ))
+    key = 'project_facets:%s:%s:%s' % (
+        university_id or 'all',
+        _version(university_id),
+        hashlib.md5(filter_set.encode()).hexdigest(),
+    )
+    facets = cache.get(key)
+    record_cache('project_facets', hits=facets is not None, misses=facets is None)
+    if facets is None:
+        facets = count_facets(queryset)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_facets(university_id):
+    """Forget cached counts for one university and for the unscoped listing"""
+    cache.set_many({
+        _version_key(university_id): uuid.uuid4().hex,
+        _version_key(None): uuid.uuid4().hex,
+    }, None)
@@ -7,41 +7,18 @@ ProjectForm (create/edit projects)
 ProjectApplicationForm (apply to projects)
 MilestoneForm (create milestones)
 DeliverableForm (submit work)
+SavedSearchForm (save the project list filters)
 """
 from django import forms
-from .models import Project, ProjectApplication, Deliverable, Milestone
+from .models import Project, ProjectApplication, Deliverable, Milestone, SavedSearch
+from . import eligibility
 from ..accounts.models import University
 
 
 class ProjectForm(forms.ModelForm):
-    # Department and Year choices
-    DEPARTMENT_CHOICES = [
-        ('computer_science', 'Computer Science'),
-        ('information_technology', 'Information Technology'),
-        ('electronics', 'Electronics & Communication'),
-        ('mechanical', 'Mechanical Engineering'),
-        ('civil', 'Civil Engineering'),
-        ('electrical', 'Electrical Engineering'),
-        ('chemical', 'Chemical Engineering'),
-        ('biotechnology', 'Biotechnology'),
-        ('mba', 'MBA'),
-        ('bba', 'BBA'),
-        ('bcom', 'B.Com'),
-        ('bca', 'BCA'),
-        ('mca', 'MCA'),
-        ('design', 'Design'),
-        ('architecture', 'Architecture'),
-        ('data_science', 'Data Science'),
-        ('ai_ml', 'AI & Machine Learning'),
-    ]
-
-    YEAR_CHOICES = [
-        ('1', 'First Year'),
-        ('2', 'Second Year'),
-        ('3', 'Third Year'),
-        ('4', 'Fourth Year'),
-        ('graduate', 'Graduate/Masters'),
-    ]
+    # Department and Year choices (their order defines the eligibility bitmasks)
+    DEPARTMENT_CHOICES = eligibility.DEPARTMENT_CHOICES
+    YEAR_CHOICES = eligibility.YEAR_CHOICES
 
     # Custom multi-select fields (NOT part of model)
     eligible_departments_list = forms.MultipleChoiceField(
@@ -246,4 +223,24 @@ class MilestoneForm(forms.ModelForm):
         if percentage is not None:
             if percentage < 0 or percentage > 100:
                 raise forms.ValidationError('Percentage must be between 0 and 100')
-        return percentage
\ No newline at end of file
+        return percentage
+
+
+class SavedSearchForm(forms.ModelForm):
+    """Project list filters posted from the list page's "Save search" button"""
+
+    class Meta:
+        model = SavedSearch
+        fields = ['name', 'search', 'domain', 'min_payment', 'max_payment']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['name'].required = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('name'):
+            parts = [cleaned_data.get('search'), dict(Project.DOMAIN_CHOICES).get(cleaned_data.get('domain'))]
+            cleaned_data['name'] = ' - '.join(part for part in parts if part) or 'All projects'
+            cleaned_data['name'] = cleaned_data['name'][:100]
+        return cleaned_data
@@ -0,0 +1,99 @@
+"""
+Purpose: Cached template fragments, invalidated through per-owner version stamps
+Contains:
+
+FRAGMENT_CACHE_TIMEOUT (how long an unchanged fragment is kept)
+fragment_key (fragment name + its owners' current stamps -> cache key)
+renew / touch (give owners new stamps now / once the transaction commits)
+touched_owners (owners whose fragments a saved or deleted row shows up in)
+
+Every owner, e.g. ('company', 4) or ('student', 17), has a version stamp in
+the cache. A fragment (the {% fragment %} tag in templatetags/fragment_cache.py)
+is cached under the stamps of the owners it shows data of, so replacing a
+stamp orphans every fragment built from that owner's rows, the same way the
+facet cache is versioned per university. The signals touch the owners of
+every Project, ProjectApplication, Student, Company and University write
+and of assignment changes; bulk_actions and accounts.verification, which
+write with update(), touch theirs explicitly. Stamps change on commit, so a
+fragment rendered from rows that are about to change is never stored under
+the new stamp. Stamps reach every worker only if the default cache is
+shared (settings.CACHES; checks.py warns otherwise).
+"""
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.accounts.models import Company, Student, University
+from .models import Project, ProjectApplication
+
+FRAGMENT_CACHE_TIMEOUT = 600
+
+
+def _stamp_key(owner):
+    return 'fragment_stamp:%s:%s' % owner
+
+
+def _stamps(owners):
+    keys = [_stamp_key(owner) for owner in owners]
+    stamps = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in stamps}
+    if missing:
+        cache.set_many(missing, None)
+        stamps.update(missing)
+    return [stamps[key] for key in keys]
+
+
+def fragment_key(name, owners):
+    """Cache key of fragment name built from the rows of owners [(type, id), ...]"""
+    owners = [(owner_type, owner_id) for owner_type, owner_id in owners if owner_id is not None]
+    signature = '|'.join('%s:%s:%s' % (*owner, stamp) for owner, stamp in zip(owners, _stamps(owners)))
+    return 'fragment:%s:%s' % (name, hashlib.md5(signature.encode()).hexdigest())
+
+
+def renew(owners):
+    """New stamps for owners [(type, id), ...], right away"""
+    keys = {_stamp_key(owner) for owner in owners if owner[1] is not None}
+    if keys:
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+
+def touch(owners):
+    """renew(owners) when the current transaction commits"""
+    owners = [owner for owner in owners if owner[1] is not None]
+    if owners:
+        transaction.on_commit(lambda: renew(owners))
+
+
+def _people_on(projects):
+    """('student', id) of everyone who applied to or is assigned to projects"""
+    applicants = ProjectApplication.objects.filter(project__in=projects).order_by().values_list(
+        'student_id', flat=True,
+    )
+    assigned = Project.assigned_students.through.objects.filter(project__in=projects).order_by().values_list(
+        'student_id', flat=True,
+    )
+    return [('student', pk) for pk in set(applicants.union(assigned))]
+
+
+def touched_owners(instance):
+    """Owners whose fragments show instance: the row's own owners and whoever lists it"""
+    if isinstance(instance, Project):
+        return [('company', instance.company_id), ('university', instance.university_id)] + _people_on([instance.pk])
+    if isinstance(instance, ProjectApplication):
+        project = Project.objects.filter(pk=instance.project_id).values('company_id', 'university_id').first() or {}
+        return [
+            ('student', instance.student_id),
+            ('company', project.get('company_id')), ('university', project.get('university_id')),
+        ]
+    if isinstance(instance, Student):
+        return [('student', instance.pk), ('university', instance.university_id)]
+    if isinstance(instance, Company):
+        # The company's name is in its universities' and students' dashboards
+        projects = Project.objects.filter(company_id=instance.pk)
+        universities = projects.order_by().values_list('university_id', flat=True).distinct()
+        return [('company', instance.pk)] + [('university', pk) for pk in universities] + _people_on(projects)
+    if isinstance(instance, University):
+        return [('university', instance.pk)]
+    return []
@@ -0,0 +1,61 @@
+"""
+Purpose: Lean read model for project cards on listing pages
+Contains:
+
+CARD_FIELDS (the only Project columns a card template touches)
+project_cards (queryset -> card queryset, one joined query per page)
+count_subquery (correlated per-project COUNT(*) annotation)
+
+Poster name/logo/verification come back as annotations from a LEFT JOIN on
+companies and universities, so templates never lazy-load project.company or
+project.university. Skills are split once per card by Project.skills_list.
+"""
+from django.db.models import Case, When, F, Count, OuterRef, Subquery, IntegerField, Value
+from django.db.models.functions import Coalesce
+
+from .models import Project, ProjectApplication
+
+CARD_FIELDS = (
+    'id', 'title', 'domain', 'description', 'required_skills', 'status',
+    'payment_amount', 'duration_weeks', 'deadline', 'posted_by_university',
+    'company_id', 'university_id', 'created_at',
+)
+
+
+def _poster(company_field, university_field):
+    """Pick the company's value for company projects, else the university's"""
+    return Case(
+        When(company__isnull=False, then=F(company_field)),
+        default=F(university_field),
+    )
+
+
+def count_subquery(queryset):
+    """Correlated COUNT(*) for one project, without multiplying the outer rows"""
+    return Coalesce(
+        Subquery(
+            queryset.filter(project=OuterRef('pk')).order_by()
+            .values('project').annotate(n=Count('pk')).values('n'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def project_cards(queryset, with_counts=False):
+    """
+    Restrict queryset to card columns and annotate:
+    poster_name, poster_logo, poster_verified and, with with_counts,
+    application_count and assigned_count.
+    """
+    queryset = queryset.only(*CARD_FIELDS).annotate(
+        poster_name=_poster('company__name', 'university__name'),
+        poster_logo=_poster('company__logo', 'university__logo'),
+        poster_verified=_poster('company__is_verified', 'university__is_verified'),
+    )
+    if with_counts:
+        queryset = queryset.annotate(
+            application_count=count_subquery(ProjectApplication.objects.all()),
+            assigned_count=count_subquery(Project.assigned_students.through.objects.all()),
+        )
+    return queryset
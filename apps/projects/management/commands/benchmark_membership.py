@@ -0,0 +1,58 @@
+# apps/projects/management/commands/benchmark_membership.py
+# Compares `student in project.assigned_students.all()` against the EXISTS
+# check in apps/projects/membership.py on one team project with a growing
+# number of assignees. "page" columns repeat the check --checks times, as the
+# milestones template did once per milestone. All seeded rows are rolled back.
+
+from django.core.management.base import BaseCommand
+from apps.projects.membership import Assignment, Membership
+from apps.projects.benchmarks import rolled_back, create_owners, seed_projects, seed_students, time_call
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks assigned-student membership checks on projects with many assignees'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000, 10000])
+        parser.add_argument('--checks', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        checks = options['checks']
+
+        with rolled_back():
+            university, company = create_owners()
+            project = seed_projects(1, university, company, status='in_progress')[0]
+            outsider = seed_students(1, university)[0]
+            seeded = []
+            self.stdout.write(
+                f'{"assignees":>9} {"who":<9} {"in all() ms":>12} {"EXISTS ms":>10} '
+                f'{"page all() ms":>14} {"page memo ms":>13}'
+            )
+
+            for size in sorted(options['sizes']):
+                added = seed_students(size - len(seeded), university)
+                Assignment.objects.bulk_create([Assignment(project=project, student=s) for s in added])
+                seeded += added
+
+                for who, student in (('assigned', seeded[-1]), ('outsider', outsider)):
+                    def load_all():
+                        return student in project.assigned_students.all()
+
+                    def exists():
+                        return Membership('student', student).is_assigned(project)
+
+                    def page_all():
+                        return [load_all() for _ in range(checks)]
+
+                    def page_memo():
+                        member = Membership('student', student)
+                        return [member.is_assigned(project) for _ in range(checks)]
+
+                    assert load_all() == exists() == (who == 'assigned')
+                    self.stdout.write(
+                        f'{size:>9} {who:<9} {time_call(load_all, options["repeat"]):>12.2f} '
+                        f'{time_call(exists, options["repeat"]):>10.2f} '
+                        f'{time_call(page_all, options["repeat"]):>14.2f} '
+                        f'{time_call(page_memo, options["repeat"]):>13.2f}'
+                    )
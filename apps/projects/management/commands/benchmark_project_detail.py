@@ -0,0 +1,95 @@
+# apps/projects/management/commands/benchmark_project_detail.py
+# Compares the student project detail queries before and after the rewrite:
+# OR over the assignment and application joins + DISTINCT, then a separate
+# has_applied EXISTS and applications.count(), against one pk lookup with
+# EXISTS and COUNT subqueries as annotations. Reports wall time, and the
+# queries and database time of one call. All seeded rows are rolled back.
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from apps.projects.models import Project, ProjectApplication
+from config.middleware import QueryCounter
+from apps.projects.listing import count_subquery
+from apps.projects.membership import Assignment, applied_by, assigned_to
+from apps.projects.benchmarks import (
+    rolled_back, create_owners, seed_projects, seed_students, seed_applications, time_call,
+)
+
+
+def db_cost(fn):
+    """(queries, database ms) of one fn() call"""
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        fn()
+    return counter.count, counter.seconds * 1000
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the student project detail query at several application table sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', nargs='+', type=int, default=[10000, 100000])
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--students', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            university, company = create_owners()
+            projects = seed_projects(options['projects'], university, company)
+            students = seed_students(options['students'], university)
+            Assignment.objects.bulk_create([
+                Assignment(project=project, student=student)
+                for project, student in zip(projects[::10], students[::3])
+            ])
+            seeded = 0
+            self.stdout.write(
+                f'{"applications":>12} {"project":<9} {"OR+DISTINCT ms":>15} {"(q / db ms)":>12} '
+                f'{"EXISTS ms":>10} {"(q / db ms)":>12}'
+            )
+
+            for size in sorted(options['applications']):
+                # seed_applications only keeps pairs distinct within a call, so each round gets new students
+                applicants = seed_students(options['students'], university) if seeded else students
+                seed_applications(projects, applicants, size - seeded)
+                seeded = size
+
+                student = ProjectApplication.objects.order_by('?').first().student
+                applied = ProjectApplication.objects.filter(student=student).exclude(project__status='open')
+                cases = {
+                    'open': Project.objects.filter(status='open').first(),
+                    'applied': getattr(applied.first(), 'project', None),
+                    'hidden': Project.objects.exclude(status='open').exclude(
+                        Q(applications__student=student) | Q(assigned_students=student)
+                    ).first(),
+                }
+
+                for label, project in cases.items():
+                    if project is None:
+                        continue
+
+                    def or_distinct():
+                        found = Project.objects.filter(
+                            Q(status='open') | Q(assigned_students=student) | Q(applications__student=student)
+                        ).distinct().select_related('company', 'university').filter(pk=project.pk).first()
+                        if found:
+                            ProjectApplication.objects.filter(project=found, student=student).exists()
+                            found.applications.count()
+                        return found
+
+                    def exists():
+                        return Project.objects.select_related('company', 'university').annotate(
+                            application_count=count_subquery(ProjectApplication.objects.all()),
+                            has_applied=applied_by(student),
+                            is_assigned=assigned_to(student),
+                        ).filter(
+                            Q(status='open') | Q(is_assigned=True) | Q(has_applied=True)
+                        ).filter(pk=project.pk).first()
+
+                    assert (or_distinct() is None) == (exists() is None) == (label == 'hidden')
+                    row = f'{size:>12} {label:<9}'
+                    for fn, width in ((or_distinct, 15), (exists, 10)):
+                        queries, db_ms = db_cost(fn)
+                        row += f' {time_call(fn, options["repeat"]):>{width}.2f} {f"({queries} / {db_ms:.2f})":>12}'
+                    self.stdout.write(row)
@@ -0,0 +1,57 @@
+# apps/projects/management/commands/benchmark_project_search.py
+# Compares the full-text search index against the old icontains (LIKE) scan.
+# The two match differently (substrings vs. whole tokens), so the hit count of
+# each is printed next to its time. All seeded rows are rolled back at the end.
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from apps.projects.models import Project
+from apps.projects import search
+from apps.projects.benchmarks import rolled_back, create_owners, seed_projects, time_call
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks full-text project search vs the LIKE scan at several table sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000, 1000000])
+        parser.add_argument('--queries', nargs='+', default=['python', 'mobile dashboard', 'tableau report'])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write(self.style.ERROR('No full-text index on this database; run migrate first.'))
+            return
+
+        with rolled_back():
+            university, company = create_owners()
+            seeded = 0
+            self.stdout.write(
+                f'{"rows":>9} {"query":<18} {"LIKE ms":>9} {"LIKE hits":>10} {"FTS ms":>9} {"FTS hits":>9}'
+            )
+
+            for size in sorted(options['sizes']):
+                seed_projects(size - seeded, university, company, status='open')
+                seeded = size
+                search.rebuild_index()
+                base = Project.objects.filter(status='open', university=university)
+
+                for query in options['queries']:
+                    def like():
+                        qs = base.filter(
+                            Q(title__icontains=query) |
+                            Q(description__icontains=query) |
+                            Q(required_skills__icontains=query)
+                        ).order_by('-created_at')
+                        return qs.count(), list(qs[:12])
+
+                    def fts():
+                        qs = search.search_projects(base, query).order_by('-search_rank', '-created_at')
+                        return qs.count(), list(qs[:12])
+
+                    like_ms = time_call(like, options['repeat'])
+                    fts_ms = time_call(fts, options['repeat'])
+                    like_hits, fts_hits = like()[0], fts()[0]
+                    self.stdout.write(
+                        f'{size:>9} {query:<18} {like_ms:>9.1f} {like_hits:>10} {fts_ms:>9.1f} {fts_hits:>9}'
+                    )
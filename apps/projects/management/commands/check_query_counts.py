@@ -0,0 +1,130 @@
+# apps/projects/management/commands/check_query_counts.py
+# Query-count regression check for the dashboard, list and management pages.
+#
+# Requests each page as the matching user on a nearly empty account, then
+# again after seeding a few hundred projects, students and applications (all
+# rolled back at the end). Each page is requested cold, with the cache
+# cleared so every fragment and facet count is rebuilt, and then warm.
+# Fails if a page's query count grows with the data, which is what an N+1 in
+# a template looks like, or if either render goes over the query_budget its
+# view declares. Exits non-zero on failure, so it can run in CI next to
+# `manage.py check_query_plans`.
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import resolve, reverse
+
+from apps.accounts.models import Student
+from apps.projects.benchmarks import (
+    rolled_back, create_owners, seed_projects, seed_students, seed_applications,
+)
+from apps.projects.counters import reconcile
+from apps.projects.facets import invalidate_facets
+from apps.projects.fragments import renew
+from config.middleware import QueryCounter, view_query_budget
+
+# (url name, who requests it, whether the url takes the sample project's pk)
+PAGES = (
+    ('accounts:dashboard', 'university', False),
+    ('accounts:university_dashboard', 'university', False),
+    ('accounts:university_students', 'university', False),
+    ('accounts:university_companies', 'university', False),
+    ('accounts:university_projects', 'university', False),
+    ('projects:university_applications', 'university', False),
+    ('accounts:company_projects', 'company', False),
+    ('projects:manage_applications', 'company', True),
+    ('projects:list', 'student', False),
+    ('projects:detail', 'student', True),
+    ('projects:my_applications', 'student', False),
+    ('projects:saved_searches', 'student', False),
+)
+
+
+class Command(BaseCommand):
+    help = 'Fails if a page exceeds its query budget or its query count grows with the data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200, help='Projects per status and students to seed')
+
+    def handle(self, *args, **options):
+        setup_test_environment()  # lets the test client through ALLOWED_HOSTS
+        try:
+            with rolled_back():
+                failures = self.check_counts(options['rows'])
+        finally:
+            teardown_test_environment()
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(failure))
+            raise CommandError(f'{len(failures)} page{"" if len(failures) == 1 else "s"} over budget or not constant')
+        self.stdout.write(self.style.SUCCESS('Every page runs a fixed number of queries within budget'))
+
+    def check_counts(self, rows):
+        university, company = create_owners()
+        student = seed_students(1, university, verification_status='approved')[0]
+        Student.objects.filter(pk=student.pk).update(is_verified=True, university_email='student@bench.invalid')
+        sample = seed_projects(1, university, company, status='open')
+        seed_applications(sample, [student], 1)
+
+        clients = {}
+        for user_type, owner in (('university', university), ('company', company), ('student', student)):
+            clients[user_type] = Client()
+            clients[user_type].force_login(owner.user)
+        urls = {
+            name: reverse(name, args=[sample[0].pk] if takes_project else [])
+            for name, _, takes_project in PAGES
+        }
+
+        # A handful of rows first, so every list on the page is non-empty
+        self.seed(university, company, student, sample, 3)
+        small = self.measure(clients, urls)
+        self.seed(university, company, student, sample, rows)
+        large = self.measure(clients, urls)
+
+        failures = []
+        for name, _, _ in PAGES:
+            budget = view_query_budget(resolve(urls[name]).func)
+            for state in ('cold', 'warm'):
+                before, after = small[name, state], large[name, state]
+                self.stdout.write(
+                    f'{name} ({state}): {before} queries with a few rows, {after} with many (budget {budget})'
+                )
+                if after != before:
+                    failures.append(f'{name} ({state}): {before} queries with a few rows but {after} with many')
+                if budget is not None and max(before, after) > budget:
+                    failures.append(f'{name} ({state}): {max(before, after)} queries, budget is {budget}')
+        return failures
+
+    def seed(self, university, company, student, sample, rows):
+        projects = (
+            seed_projects(rows, university, company, status='pending_review')
+            + seed_projects(rows, university, company, status='open')
+            + seed_projects(rows, university, status='open', posted_by_university=True)
+        )
+        students = seed_students(rows, university, verification_status='pending')
+        seed_applications(projects, students + [student], rows * 10)
+        seed_applications(sample, students, rows)
+        # Seeding uses bulk_create, which the Project/counter/fragment signals do not see
+        reconcile()
+        invalidate_facets(university.pk)
+        renew([('university', university.pk), ('company', company.pk), ('student', student.pk)])
+
+    def measure(self, clients, urls):
+        """{(url name, 'cold' / 'warm'): queries}"""
+        counts = {}
+        for name, user_type, _ in PAGES:
+            # Cold: no fragment or facet counts left over from the previous page
+            cache.clear()
+            for state in ('cold', 'warm'):
+                # QueryCounter, like the middleware: the savepoints of rolled_back() and atomic saves don't count
+                counter = QueryCounter()
+                with connection.execute_wrapper(counter):
+                    response = clients[user_type].get(urls[name])
+                if response.status_code != 200:
+                    raise CommandError(f'{name} returned {response.status_code}')
+                counts[name, state] = counter.count
+        return counts
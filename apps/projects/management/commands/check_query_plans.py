@@ -0,0 +1,149 @@
+# apps/projects/management/commands/check_query_plans.py
+# Query-plan regression check for the list and dashboard views.
+#
+# Seeds a large synthetic dataset (rolled back at the end), requests every
+# list/dashboard page as the matching user type, EXPLAINs each SELECT it ran
+# and fails if any plan falls back to a full scan of one of the big tables.
+# Exits non-zero on failure, so it can run in CI next to `manage.py check`.
+
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from apps.projects.benchmarks import (
+    rolled_back, create_owners, create_university, seed_projects, seed_students, seed_companies, seed_applications,
+)
+
+# Tables that grow with usage; a full scan of any of these is a regression
+WATCHED_TABLES = ('projects', 'project_applications', 'students', 'companies')
+
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (%s)\b(?!.*\bINDEX\b)' % '|'.join(WATCHED_TABLES))
+POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (%s)\b' % '|'.join(WATCHED_TABLES))
+
+# Literals are stripped so N+1 loops only get EXPLAINed once per query shape
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class Command(BaseCommand):
+    help = 'EXPLAINs the queries behind list/dashboard views on a seeded dataset and fails on full scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--universities', type=int, default=10)
+        parser.add_argument('--projects', type=int, default=20000)
+        parser.add_argument('--students', type=int, default=5000)
+        parser.add_argument('--companies', type=int, default=2000)
+        parser.add_argument('--applications', type=int, default=50000)
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not just failures')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError('Only SQLite and PostgreSQL plans are understood.')
+
+        setup_test_environment()  # lets the test client through ALLOWED_HOSTS
+        try:
+            with rolled_back():
+                failures = self.check_plans(options)
+        finally:
+            teardown_test_environment()
+
+        if failures:
+            for label, sql, plan in failures:
+                self.stdout.write(self.style.ERROR(f'\n[{label}] full scan:\n  {sql}\n{plan}'))
+            raise CommandError(f'{len(failures)} quer{"y" if len(failures) == 1 else "ies"} fell back to a full scan')
+        self.stdout.write(self.style.SUCCESS('All list/dashboard query plans use indexes'))
+
+    def seed(self, options):
+        # The checked accounts own one share of the data; the rest belongs to
+        # other universities, as it would in production
+        university, company = create_owners()
+        universities = [university] + [
+            create_university(f'Benchmark University {n}') for n in range(1, options['universities'])
+        ]
+        share = options['projects'] // (2 * len(universities))
+        student_share = options['students'] // len(universities)
+
+        seed_companies(options['companies'])
+        projects, students = [], []
+        for uni in universities:
+            projects += seed_projects(share, uni, company if uni is university else None)
+            projects += seed_projects(share, uni)
+            students += seed_students(student_share, uni)
+        seed_applications(projects, students, options['applications'])
+
+        student = students[0]
+        student.verification_status = 'approved'
+        student.is_verified = True
+        student.university_email = 'student@bench.invalid'
+        student.save()
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return university, company, student, projects
+
+    def pages(self, university, company, student, projects):
+        company_project = next(p for p in projects if p.company_id == company.pk)
+        return [
+            (None, 'projects:list', {}),
+            (student.user, 'projects:list', {}),
+            (student.user, 'projects:my_applications', {}),
+            (student.user, 'accounts:dashboard', {}),
+            (student.user, 'accounts:student_dashboard', {}),
+            (company.user, 'accounts:dashboard', {}),
+            (company.user, 'accounts:company_dashboard', {}),
+            (company.user, 'accounts:company_projects', {}),
+            (company.user, 'projects:manage_applications', {'pk': company_project.pk}),
+            (university.user, 'accounts:dashboard', {}),
+            (university.user, 'accounts:university_dashboard', {}),
+            (university.user, 'accounts:university_projects', {}),
+            (university.user, 'accounts:university_students', {}),
+            (university.user, 'accounts:university_students', {}, {'search': 'usn0000001'}),
+            (university.user, 'accounts:university_students', {}, {'search': 'student@bench', 'status': 'approved'}),
+            (university.user, 'accounts:university_companies', {}),
+            (university.user, 'accounts:university_companies', {}, {'search': 'platform'}),
+            (university.user, 'projects:university_applications', {}),
+            (university.user, 'projects:pending_review', {}),
+        ]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                return '\n'.join('  ' + row[-1] for row in cursor.fetchall())
+            cursor.execute('EXPLAIN ' + sql)
+            return '\n'.join('  ' + row[0] for row in cursor.fetchall())
+
+    def check_plans(self, options):
+        full_scan = SQLITE_FULL_SCAN if connection.vendor == 'sqlite' else POSTGRES_FULL_SCAN
+        university, company, student, projects = self.seed(options)
+        failures = []
+        seen = set()
+
+        for user, url_name, kwargs, *query in self.pages(university, company, student, projects):
+            client = Client()
+            if user:
+                client.force_login(user)
+            label = f'{url_name}{"?" + urlencode(query[0]) if query else ""} as {user.user_type if user else "anonymous"}'
+
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(reverse(url_name, kwargs=kwargs), *query)
+            if response.status_code != 200:
+                raise CommandError(f'{label} returned HTTP {response.status_code}')
+
+            for query in captured.captured_queries:
+                sql = query['sql']
+                shape = LITERAL.sub('?', sql)
+                if not sql.lstrip().upper().startswith('SELECT') or shape in seen:
+                    continue
+                seen.add(shape)
+                plan = self.explain(sql)
+                if options['show_plans']:
+                    self.stdout.write(f'[{label}] {sql}\n{plan}\n')
+                if full_scan.search(plan):
+                    failures.append((label, sql, plan))
+
+        return failures
@@ -0,0 +1,51 @@
+# apps/projects/management/commands/collect_blobs.py
+# Recounts the references to each upload blob from the file fields, repairs
+# drift (raw SQL, update(), restored dumps), then deletes blobs that have had
+# no references for longer than --grace-minutes, and blob files that old
+# whose row was rolled back with their upload. --import-legacy first moves
+# files uploaded before deduplicated storage into it, merging their copies.
+# Meant to run periodically, e.g. nightly from cron; --dry-run only reports.
+
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from apps.projects import blobs
+
+MAX_LISTED = 50
+
+
+class Command(BaseCommand):
+    help = 'Recounts upload blob references from the file fields and deletes unreferenced blobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report without changing anything')
+        parser.add_argument('--import-legacy', action='store_true',
+                            help='Move uploads stored before deduplication into blobs first')
+        parser.add_argument('--grace-minutes', type=int, default=int(blobs.COLLECT_GRACE.total_seconds() // 60),
+                            help='Keep unreferenced blobs this long (uploads whose row is still being saved)')
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, blobs.ContentAddressedStorage):
+            raise CommandError('The default storage is not apps.projects.blobs.ContentAddressedStorage.')
+        dry_run = options['dry_run']
+
+        if options['import_legacy']:
+            moved = blobs.import_legacy(default_storage, dry_run=dry_run)
+            for old, new in moved[:MAX_LISTED]:
+                self.stdout.write(f'{old} -> {new or "(dry run)"}')
+            self.stdout.write(f'{len(moved)} legacy uploads {"to move" if dry_run else "moved"}')
+
+        drift = blobs.reconcile(dry_run=dry_run)
+        for digest, stored, expected in sorted(drift)[:MAX_LISTED]:
+            self.stdout.write(f'{digest[:12]}: {stored} -> {expected} references')
+        if len(drift) > MAX_LISTED:
+            self.stdout.write(f'... and {len(drift) - MAX_LISTED} more')
+
+        removed = blobs.collect(default_storage, timedelta(minutes=options['grace_minutes']), dry_run=dry_run)
+        freed = sum(size for _, size in removed)
+        verb = 'would be' if dry_run else 'were'
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(drift)} reference counts {verb} fixed; {len(removed)} unreferenced blobs '
+            f'({freed / 1024 / 1024:.1f} MiB) {verb} deleted'
+        ))
@@ -0,0 +1,18 @@
+# apps/projects/management/commands/rebuild_search_index.py
+# Run after bulk imports / queryset.update() calls, which skip the save signals.
+
+from django.core.management.base import BaseCommand
+from apps.projects import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the project full-text search index from the projects table'
+
+    def handle(self, *args, **kwargs):
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING(
+                'No full-text index on this database (run migrate); search uses LIKE.'
+            ))
+            return
+        search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,31 @@
+# apps/projects/management/commands/reconcile_status_counters.py
+# Recounts projects, applications, assignments, students and verified
+# companies per owner and status, and repairs the status counters the
+# dashboards read wherever they drifted (raw SQL, fixtures, bulk imports).
+# Meant to run periodically, e.g. nightly from cron; --dry-run only reports.
+
+from django.core.management.base import BaseCommand
+from apps.projects.counters import reconcile
+
+MAX_LISTED = 50
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the per-owner status counters from the source tables and fixes drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        drift = reconcile(dry_run=options['dry_run'])
+        for (owner_type, owner_id, entity, status), stored, expected in sorted(drift)[:MAX_LISTED]:
+            self.stdout.write(f'{owner_type} {owner_id} {entity}/{status}: {stored} -> {expected}')
+        if len(drift) > MAX_LISTED:
+            self.stdout.write(f'... and {len(drift) - MAX_LISTED} more')
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Status counters are up to date'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drift)} counters have drifted (dry run, nothing changed)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(drift)} counters fixed'))
@@ -0,0 +1,85 @@
+"""
+Purpose: Who a request's profile is to a project: owner, applicant or assigned student
+Contains:
+
+assigned_to / applied_by (EXISTS expressions for annotating project querysets)
+Membership (memoized is_owner / has_applied / is_assigned for one profile)
+membership (the request's Membership, created on first use)
+
+`profile in project.assigned_students.all()` loads every student on a team
+project to answer a yes/no question, and a template that asks it inside a
+loop does so once per row. Here each question is one EXISTS probe on a
+unique (project_id, student_id) index: the assignment table's, or
+project_applications' unique_together, so it reads at most one index entry
+however many students the project has. Answers are kept per request, keyed
+by check and project id, so the permission mixin, the view and the template
+asking the same thing cost one query between them. Ownership is compared
+by id against the profile and never queries.
+"""
+from django.db.models import Exists, OuterRef
+
+from .models import Project, ProjectApplication
+
+Assignment = Project.assigned_students.through
+
+
+def assigned_to(student, outer='pk'):
+    """Exists(...) that is true on project rows student is assigned to"""
+    return Exists(Assignment.objects.filter(project_id=OuterRef(outer), student_id=student.pk))
+
+
+def applied_by(student, outer='pk'):
+    """Exists(...) that is true on project rows student has applied to"""
+    return Exists(ProjectApplication.objects.filter(project_id=OuterRef(outer), student_id=student.pk))
+
+
+class Membership:
+    """Answers for one user_type / profile pair, remembered per project id"""
+
+    # check name -> table holding (project_id, student_id) rows
+    TABLES = {
+        'assigned': Assignment,
+        'applied': ProjectApplication,
+    }
+
+    def __init__(self, user_type, profile):
+        self.user_type = user_type
+        self.profile = profile
+        self._memo = {}
+
+    def _student_check(self, check, project):
+        if self.user_type != 'student' or self.profile is None:
+            return False
+        project_id = getattr(project, 'pk', project)
+        key = (check, project_id)
+        if key not in self._memo:
+            self._memo[key] = self.TABLES[check]._default_manager.filter(
+                project_id=project_id, student_id=self.profile.pk,
+            ).exists()
+        return self._memo[key]
+
+    def is_assigned(self, project):
+        """Is the profile one of project's assigned students (project or its id)"""
+        return self._student_check('assigned', project)
+
+    def has_applied(self, project):
+        """Has the profile applied to project (project or its id)"""
+        return self._student_check('applied', project)
+
+    def is_owner(self, project):
+        """Is the profile project's company, or the university that posted it"""
+        if self.profile is None:
+            return False
+        if self.user_type == 'company':
+            return project.company_id == self.profile.pk
+        if self.user_type == 'university':
+            return project.posted_by_university and project.university_id == self.profile.pk
+        return False
+
+
+def membership(request):
+    """request's Membership; one per request, so its answers last as long as the request"""
+    if not hasattr(request, '_membership'):
+        user_type = getattr(request.user, 'user_type', None) if request.user.is_authenticated else None
+        request._membership = Membership(user_type, getattr(request, 'profile', None))
+    return request._membership
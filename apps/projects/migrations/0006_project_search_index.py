@@ -0,0 +1,48 @@
+# Full-text search index for projects (see apps/projects/search.py)
+
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE projects_fts USING fts5("
+            "title, description, required_skills, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        schema_editor.execute(
+            "INSERT INTO projects_fts (rowid, title, description, required_skills) "
+            "SELECT id, title, description, required_skills FROM projects"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE projects ADD COLUMN search_vector tsvector")
+        schema_editor.execute(
+            "UPDATE projects SET search_vector = "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+        )
+        schema_editor.execute(
+            "CREATE INDEX projects_search_vector_gin ON projects USING GIN (search_vector)"
+        )
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS projects_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS projects_search_vector_gin")
+        schema_editor.execute("ALTER TABLE projects DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_alter_project_attachment_alter_project_deadline_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
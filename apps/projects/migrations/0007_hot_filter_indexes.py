@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_hot_filter_indexes'),
+        ('projects', '0006_project_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'university', 'created_at'], name='project_status_uni_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['company', 'status'], name='project_company_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectapplication',
+            index=models.Index(fields=['project', 'status'], name='application_project_status_idx'),
+        ),
+    ]
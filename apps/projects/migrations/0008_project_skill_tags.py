@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_skill_catalogue'),
+        ('projects', '0007_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='projects', to='accounts.skill'),
+        ),
+    ]
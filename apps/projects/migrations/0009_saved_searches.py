@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_skill_catalogue'),
+        ('projects', '0008_project_skill_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('search', models.CharField(blank=True, max_length=200)),
+                ('domain', models.CharField(blank=True, choices=[('design', 'Design'), ('marketing', 'Marketing'), ('coding', 'Coding'), ('data_analysis', 'Data Analysis'), ('psychology', 'Psychology'), ('research', 'Research'), ('content_writing', 'Content Writing'), ('business_strategy', 'Business Strategy'), ('other', 'Other')], max_length=50)),
+                ('min_payment', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_payment', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('term_count', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='accounts.student')),
+                ('university', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='accounts.university')),
+            ],
+            options={
+                'db_table': 'saved_searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.CharField(max_length=255)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+                ('saved_search', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='projects.savedsearch')),
+            ],
+            options={
+                'db_table': 'notifications',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'is_read', 'created_at'], name='notification_user_unread_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='projects.savedsearch')),
+            ],
+            options={
+                'db_table': 'saved_search_terms',
+                'indexes': [models.Index(fields=['term', 'saved_search'], name='saved_search_term_idx')],
+                'unique_together': {('saved_search', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:51
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# The choices and bit mapping of apps/projects/eligibility.py as of this migration
+DEPARTMENT_CHOICES = [
+    ('computer_science', 'Computer Science'),
+    ('information_technology', 'Information Technology'),
+    ('electronics', 'Electronics & Communication'),
+    ('mechanical', 'Mechanical Engineering'),
+    ('civil', 'Civil Engineering'),
+    ('electrical', 'Electrical Engineering'),
+    ('chemical', 'Chemical Engineering'),
+    ('biotechnology', 'Biotechnology'),
+    ('mba', 'MBA'),
+    ('bba', 'BBA'),
+    ('bcom', 'B.Com'),
+    ('bca', 'BCA'),
+    ('mca', 'MCA'),
+    ('design', 'Design'),
+    ('architecture', 'Architecture'),
+    ('data_science', 'Data Science'),
+    ('ai_ml', 'AI & Machine Learning'),
+]
+YEAR_CHOICES = [
+    ('1', 'First Year'),
+    ('2', 'Second Year'),
+    ('3', 'Third Year'),
+    ('4', 'Fourth Year'),
+    ('graduate', 'Graduate/Masters'),
+]
+UNLISTED_BIT = 1 << 30
+
+
+def _normalize(text):
+    return ' '.join((text or '').split()).casefold()
+
+
+def _bits(choices):
+    bits = {}
+    for position, (value, label) in enumerate(choices):
+        bits[_normalize(value)] = bits[_normalize(label)] = 1 << position
+    return bits
+
+
+def _mask(text, bits):
+    mask = 0
+    for entry in (text or '').split(','):
+        entry = _normalize(entry)
+        if entry:
+            mask |= bits.get(entry, UNLISTED_BIT)
+    return mask
+
+
+def backfill_masks(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    department_bits, year_bits = _bits(DEPARTMENT_CHOICES), _bits(YEAR_CHOICES)
+    batch = []
+    projects = Project.objects.only('eligible_departments', 'eligible_years').order_by('pk')
+    for project in projects.iterator(chunk_size=BATCH_SIZE):
+        project.eligible_departments_mask = _mask(project.eligible_departments, department_bits)
+        project.eligible_years_mask = _mask(project.eligible_years, year_bits)
+        if project.eligible_departments_mask or project.eligible_years_mask:
+            batch.append(project)
+        if len(batch) == BATCH_SIZE:
+            Project.objects.bulk_update(batch, ['eligible_departments_mask', 'eligible_years_mask'])
+            batch = []
+    Project.objects.bulk_update(batch, ['eligible_departments_mask', 'eligible_years_mask'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_saved_searches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='eligible_departments_mask',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='eligible_years_mask',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def _grouped(queryset, owner_type, owner_field, entity, status_field='status'):
+    rows = queryset.order_by().values(owner_field, status_field).annotate(n=Count('pk'))
+    return {
+        (owner_type, row[owner_field], entity, row[status_field]): row['n']
+        for row in rows if row[owner_field] is not None
+    }
+
+
+def fill_counters(apps, schema_editor):
+    # The counts as of this migration, from the historical models
+    StatusCounter = apps.get_model('projects', 'StatusCounter')
+    Project = apps.get_model('projects', 'Project')
+    ProjectApplication = apps.get_model('projects', 'ProjectApplication')
+    Student = apps.get_model('accounts', 'Student')
+    Company = apps.get_model('accounts', 'Company')
+
+    projects = Project.objects.all()
+    applications = ProjectApplication.objects.all()
+    counts = {}
+    counts.update(_grouped(projects, 'company', 'company_id', 'project'))
+    counts.update(_grouped(projects, 'university', 'university_id', 'project'))
+    counts.update(_grouped(
+        projects.filter(posted_by_university=True), 'university', 'university_id', 'posted_project',
+    ))
+    counts.update(_grouped(applications, 'student', 'student_id', 'application'))
+    counts.update(_grouped(applications, 'project', 'project_id', 'application'))
+    counts.update(_grouped(
+        applications.filter(project__posted_by_university=True),
+        'university', 'project__university_id', 'application',
+    ))
+    counts.update(_grouped(
+        Project.assigned_students.through.objects.all(),
+        'student', 'student_id', 'assignment', 'project__status',
+    ))
+    counts.update(_grouped(
+        Student.objects.all(), 'university', 'university_id', 'student', 'verification_status',
+    ))
+    counts.update(_grouped(
+        Company.objects.all(), 'university', 'verified_by_id', 'company', 'verification_status',
+    ))
+    StatusCounter.objects.bulk_create([
+        StatusCounter(owner_type=owner_type, owner_id=owner_id, entity=entity, status=status, count=count)
+        for (owner_type, owner_id, entity, status), count in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_eligibility_masks'),
+        ('accounts', '0007_student_roster_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('owner_type', models.CharField(choices=[('company', 'Company'), ('university', 'University'), ('student', 'Student'), ('project', 'Project')], max_length=20)),
+                ('owner_id', models.PositiveBigIntegerField()),
+                ('entity', models.CharField(choices=[('project', 'Projects'), ('posted_project', 'Projects posted by the university'), ('application', 'Applications'), ('assignment', 'Assigned projects'), ('student', 'Students'), ('company', 'Companies verified')], max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'status_counters',
+                'unique_together': {('owner_type', 'owner_id', 'entity', 'status')},
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_status_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deliverable',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='deliverables/'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='attachment',
+            field=models.FileField(blank=True, db_index=True, help_text='Upload the detailed job description document', null=True, upload_to='project_attachments/', verbose_name='Job Description (JD)'),
+        ),
+    ]
@@ -6,13 +6,22 @@ Project (main project model)
 ProjectApplication (student applications)
 Milestone (project milestones)
 Deliverable (student submissions)
+SavedSearch (a student's stored project list filters)
+SavedSearchTerm (inverted index: term -> saved searches that require it)
+Notification (per-user notices, e.g. a new project matching a saved search)
+StatusCounter (rows per status of one owner's projects/applications/students)
+Blob (one stored upload per distinct content, shared by the file fields holding it)
 """
 from django.db import models
 from django.core.validators import MinValueValidator
-from apps.accounts.models import Company, University, Student
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+from apps.accounts.models import AtomicSaveMixin, User, Company, University, Student, Skill
+from .eligibility import department_mask, year_mask
 
 
-class Project(models.Model):
+class Project(AtomicSaveMixin, models.Model):
     """Main project model"""
     STATUS_CHOICES = (
         ('draft', 'Draft'),
@@ -66,6 +75,8 @@ class Project(models.Model):
 
     # Requirements
     required_skills = models.TextField(help_text="Comma-separated skills")
+    # Canonical version of required_skills, kept in sync on save
+    skill_tags = models.ManyToManyField(Skill, related_name='projects', blank=True)
     team_type = models.CharField(max_length=20, choices=TEAM_TYPE_CHOICES, default='individual')
     team_size = models.IntegerField(default=1, validators=[MinValueValidator(1)])
 
@@ -77,6 +88,9 @@ class Project(models.Model):
     eligible_departments = models.TextField(blank=True, help_text="Comma-separated departments, leave blank for all")
     min_gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
     eligible_years = models.CharField(max_length=100, blank=True, help_text="e.g., 2,3,4")
+    # Bitmask versions of the two lists above (0 = no restriction), kept in sync by save()
+    eligible_departments_mask = models.IntegerField(default=0, editable=False)
+    eligible_years_mask = models.IntegerField(default=0, editable=False)
 
     # Payment - RENAMED FIELD (but keeping same DB column for backward compatibility)
     payment_amount = models.DecimalField(max_digits=10, decimal_places=2,
@@ -95,7 +109,7 @@ class Project(models.Model):
     rejection_reason = models.TextField(blank=True)
 
     # Attachments - RENAMED
-    attachment = models.FileField(upload_to='project_attachments/', blank=True, null=True,
+    attachment = models.FileField(upload_to='project_attachments/', blank=True, null=True, db_index=True,
                                    verbose_name="Job Description (JD)",
                                    help_text="Upload the detailed job description document")
 
@@ -112,11 +126,22 @@ class Project(models.Model):
     class Meta:
         db_table = 'projects'
         ordering = ['-created_at']
+        indexes = [
+            # Listing: open projects for a university, newest first
+            models.Index(fields=['status', 'university', 'created_at'], name='project_status_uni_created_idx'),
+            # Company dashboard / projects page
+            models.Index(fields=['company', 'status'], name='project_company_status_idx'),
+        ]
 
     def __str__(self):
         poster_name = self.company.name if self.company else self.university.name
         return f"{self.title} - {poster_name}"
 
+    def save(self, *args, **kwargs):
+        self.eligible_departments_mask = department_mask(self.eligible_departments)
+        self.eligible_years_mask = year_mask(self.eligible_years)
+        super().save(*args, **kwargs)
+
     def get_poster_name(self):
         """Get the name of whoever posted the project"""
         return self.company.name if self.company else self.university.name
@@ -134,6 +159,11 @@ class Project(models.Model):
     def get_required_skills_list(self):
         return [skill.strip() for skill in self.required_skills.split(',') if skill.strip()]
 
+    @cached_property
+    def skills_list(self):
+        """Required skills split once per instance (card templates read it several times)"""
+        return self.get_required_skills_list()
+
     def get_eligible_departments_list(self):
         if not self.eligible_departments:
             return []
@@ -145,7 +175,7 @@ class Project(models.Model):
         return [year.strip() for year in self.eligible_years.split(',') if year.strip()]
 
 
-class ProjectApplication(models.Model):
+class ProjectApplication(AtomicSaveMixin, models.Model):
     """Student applications to projects"""
     STATUS_CHOICES = (
         ('pending', 'Pending Review'),
@@ -178,6 +208,9 @@ class ProjectApplication(models.Model):
         db_table = 'project_applications'
         unique_together = ['project', 'student']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'status'], name='application_project_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.user.get_full_name()} - {self.project.title}"
@@ -231,7 +264,7 @@ class Deliverable(models.Model):
 
     title = models.CharField(max_length=200)
     description = models.TextField()
-    file = models.FileField(upload_to='deliverables/')
+    file = models.FileField(upload_to='deliverables/', db_index=True)
     submission_notes = models.TextField(blank=True)
 
     # Review
@@ -247,4 +280,138 @@ class Deliverable(models.Model):
         ordering = ['-submitted_at']
 
     def __str__(self):
-        return f"{self.title} - {self.project.title}"
\ No newline at end of file
+        return f"{self.title} - {self.project.title}"
+
+
+class SavedSearch(models.Model):
+    """ProjectListView filters a student wants to be told about"""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='saved_searches')
+    # Copied from the student so matching never joins through students
+    university = models.ForeignKey(University, on_delete=models.CASCADE, related_name='saved_searches')
+
+    name = models.CharField(max_length=100)
+    search = models.CharField(max_length=200, blank=True)
+    domain = models.CharField(max_length=50, choices=Project.DOMAIN_CHOICES, blank=True)
+    min_payment = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_payment = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
+    # Number of SavedSearchTerm rows; a project matches when it contains all of them
+    term_count = models.PositiveSmallIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'saved_searches'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.student})"
+
+    def get_query_params(self):
+        """ProjectListView GET params that reproduce this search"""
+        params = {
+            'search': self.search,
+            'domain': self.domain,
+            'min_payment': self.min_payment,
+            'max_payment': self.max_payment,
+        }
+        return {key: value for key, value in params.items() if value not in ('', None)}
+
+    def get_list_url(self):
+        return reverse('projects:list') + '?' + urlencode(self.get_query_params())
+
+
+class SavedSearchTerm(models.Model):
+    """One required term of a saved search: a word prefix or domain:<value>"""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = 'saved_search_terms'
+        unique_together = ['saved_search', 'term']
+        indexes = [
+            models.Index(fields=['term', 'saved_search'], name='saved_search_term_idx'),
+        ]
+
+    def __str__(self):
+        return self.term
+
+
+class Notification(models.Model):
+    """Something a user should look at, optionally about a project"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True, blank=True,
+                                related_name='notifications')
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='notifications')
+
+    message = models.CharField(max_length=255)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'notifications'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notification_user_unread_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.message}"
+
+
+class StatusCounter(models.Model):
+    """
+    How many of an owner's projects, applications, students, ... are in one
+    status. Maintained by counters.py; dashboards read these instead of counting.
+    """
+    OWNER_TYPE_CHOICES = (
+        ('company', 'Company'),
+        ('university', 'University'),
+        ('student', 'Student'),
+        ('project', 'Project'),
+    )
+
+    ENTITY_CHOICES = (
+        ('project', 'Projects'),
+        ('posted_project', 'Projects posted by the university'),
+        ('application', 'Applications'),
+        ('assignment', 'Assigned projects'),
+        ('student', 'Students'),
+        ('company', 'Companies verified'),
+    )
+
+    owner_type = models.CharField(max_length=20, choices=OWNER_TYPE_CHOICES)
+    owner_id = models.PositiveBigIntegerField()
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'status_counters'
+        unique_together = ['owner_type', 'owner_id', 'entity', 'status']
+
+    def __str__(self):
+        return f"{self.owner_type} {self.owner_id} {self.entity} {self.status}: {self.count}"
+
+
+class Blob(models.Model):
+    """
+    One stored upload, kept once per distinct content under its SHA-256
+    digest and shared by every file field holding that content. Maintained
+    by blobs.py.
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'blobs'
+        indexes = [
+            # collect_blobs: unreferenced blobs past the grace period
+            models.Index(fields=['references', 'created_at'], name='blob_unreferenced_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} bytes, {self.references} references)"
@@ -0,0 +1,218 @@
+"""
+Purpose: Keyset (cursor) pagination for list views
+Contains:
+
+CursorPaginator (pages by (created_at, id) instead of COUNT + OFFSET)
+CursorPage (page object handed to templates as page_obj)
+CursorPaginationMixin (opt-in for ListViews)
+approximate_count (cheap row estimate for big tables)
+
+A view opts in by adding CursorPaginationMixin. Cursor mode is then used
+when the request has ?paginate=cursor (or the view sets pagination_mode =
+'cursor'), and every next/previous link carries a signed, opaque ?cursor=
+token that also stores the filter params the listing was built with.
+"""
+import json
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404, QueryDict
+
+CURSOR_SALT = 'apps.projects.pagination.cursor'
+APPROXIMATE_COUNT_CAP = 1000
+
+
+def encode_cursor(position, direction, params):
+    """Sign (position, direction, filter params) into an opaque token"""
+    return signing.dumps(
+        {'p': position, 'd': direction, 'q': params},
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def decode_cursor(token):
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise Http404('Invalid page cursor.')
+    if data.get('d') not in ('next', 'prev') or not isinstance(data.get('p'), list):
+        raise Http404('Invalid page cursor.')
+    return data
+
+
+def approximate_count(queryset, cap=APPROXIMATE_COUNT_CAP):
+    """
+    Estimate queryset.count() without paying for an exact COUNT(*).
+    Returns (count, kind): the planner's row estimate on PostgreSQL
+    (kind 'estimate'), a count that stops at cap rows everywhere else
+    (kind 'capped' once it hits the cap, otherwise 'exact').
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        plan = json.loads(queryset.explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows']), 'estimate'
+    count = queryset[:cap + 1].count()
+    if count > cap:
+        return cap, 'capped'
+    return count, 'exact'
+
+
+class CursorPage:
+    """One page of a CursorPaginator, shaped like django's Page where it matters"""
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator ordered newest first by keys (default created_at, id).
+    Each page is one indexed range scan of per_page + 1 rows; there is no
+    OFFSET, and the total is only computed if asked for.
+    """
+
+    def __init__(self, queryset, per_page, keys=('created_at', 'id'), total='approximate'):
+        self.queryset = queryset.order_by(*['-%s' % key for key in keys])
+        self.per_page = int(per_page)
+        self.keys = keys
+        self.total_mode = total
+        self._total = None
+
+    def _total_pair(self):
+        if self._total is None:
+            if self.total_mode == 'exact':
+                self._total = (self.queryset.count(), 'exact')
+            elif self.total_mode == 'approximate':
+                self._total = approximate_count(self.queryset)
+            else:
+                self._total = (None, None)
+        return self._total
+
+    @property
+    def count(self):
+        """Total rows (exact or approximate, see count_label), or None"""
+        return self._total_pair()[0]
+
+    @property
+    def count_label(self):
+        """Total formatted for display: '42', '1000+' or '~52000'"""
+        count, kind = self._total_pair()
+        if count is None:
+            return ''
+        return {'capped': '%d+', 'estimate': '~%d'}.get(kind, '%d') % count
+
+    def _position(self, obj):
+        values = []
+        for key in self.keys:
+            value = getattr(obj, key)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return values
+
+    def _keyset_filter(self, position, lookup):
+        """(k1, k2, ...) strictly before/after position in lexicographic order"""
+        opts = self.queryset.model._meta
+        values = [opts.get_field(key).to_python(value) for key, value in zip(self.keys, position)]
+        condition = Q()
+        for index, key in enumerate(self.keys):
+            term = Q(**{prefix: values[i] for i, prefix in enumerate(self.keys[:index])})
+            term &= Q(**{'%s__%s' % (key, lookup): values[index]})
+            condition |= term
+        return condition
+
+    def page(self, cursor=None, params=None):
+        """Return the page after/before cursor (a decoded token), or the first page"""
+        params = params or {}
+        direction = cursor['d'] if cursor else 'next'
+        queryset = self.queryset
+
+        if cursor:
+            try:
+                if direction == 'next':
+                    queryset = queryset.filter(self._keyset_filter(cursor['p'], 'lt'))
+                else:
+                    queryset = queryset.filter(self._keyset_filter(cursor['p'], 'gt')).reverse()
+            except (ValidationError, TypeError, ValueError):
+                raise Http404('Invalid page cursor.')
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'prev':
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(self._position(rows[-1]), 'next', params)
+        if rows and has_previous:
+            previous_cursor = encode_cursor(self._position(rows[0]), 'prev', params)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """
+    Opt-in keyset pagination for ListView subclasses.
+    pagination_mode: 'offset' (Django default) or 'cursor'; ?paginate= overrides
+    cursor_total: 'exact', 'approximate' or None (no count query at all)
+    """
+    pagination_mode = 'offset'
+    cursor_param = 'cursor'
+    cursor_total = 'approximate'
+    cursor_keys = ('created_at', 'id')
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.cursor = None
+        token = request.GET.get(self.cursor_param)
+        if token:
+            self.cursor = decode_cursor(token)
+            # Restore the filters this cursor was issued for, so get_queryset()
+            # and the filter form see them exactly as on the first page
+            restored = QueryDict(mutable=True)
+            for key, values in self.cursor['q'].items():
+                restored.setlist(key, values)
+            restored._mutable = False
+            request.GET = restored
+
+    def use_cursor_pagination(self):
+        if self.cursor is not None:
+            return True
+        return self.request.GET.get('paginate', self.pagination_mode) == 'cursor'
+
+    def get_cursor_params(self):
+        """Request params to carry inside the cursor token"""
+        return {
+            key: values for key, values in self.request.GET.lists()
+            if key not in (self.cursor_param, self.page_kwarg, 'paginate')
+        }
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, keys=self.cursor_keys, total=self.cursor_total)
+        page = paginator.page(self.cursor, params=self.get_cursor_params())
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,89 @@
+"""
+Purpose: Access rules for the project sub-pages, checked against one fetched object
+Contains:
+
+RULES (rule name -> check of the request's profile against a project)
+has_access (does any of the named rules allow the request on a project)
+ProjectPermissionMixin (fetch the view's object once, test rules on its project)
+
+A view names the object it acts on (a Project, or something with a
+.project, such as an application, milestone or deliverable) and the rules
+that grant access. The mixin fetches that object in test_func with its
+project, company and university joined, keeps it on the view, and hands the
+same instance to get_object(), get_context_data() and the handlers, so the
+page no longer loads the project again in each of them. Ownership is
+compared by id against request.profile, which costs no query; only
+'assigned_student' runs one, an EXISTS on the assignment table through the
+request's Membership (membership.py), which the view and template reuse.
+"""
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.shortcuts import get_object_or_404
+
+from .membership import membership
+from .models import Project
+
+
+def _is(request, user_type):
+    return request.user.user_type == user_type and request.profile is not None
+
+
+def _company(request, project):
+    return _is(request, 'company') and project.company_id == request.profile.pk
+
+
+def _university(request, project):
+    return _is(request, 'university') and project.university_id == request.profile.pk
+
+
+def _posting_university(request, project):
+    return project.posted_by_university and _university(request, project)
+
+
+def _assigned_student(request, project):
+    return membership(request).is_assigned(project)
+
+
+# name: (request, project) -> bool
+RULES = {
+    'company': _company,  # the company that owns the project
+    'university': _university,  # the project's university, whoever posted it
+    'posting_university': _posting_university,  # the university, for projects it posted itself
+    'poster': lambda request, project: membership(request).is_owner(project),
+    'assigned_student': _assigned_student,
+}
+
+
+def has_access(request, project, rules):
+    return any(RULES[rule](request, project) for rule in rules)
+
+
+class ProjectPermissionMixin(UserPassesTestMixin):
+    """
+    Replaces test_func. permission_model / permission_url_kwarg say which
+    object the url points at; permission_rules which RULES grant access to
+    its project; permission_select_related is joined on top of the project
+    and its owners.
+    """
+    permission_model = Project
+    permission_url_kwarg = 'pk'
+    permission_rules = ('poster',)
+    permission_select_related = ()
+
+    def get_permission_object(self):
+        if not hasattr(self, '_permission_object'):
+            prefix = '' if self.permission_model is Project else 'project__'
+            queryset = self.permission_model._default_manager.select_related(
+                *(prefix + 'company', prefix + 'university'), *self.permission_select_related,
+            )
+            self._permission_object = get_object_or_404(queryset, pk=self.kwargs[self.permission_url_kwarg])
+        return self._permission_object
+
+    def get_project(self):
+        obj = self.get_permission_object()
+        return obj if isinstance(obj, Project) else obj.project
+
+    def get_object(self, queryset=None):
+        return self.get_permission_object()
+
+    def test_func(self):
+        return has_access(self.request, self.get_project(), self.permission_rules)
@@ -0,0 +1,81 @@
+"""
+Purpose: Rank a project's applicants for the company/university shortlist
+Contains:
+
+SKILL_WEIGHT / GPA_WEIGHT (how the match score is composed)
+rank_applications (score every open application in one pass, keep the top k)
+
+Loading is two queries whatever the number of applicants: the applications
+joined to student and user, and the (student, skill) rows restricted to the
+project's required skills. Scoring is NumPy over all applicants at once:
+
+    score = SKILL_WEIGHT * share of required skills + GPA_WEIGHT * gpa / 10
+
+Applicants who miss the department/year/GPA limits are scored one point
+lower so they sort after everyone eligible. heapq.nlargest picks the top k.
+"""
+import heapq
+
+import numpy as np
+
+from apps.accounts.models import Student
+from .eligibility import department_bit, year_bit
+
+SKILL_WEIGHT = 0.7
+GPA_WEIGHT = 0.3
+RANKED_STATUSES = ('pending', 'shortlisted')
+DEFAULT_TOP_K = 50
+MAX_TOP_K = 500
+
+
+def rank_applications(project, k=DEFAULT_TOP_K):
+    """
+    (top k pending/shortlisted applications of project, best first, number
+    of required skills). Each application is annotated with match_score
+    (0-100), matched_skills (out of that number) and is_eligible.
+    """
+    applications = list(
+        project.applications.filter(status__in=RANKED_STATUSES)
+        .select_related('student__user').order_by('created_at')
+    )
+    if not applications:
+        return [], 0
+
+    students = [application.student for application in applications]
+    row_of = {student.pk: row for row, student in enumerate(students)}
+
+    required = list(project.skill_tags.values_list('pk', flat=True))
+    hit_rows = [
+        row_of[student_id]
+        for student_id in Student.skill_tags.through.objects.filter(
+            student_id__in=list(row_of), skill_id__in=required,
+        ).values_list('student_id', flat=True)
+    ]
+    matched = np.bincount(np.array(hit_rows, dtype=np.int64), minlength=len(students))
+    coverage = matched / len(required) if required else np.zeros(len(students))
+
+    gpa = np.array([float(s.gpa) if s.gpa is not None else np.nan for s in students])
+    departments = np.array([department_bit(s.department) for s in students], dtype=np.int64)
+    years = np.array([year_bit(s.year) for s in students], dtype=np.int64)
+
+    eligible = np.ones(len(students), dtype=bool)
+    if project.eligible_departments_mask:
+        eligible &= (departments & project.eligible_departments_mask) != 0
+    if project.eligible_years_mask:
+        eligible &= (years & project.eligible_years_mask) != 0
+    if project.min_gpa is not None:
+        eligible &= np.nan_to_num(gpa, nan=-1.0) >= float(project.min_gpa)
+
+    scores = SKILL_WEIGHT * coverage + GPA_WEIGHT * np.nan_to_num(gpa, nan=0.0) / 10
+    scores[~eligible] -= 1
+
+    # Ties go to the earlier application
+    best = heapq.nlargest(k, range(len(applications)), key=lambda row: (scores[row], -row))
+    ranked = []
+    for row in best:
+        application = applications[row]
+        application.match_score = round(float(max(scores[row] + (not eligible[row]), 0)) * 100)
+        application.matched_skills = int(matched[row])
+        application.is_eligible = bool(eligible[row])
+        ranked.append(application)
+    return ranked, len(required)
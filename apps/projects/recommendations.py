@@ -0,0 +1,341 @@
+"""
+Purpose: Rank open projects for students with sparse matrix products
+Contains:
+
+FeatureSpace (term -> column mapping shared by all vectors)
+ProjectMatrix (open projects of one university as sparse rows, updated in place)
+student_terms / project_terms (models -> feature terms)
+recommend_projects (top-k project ids for one student)
+recommend_for_students (top-k project ids for many students in one product)
+project_changed / project_removed / student_changed (incremental upkeep, called from signals)
+
+A project row holds two kinds of features:
+    match       1/len(skills) per required skill + DOMAIN_WEIGHT for its domain
+    eligibility one column per allowed department and per allowed year
+A student vector has a 1 for each of their skills, preferred domains,
+department and year. One sparse product then gives, per project, the share
+of required skills the student has (+ the domain bonus), and a second one
+tells whether both eligibility blocks are satisfied. GPA is a vector compare.
+
+Each process keeps its matrices in memory. Writes update the local matrix row
+and replace a per-university version token in the default cache; another
+process seeing a token it did not write rebuilds that university's matrix
+(two queries). This relies on every process sharing that cache (Redis via
+REDIS_URL, see settings.CACHES and checks.py): with a per-process cache the
+other processes never see the new token.
+"""
+import threading
+import uuid
+
+import numpy as np
+from scipy import sparse
+from django.core.cache import cache
+
+from apps.accounts.models import Student
+from config.metrics import record_cache
+from .forms import ProjectForm
+from .models import Project
+
+DOMAIN_WEIGHT = 0.5
+RECOMMENDATION_LIMIT = 24
+STUDENT_TERMS_TIMEOUT = 3600
+
+_lock = threading.RLock()
+_matrices = {}
+
+
+def _normalize(text):
+    return ' '.join((text or '').split()).casefold()
+
+
+def _choice_lookup(*choice_lists):
+    """Normalized value or label -> choice value"""
+    lookup = {}
+    for choices in choice_lists:
+        for value, label in choices:
+            lookup[_normalize(value)] = value
+            lookup[_normalize(label)] = value
+    return lookup
+
+
+DOMAINS = _choice_lookup(Project.DOMAIN_CHOICES)
+DEPARTMENTS = _choice_lookup(ProjectForm.DEPARTMENT_CHOICES)
+YEARS = _choice_lookup(ProjectForm.YEAR_CHOICES, Student.YEAR_CHOICES)
+
+
+def _canonical(text, lookup):
+    key = _normalize(text)
+    return lookup.get(key, key)
+
+
+def _split(text):
+    return [part for part in (_normalize(p) for p in (text or '').split(',')) if part]
+
+
+class FeatureSpace:
+    """Grow-only mapping of feature terms to column numbers"""
+
+    def __init__(self):
+        self.columns = {}
+
+    def __len__(self):
+        return len(self.columns)
+
+    def column(self, term):
+        if term not in self.columns:
+            self.columns[term] = len(self.columns)
+        return self.columns[term]
+
+    def known(self, terms):
+        return [self.columns[term] for term in terms if term in self.columns]
+
+
+FEATURES = FeatureSpace()
+
+
+def project_terms(project, skill_ids):
+    """
+    (match terms {term: weight}, department terms, year terms, min gpa)
+    for one project. Empty department/year lists mean "open to all".
+    """
+    match = {}
+    if skill_ids:
+        weight = 1.0 / len(skill_ids)
+        match.update(('skill:%d' % skill_id, weight) for skill_id in skill_ids)
+    match['domain:%s' % project.domain] = DOMAIN_WEIGHT
+
+    departments = ['department:%s' % _canonical(d, DEPARTMENTS) for d in _split(project.eligible_departments)]
+    years = ['year:%s' % _canonical(y, YEARS) for y in _split(project.eligible_years)]
+    min_gpa = float(project.min_gpa) if project.min_gpa is not None else 0.0
+    return match, departments, years, min_gpa
+
+
+def _student_key(student_id):
+    return 'recommendations:student:%d' % student_id
+
+
+def student_terms(students):
+    """{student pk: (feature terms, gpa)}, cached until the profile changes"""
+    keys = {_student_key(student.pk): student for student in students}
+    found = cache.get_many(keys)
+    results = {keys[key].pk: value for key, value in found.items()}
+
+    missing = [student for key, student in keys.items() if key not in found]
+    record_cache('student_terms', hits=len(found), misses=len(missing))
+    if missing:
+        skills = {}
+        for student_id, skill_id in Student.skill_tags.through.objects.filter(
+            student__in=missing,
+        ).values_list('student_id', 'skill_id'):
+            skills.setdefault(student_id, []).append(skill_id)
+
+        fresh = {}
+        for student in missing:
+            terms = ['skill:%d' % pk for pk in skills.get(student.pk, [])]
+            terms += ['domain:%s' % _canonical(d, DOMAINS) for d in _split(student.preferred_domains)]
+            terms.append('department:%s' % _canonical(student.department, DEPARTMENTS))
+            terms.append('year:%s' % _canonical(student.year, YEARS))
+            gpa = float(student.gpa) if student.gpa is not None else None
+            results[student.pk] = fresh[_student_key(student.pk)] = (terms, gpa)
+        cache.set_many(fresh, STUDENT_TERMS_TIMEOUT)
+    return results
+
+
+class ProjectMatrix:
+    """Sparse feature rows for the open projects of one university"""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.row_of = {}
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.min_gpa = np.zeros(0)
+        self.open_blocks = np.zeros(0, dtype=np.int8)
+        self.match = sparse.lil_matrix((0, 0))
+        self.eligibility = sparse.lil_matrix((0, 0))
+        self._compiled = None
+
+    def _reserve(self, rows):
+        """Make room for at least rows rows and every known feature column"""
+        capacity = len(self.ids)
+        if rows > capacity:
+            capacity = max(rows, capacity * 2, 64)
+            grow = capacity - len(self.ids)
+            self.ids = np.concatenate([self.ids, np.zeros(grow, dtype=np.int64)])
+            self.alive = np.concatenate([self.alive, np.zeros(grow, dtype=bool)])
+            self.min_gpa = np.concatenate([self.min_gpa, np.zeros(grow)])
+            self.open_blocks = np.concatenate([self.open_blocks, np.zeros(grow, dtype=np.int8)])
+        columns = max(len(FEATURES), self.match.shape[1])
+        if (capacity, columns) != self.match.shape:
+            self.match.resize((capacity, columns))
+            self.eligibility.resize((capacity, columns))
+
+    def put(self, project, skill_ids):
+        """Insert or overwrite the row of an open project"""
+        match, departments, years, min_gpa = project_terms(project, skill_ids)
+        for term in list(match) + departments + years:
+            FEATURES.column(term)
+
+        row = self.row_of.get(project.pk)
+        if row is None:
+            row = len(self.row_of)
+            self.row_of[project.pk] = row
+        self._reserve(row + 1)
+
+        self.match.rows[row] = sorted(FEATURES.column(term) for term in match)
+        self.match.data[row] = [weight for _, weight in sorted(
+            (FEATURES.column(term), weight) for term, weight in match.items()
+        )]
+        eligible = sorted({FEATURES.column(term) for term in departments + years})
+        self.eligibility.rows[row] = eligible
+        self.eligibility.data[row] = [1.0] * len(eligible)
+
+        self.ids[row] = project.pk
+        self.alive[row] = True
+        self.min_gpa[row] = min_gpa
+        self.open_blocks[row] = (not departments) + (not years)
+        self._compiled = None
+
+    def discard(self, project_id):
+        """Stop recommending a project; its row is reused if it reopens"""
+        row = self.row_of.get(project_id)
+        if row is not None:
+            self.alive[row] = False
+
+    def compiled(self):
+        """(match CSR, eligibility CSR), converted once per batch of changes"""
+        if self._compiled is None:
+            self._compiled = (self.match.tocsr(), self.eligibility.tocsr())
+        return self._compiled
+
+    def scores(self, vectors, gpas):
+        """
+        vectors: CSR (students x features), gpas: array (nan = unknown)
+        -> dense (students x rows) scores, -inf where not eligible
+        """
+        match, eligibility = self.compiled()
+        vectors = vectors.copy()
+        vectors.resize((vectors.shape[0], match.shape[1]))
+
+        scores = (vectors @ match.T).toarray()
+        satisfied = (vectors @ eligibility.T).toarray() + self.open_blocks
+        eligible = (satisfied >= 2) & self.alive
+        gpas = np.nan_to_num(gpas, nan=-np.inf)[:, None]  # unknown GPA fails any minimum
+        eligible &= (self.min_gpa == 0) | (gpas >= self.min_gpa)
+        scores[~eligible] = -np.inf
+        return scores
+
+    def top(self, scores, k):
+        """Top-k project ids per row of scores (best first, positive scores only)"""
+        results = []
+        k = min(k, scores.shape[1])
+        for row in scores:
+            if not k:
+                results.append([])
+                continue
+            best = np.argpartition(-row, k - 1)[:k]
+            best = best[np.lexsort((-self.ids[best], -row[best]))]  # ties: newest first
+            results.append([int(self.ids[i]) for i in best if row[i] > 0])
+        return results
+
+
+def _vectors(students):
+    """Students -> (CSR of their feature terms, gpa array)"""
+    rows, columns, gpas = [], [], []
+    features = student_terms(students)
+    for index, student in enumerate(students):
+        terms, gpa = features[student.pk]
+        known = FEATURES.known(terms)
+        rows.extend([index] * len(known))
+        columns.extend(known)
+        gpas.append(np.nan if gpa is None else gpa)
+    vectors = sparse.csr_matrix(
+        (np.ones(len(columns)), (rows, columns)),
+        shape=(len(students), len(FEATURES)),
+    )
+    return vectors, np.array(gpas, dtype=float)
+
+
+def _version_key(university_id):
+    return 'recommendations:version:%s' % university_id
+
+
+def _build(university_id, version):
+    matrix = ProjectMatrix(version)
+    projects = list(Project.objects.filter(university_id=university_id, status='open').only(
+        'id', 'domain', 'eligible_departments', 'eligible_years', 'min_gpa',
+    ))
+    skills = {}
+    for project_id, skill_id in Project.skill_tags.through.objects.filter(
+        project__university_id=university_id, project__status='open',
+    ).values_list('project_id', 'skill_id'):
+        skills.setdefault(project_id, []).append(skill_id)
+    for project in projects:
+        matrix.put(project, skills.get(project.pk, []))
+    return matrix
+
+
+def project_matrix(university_id):
+    """This process's matrix for university_id, rebuilt if another process changed it"""
+    version = cache.get_or_set(_version_key(university_id), lambda: uuid.uuid4().hex, None)
+    with _lock:
+        matrix = _matrices.get(university_id)
+        stale = matrix is None or matrix.version != version
+        record_cache('project_matrix', hits=not stale, misses=stale)
+        if stale:
+            matrix = _matrices[university_id] = _build(university_id, version)
+        return matrix
+
+
+def recommend_for_students(students, limit=RECOMMENDATION_LIMIT):
+    """{student pk: [project id, ...]} for students, one product per university"""
+    by_university = {}
+    for student in students:
+        if student.university_id:
+            by_university.setdefault(student.university_id, []).append(student)
+
+    results = {student.pk: [] for student in students}
+    for university_id, group in by_university.items():
+        matrix = project_matrix(university_id)
+        vectors, gpas = _vectors(group)
+        with _lock:
+            ranked = matrix.top(matrix.scores(vectors, gpas), limit)
+        results.update((student.pk, ids) for student, ids in zip(group, ranked))
+    return results
+
+
+def recommend_projects(student, limit=RECOMMENDATION_LIMIT):
+    """Best matching open project ids for one student, best first"""
+    return recommend_for_students([student], limit)[student.pk]
+
+
+def _touch(university_id, update):
+    """Apply update to the local matrix and tell other processes to rebuild"""
+    current = cache.get(_version_key(university_id))
+    version = uuid.uuid4().hex
+    with _lock:
+        matrix = _matrices.get(university_id)
+        if matrix is not None and matrix.version == current:
+            update(matrix)
+            matrix.version = version
+        else:
+            # Missed someone else's change: rebuild on next use instead
+            _matrices.pop(university_id, None)
+    cache.set(_version_key(university_id), version, None)
+
+
+def project_changed(project):
+    """Upsert or drop the project's row depending on whether it is open"""
+    if project.status == 'open':
+        skill_ids = list(project.skill_tags.values_list('pk', flat=True))
+        _touch(project.university_id, lambda matrix: matrix.put(project, skill_ids))
+    else:
+        project_removed(project)
+
+
+def project_removed(project):
+    _touch(project.university_id, lambda matrix: matrix.discard(project.pk))
+
+
+def student_changed(student):
+    cache.delete(_student_key(student.pk))
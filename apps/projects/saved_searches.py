@@ -0,0 +1,94 @@
+"""
+Purpose: Saved project searches and matching new projects against them
+Contains:
+
+search_terms (saved search -> the index terms a project must contain)
+project_terms (project -> every index term it contains)
+create_saved_search (store filters + their inverted-index rows)
+matching_searches (saved searches a project satisfies, found via the index)
+notify_matches (bulk-create one notification per matching saved search)
+
+A saved search is an AND of terms: the word prefixes of its search text
+(same rule as search_projects) plus domain:<value>, or domain:* when any
+domain will do, so every search has at least one term. Matching a project
+looks up the terms the project contains in saved_search_terms and keeps the
+searches whose every term was hit; the payment range and university are
+then checked in the same query that loads them. Searches are never re-run.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import SavedSearch, SavedSearchTerm, Notification
+from .search import get_terms, TOKEN_RE
+
+ANY_DOMAIN = 'domain:*'
+MAX_PREFIX_LENGTH = SavedSearchTerm._meta.get_field('term').max_length
+LOOKUP_CHUNK = 500
+
+
+def search_terms(search, domain):
+    """Index terms for a search string + domain filter (de-duplicated)"""
+    terms = {'domain:%s' % domain if domain else ANY_DOMAIN}
+    terms.update(term[:MAX_PREFIX_LENGTH] for term in get_terms(search or ''))
+    return terms
+
+
+def project_terms(project):
+    """Every term a saved search could require of project"""
+    terms = {ANY_DOMAIN, 'domain:%s' % project.domain}
+    text = ' '.join((project.title, project.description, project.required_skills))
+    for word in set(TOKEN_RE.findall(text.lower())):
+        terms.update(word[:length] for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1))
+    return terms
+
+
+@transaction.atomic
+def create_saved_search(student, name, search='', domain='', min_payment=None, max_payment=None):
+    terms = search_terms(search, domain)
+    saved_search = SavedSearch.objects.create(
+        student=student, university=student.university, name=name,
+        search=search, domain=domain, min_payment=min_payment, max_payment=max_payment,
+        term_count=len(terms),
+    )
+    SavedSearchTerm.objects.bulk_create(
+        [SavedSearchTerm(saved_search=saved_search, term=term) for term in terms]
+    )
+    return saved_search
+
+
+def matching_searches(project):
+    """Saved searches (with student loaded) that project satisfies"""
+    terms = sorted(project_terms(project))
+    hits = Counter()
+    for start in range(0, len(terms), LOOKUP_CHUNK):
+        hits.update(SavedSearchTerm.objects.filter(
+            term__in=terms[start:start + LOOKUP_CHUNK],
+            saved_search__university_id=project.university_id,
+        ).values_list('saved_search_id', flat=True))
+    if not hits:
+        return []
+
+    amount = project.payment_amount
+    candidates = SavedSearch.objects.filter(
+        Q(min_payment__isnull=True) | Q(min_payment__lte=amount),
+        Q(max_payment__isnull=True) | Q(max_payment__gte=amount),
+        pk__in=list(hits),
+    ).select_related('student')
+    return [saved_search for saved_search in candidates if hits[saved_search.pk] == saved_search.term_count]
+
+
+def notify_matches(project):
+    """Notify every student whose saved search project matches; returns the count"""
+    notifications = [
+        Notification(
+            user_id=saved_search.student.user_id,
+            project=project,
+            saved_search=saved_search,
+            message=f'New project matching "{saved_search.name}": {project.title}'[:255],
+        )
+        for saved_search in matching_searches(project)
+    ]
+    Notification.objects.bulk_create(notifications)
+    return len(notifications)
@@ -0,0 +1,158 @@
+"""
+Purpose: Full-text search backend for projects
+Contains:
+
+search_projects (filter + rank a Project queryset by a search string)
+index_project / unindex_project (keep the index current, called from signals)
+rebuild_index (repopulate the whole index, e.g. after bulk_create)
+
+SQLite uses an FTS5 virtual table (projects_fts) keyed by project id.
+PostgreSQL uses a tsvector column on the projects table with a GIN index.
+Both are created by migration 0006. On any other backend, or if the index
+is missing, searching falls back to the old icontains scan.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Project
+
+SQLITE_TABLE = 'projects_fts'
+POSTGRES_COLUMN = 'search_vector'
+POSTGRES_CONFIG = 'english'
+
+# Column weights: title matters most, then skills, then description
+SQLITE_WEIGHTS = '10.0, 1.0, 5.0'  # order of the FTS5 columns below
+
+MAX_TERMS = 8
+TOKEN_RE = re.compile(r'\w+')
+
+_available = {}
+
+
+def get_terms(search):
+    """Split a raw search string into safe lowercase word tokens"""
+    return TOKEN_RE.findall(search.lower())[:MAX_TERMS]
+
+
+def is_available():
+    """Check whether the full-text index exists on the current database"""
+    key = (connection.alias, connection.vendor)
+    if key not in _available:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                _available[key] = SQLITE_TABLE in connection.introspection.table_names(cursor)
+            elif connection.vendor == 'postgresql':
+                columns = connection.introspection.get_table_description(cursor, Project._meta.db_table)
+                _available[key] = any(col.name == POSTGRES_COLUMN for col in columns)
+            else:
+                _available[key] = False
+    return _available[key]
+
+
+def _like_filter(queryset, search):
+    return queryset.filter(
+        Q(title__icontains=search) |
+        Q(description__icontains=search) |
+        Q(required_skills__icontains=search)
+    )
+
+
+def search_projects(queryset, search):
+    """
+    Restrict queryset to projects matching search and annotate search_rank
+    (higher is more relevant). Every term must match, as a word prefix.
+    """
+    terms = get_terms(search)
+    if not terms or not is_available():
+        return _like_filter(queryset, search).annotate(
+            search_rank=RawSQL('0', [], output_field=FloatField())
+        )
+
+    project_id = '%s.%s' % (
+        connection.ops.quote_name(Project._meta.db_table),
+        connection.ops.quote_name('id'),
+    )
+
+    if connection.vendor == 'sqlite':
+        # Join the FTS table so SQLite drives the query from the MATCH and
+        # computes bm25 once per hit. The unary + stops the planner probing
+        # the FTS table by rowid once per project row, which re-runs the MATCH
+        # every time.
+        match = ' '.join('"%s"*' % term for term in terms)
+        return queryset.extra(
+            tables=[SQLITE_TABLE],
+            where=[f'+{SQLITE_TABLE}.rowid = {project_id}', f'{SQLITE_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'-bm25({SQLITE_TABLE}, {SQLITE_WEIGHTS})'},
+        )
+
+    # PostgreSQL
+    tsquery = ' & '.join('%s:*' % term for term in terms)
+    column = '%s.%s' % (
+        connection.ops.quote_name(Project._meta.db_table),
+        connection.ops.quote_name(POSTGRES_COLUMN),
+    )
+    return queryset.filter(
+        RawSQL(f"{column} @@ to_tsquery('{POSTGRES_CONFIG}', %s)", [tsquery],
+               output_field=BooleanField())
+    ).annotate(
+        search_rank=RawSQL(f"ts_rank({column}, to_tsquery('{POSTGRES_CONFIG}', %s))", [tsquery],
+                           output_field=FloatField())
+    )
+
+
+def _postgres_document_sql():
+    return (
+        f"setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(required_skills, '')), 'B') || "
+        f"setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(description, '')), 'C')"
+    )
+
+
+def index_project(project):
+    """Add or refresh a single project in the index"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [project.pk])
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, description, required_skills) '
+                f'VALUES (%s, %s, %s, %s)',
+                [project.pk, project.title, project.description, project.required_skills]
+            )
+        else:
+            cursor.execute(
+                f'UPDATE {Project._meta.db_table} SET {POSTGRES_COLUMN} = {_postgres_document_sql()} '
+                f'WHERE id = %s',
+                [project.pk]
+            )
+
+
+def unindex_project(project_id):
+    """Remove a deleted project from the index"""
+    # Postgres keeps the vector on the row itself, so it goes with the row
+    if is_available() and connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [project_id])
+
+
+def rebuild_index():
+    """Repopulate the index from the projects table"""
+    if not is_available():
+        return
+    table = Project._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, description, required_skills) '
+                f'SELECT id, title, description, required_skills FROM {table}'
+            )
+            # Merge the many small segments a bulk insert leaves behind
+            cursor.execute(f"INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}) VALUES ('optimize')")
+        else:
+            cursor.execute(f'UPDATE {table} SET {POSTGRES_COLUMN} = {_postgres_document_sql()}')
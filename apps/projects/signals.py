@@ -0,0 +1,229 @@
+"""
+Purpose: Model signal handlers for the projects app
+Contains:
+
+Search index upkeep on Project save/delete
+Skill tag upkeep on Project save
+Facet cache invalidation when an open project appears, changes or goes away
+Recommendation matrix upkeep on Project save/delete and Student save
+Status counter upkeep on Project, ProjectApplication, Student and Company
+writes and on project assignment changes
+Fragment cache stamps of the owners of every such write (and University's)
+Blob reference counts of the file fields of Project, Deliverable, Student,
+Company and University
+"""
+from django.db.models.signals import m2m_changed, post_init, pre_delete, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.accounts.models import Company, Student, University
+from apps.accounts.skills import sync_skill_tags
+from .models import Deliverable, Project, ProjectApplication
+from . import search
+from .facets import invalidate_facets
+from . import recommendations
+from . import counters
+from . import fragments
+from . import blobs
+
+
+@receiver(post_save, sender=Project)
+def index_project_on_save(sender, instance, **kwargs):
+    search.index_project(instance)
+
+
+@receiver(post_delete, sender=Project)
+def unindex_project_on_delete(sender, instance, **kwargs):
+    search.unindex_project(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def sync_project_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'required_skills' in update_fields:
+        sync_skill_tags([instance])
+
+
+@receiver(post_init, sender=Project)
+def remember_loaded_status(sender, instance, **kwargs):
+    # __dict__ so a deferred status column is not loaded just for this
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Project)
+def refresh_listing_caches_on_save(sender, instance, **kwargs):
+    # Only open projects are counted or recommended, so only saves that touch one matter
+    status = instance.__dict__.get('status')
+    if 'open' in (status, instance._loaded_status):
+        invalidate_facets(instance.university_id)
+        recommendations.project_changed(instance)
+    instance._loaded_status = status
+
+
+@receiver(post_delete, sender=Project)
+def refresh_listing_caches_on_delete(sender, instance, **kwargs):
+    if 'open' in (instance.__dict__.get('status'), instance._loaded_status):
+        invalidate_facets(instance.university_id)
+        recommendations.project_removed(instance)
+
+
+@receiver(post_save, sender=Student)
+def refresh_student_recommendations(sender, instance, **kwargs):
+    recommendations.student_changed(instance)
+
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=ProjectApplication)
+@receiver(post_init, sender=Student)
+@receiver(post_init, sender=Company)
+def remember_counted_state(sender, instance, **kwargs):
+    instance._counted_state = counters.snapshot(instance)
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=ProjectApplication)
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=Company)
+def load_counted_state(sender, instance, **kwargs):
+    # Loaded with a counted field deferred: find out what the row holds before it changes
+    if instance._counted_state is None and not instance._state.adding:
+        instance._counted_state = counters.stored_state(instance)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ProjectApplication)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Company)
+def update_status_counters(sender, instance, created, **kwargs):
+    old = None if created else instance._counted_state
+    new = counters.current_state(instance, old)
+    if old == new:
+        return
+    deltas = counters.changes(sender, [old], [new])
+    if sender is Project and old and old['status'] != new['status']:
+        # Students' assigned-project counts follow the project's status
+        assigned = list(Project.assigned_students.through.objects.filter(
+            project_id=instance.pk,
+        ).values_list('project_id', 'student_id'))
+        deltas.update(counters.diff(
+            counters.assignment_keys(assigned, old['status']),
+            counters.assignment_keys(assigned, new['status']),
+        ))
+    counters.apply_deltas(deltas)
+    instance._counted_state = new
+
+
+@receiver(pre_delete, sender=Project)
+def remember_assignments(sender, instance, **kwargs):
+    # The assignment rows are gone by post_delete
+    instance._assigned_pairs = list(Project.assigned_students.through.objects.filter(
+        project_id=instance.pk,
+    ).values_list('project_id', 'student_id'))
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectApplication)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Company)
+def discount_deleted(sender, instance, **kwargs):
+    state = counters.current_state(instance, instance._counted_state)
+    deltas = counters.changes(sender, [state], [])
+    if sender is Project and state:
+        deltas.update(counters.diff(counters.assignment_keys(instance._assigned_pairs, state['status']), []))
+    counters.apply_deltas(deltas)
+    if sender is not ProjectApplication:
+        counters.forget_owner(sender._meta.model_name, instance.pk)
+
+
+@receiver(m2m_changed, sender=Project.assigned_students.through)
+def count_assignments(sender, instance, action, reverse, pk_set, **kwargs):
+    # reverse: instance is a Student and pk_set holds project ids
+    if action in ('pre_remove', 'pre_clear'):
+        pairs = sender.objects.filter(**{'student_id' if reverse else 'project_id': instance.pk})
+        if pk_set is not None:
+            pairs = pairs.filter(**{'project_id__in' if reverse else 'student_id__in': pk_set})
+        instance._removed_assignments = list(pairs.values_list('project_id', 'student_id'))
+    elif action in ('post_remove', 'post_clear'):
+        counters.apply_deltas(counters.diff(counters.assignment_keys(instance._removed_assignments), []))
+    elif action == 'post_add' and pk_set:
+        pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+        counters.apply_deltas(counters.diff([], counters.assignment_keys(pairs)))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ProjectApplication)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=University)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectApplication)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=University)
+def touch_fragment_owners(sender, instance, **kwargs):
+    owners = fragments.touched_owners(instance)
+    # A deleted project's assignment rows are already gone, see remember_assignments
+    owners += [('student', student_id) for _, student_id in getattr(instance, '_assigned_pairs', ())]
+    fragments.touch(owners)
+
+
+@receiver(m2m_changed, sender=Project.assigned_students.through)
+def touch_assignment_owners(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if action == 'pre_clear':
+        # pk_set is None on clear; these are the rows about to go
+        pk_set = set(sender.objects.filter(
+            **{'student_id' if reverse else 'project_id': instance.pk}
+        ).values_list('project_id' if reverse else 'student_id', flat=True))
+    projects = pk_set if reverse else [instance.pk]
+    students = [instance.pk] if reverse else pk_set
+    owners = [('student', pk) for pk in students]
+    owners += [
+        (owner_type, owner_id)
+        for company_id, university_id in Project.objects.filter(pk__in=projects).values_list('company_id', 'university_id')
+        for owner_type, owner_id in (('company', company_id), ('university', university_id))
+    ]
+    fragments.touch(owners)
+
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=Deliverable)
+@receiver(post_init, sender=Student)
+@receiver(post_init, sender=Company)
+@receiver(post_init, sender=University)
+def remember_file_names(sender, instance, **kwargs):
+    instance._file_names = blobs.snapshot(instance)
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Deliverable)
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=Company)
+@receiver(pre_save, sender=University)
+def load_file_names(sender, instance, **kwargs):
+    # Loaded with a file field deferred: find out what the row holds before it changes
+    if instance._file_names is None and not instance._state.adding:
+        instance._file_names = blobs.stored_names(instance)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Deliverable)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=University)
+def count_blob_references(sender, instance, created, **kwargs):
+    old = None if created else instance._file_names
+    new = blobs.current_names(instance, old)
+    gained, lost = blobs.changes(old, new)
+    blobs.retain(gained)
+    blobs.release(lost)
+    instance._file_names = new
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Deliverable)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=University)
+def release_blobs(sender, instance, **kwargs):
+    _, lost = blobs.changes(blobs.current_names(instance, instance._file_names), None)
+    blobs.release(lost)
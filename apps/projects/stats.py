@@ -0,0 +1,71 @@
+"""
+Purpose: Status breakdowns for dashboards and management pages
+Contains:
+
+PROJECT_GROUPS / APPLICATION_GROUPS / VERIFICATION_GROUPS (name -> statuses)
+conditions (groups -> name -> Q, for count_by)
+count_by (one conditional-aggregate query for a breakdown)
+tally (the same breakdown from a {status: count} dict, e.g. from counters.py)
+
+A breakdown maps each name on the page to the statuses it adds up (None
+means all of them). count_by turns it into a single SELECT COUNT(*),
+COUNT(*) FILTER (WHERE ...), ... over a queryset, instead of a COUNT query
+per number on the page. Breakdowns kept in the status counters table
+(counters.py) use tally on those rows and run no COUNT at all.
+"""
+from django.db.models import Count, Q
+
+# name: statuses counted under it (None: all of them)
+PROJECT_GROUPS = {
+    'total': None,
+    'draft': ('draft',),
+    'pending_review': ('pending_review',),
+    'open': ('open',),
+    'in_progress': ('in_progress',),
+    'completed': ('completed',),
+    'rejected': ('rejected',),
+    'cancelled': ('cancelled',),
+    'active': ('open', 'in_progress'),
+}
+
+APPLICATION_GROUPS = {
+    'total': None,
+    'pending': ('pending',),
+    'shortlisted': ('shortlisted',),
+    'accepted': ('accepted',),
+    'rejected': ('rejected',),
+    'withdrawn': ('withdrawn',),
+}
+
+VERIFICATION_GROUPS = {
+    'total': None,
+    'pending': ('pending',),
+    'approved': ('approved',),
+    'rejected': ('rejected',),
+}
+
+
+def conditions(groups, field='status'):
+    """{name: Q over field} for count_by"""
+    return {
+        name: Q(**{'%s__in' % field: statuses}) if statuses is not None else None
+        for name, statuses in groups.items()
+    }
+
+
+def count_by(queryset, counts):
+    """{name: number of rows of queryset matching counts[name]}, in one query"""
+    totals = queryset.order_by().aggregate(**{
+        name: Count('pk', filter=condition) if condition is not None else Count('pk')
+        for name, condition in counts.items()
+    })
+    return {name: totals[name] or 0 for name in counts}
+
+
+def tally(by_status, groups):
+    """{name: count} for groups, given {status: count}"""
+    return {
+        name: sum(by_status.values()) if statuses is None
+        else sum(by_status.get(status, 0) for status in statuses)
+        for name, statuses in groups.items()
+    }
@@ -0,0 +1,45 @@
+from django import template
+from django.core.cache import cache
+
+from config.metrics import record_cache
+from ..fragments import FRAGMENT_CACHE_TIMEOUT, fragment_key
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, name, owners):
+        self.nodelist = nodelist
+        self.name = name
+        self.owners = owners
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        values = [owner.resolve(context) for owner in self.owners]
+        key = fragment_key(name, zip(values[::2], values[1::2]))
+        html = cache.get(key)
+        record_cache('fragment:%s' % name, hits=html is not None, misses=html is None)
+        if html is None:
+            html = self.nodelist.render(context)
+            cache.set(key, html, FRAGMENT_CACHE_TIMEOUT)
+        return html
+
+
+@register.tag
+def fragment(parser, token):
+    """
+    Cache the enclosed template until one of the listed owners changes:
+
+        {% fragment 'company_projects' 'company' profile.pk %} ... {% endfragment %}
+
+    The name is followed by owner type / owner id pairs (see apps/projects/fragments.py).
+    Nothing inside may depend on the viewer (csrf tokens, messages, the user).
+    """
+    bits = token.split_contents()
+    if len(bits) < 4 or len(bits) % 2:
+        raise template.TemplateSyntaxError(
+            "'%s' takes a name followed by owner type / owner id pairs" % bits[0]
+        )
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(nodelist, parser.compile_filter(bits[1]), [parser.compile_filter(bit) for bit in bits[2:]])
@@ -7,6 +7,7 @@ Routes:
 /projects/create/ - Create project
 /projects/<id>/apply/ - Apply to project
 /projects/my-applications/ - View applications
+/projects/saved-searches/ - Saved searches and their notifications
 """
 from django.urls import path
 from . import views
@@ -27,10 +28,16 @@ urlpatterns = [
     path('<int:pk>/apply/', views.ProjectApplyView.as_view(), name='apply'),
     path('my-applications/', views.MyApplicationsView.as_view(), name='my_applications'),
 
+    # Student - Saved searches
+    path('saved-searches/', views.SavedSearchListView.as_view(), name='saved_searches'),
+    path('saved-searches/save/', views.SaveSearchView.as_view(), name='save_search'),
+    path('saved-searches/<int:pk>/delete/', views.SavedSearchDeleteView.as_view(), name='delete_saved_search'),
+
     # Company/University - Application management
     path('<int:pk>/applications/', views.ManageApplicationsView.as_view(), name='manage_applications'),
     path('<int:pk>/applications/<int:application_id>/action/', views.ApplicationActionView.as_view(),
          name='application_action'),
+    path('applications/bulk-action/', views.BulkApplicationActionView.as_view(), name='bulk_application_action'),
 
     # ADD THESE TWO NEW LINES ↓
     # University - Application Review (for their own projects)
@@ -11,18 +11,32 @@ PendingReviewView
 ProjectWorkspaceView
 And many more...
 """
-from django.db.models import Q
+from django.db.models import Q, Case, When, Value, IntegerField
 from django import forms
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.views import View
-from django.urls import reverse_lazy
+from django.http import Http404, JsonResponse
+from django.urls import reverse, reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.db import transaction
 from django.utils import timezone
-from .models import Project, ProjectApplication, Deliverable, Milestone
-from .forms import ProjectForm, ProjectApplicationForm, DeliverableForm, MilestoneForm
+from .models import Project, ProjectApplication, Deliverable, Milestone, SavedSearch, Notification
+from .forms import ProjectForm, ProjectApplicationForm, DeliverableForm, MilestoneForm, SavedSearchForm
+from .search import search_projects
+from .pagination import CursorPaginationMixin
+from .listing import count_subquery, project_cards
+from .facets import FACET_FIELDS, get_facets, payment_bucket_filter
+from .recommendations import recommend_projects
+from .saved_searches import create_saved_search, notify_matches
+from .eligibility import eligible_projects, eligibility_key
+from .ranking import rank_applications, DEFAULT_TOP_K, MAX_TOP_K
+from .bulk_actions import ACTIONS as BULK_ACTIONS, MAX_BULK_IDS, apply_bulk_action
+from .counters import owner_counts
+from .permissions import ProjectPermissionMixin
+from .membership import applied_by, assigned_to, membership
 from apps.accounts.models import Company, University, Student
 from django.db import models
 
@@ -30,12 +44,13 @@ from ..accounts.views import UniversityRequiredMixin
 
 
 
-class ProjectListView(ListView):
+class ProjectListView(CursorPaginationMixin, ListView):
     """List all available projects - filtered by student's university"""
     model = Project
     template_name = 'projects/list.html'
     context_object_name = 'projects'
     paginate_by = 12
+    query_budget = 8
 
     def get_queryset(self):
         # Base queryset - only open projects
@@ -43,8 +58,8 @@ class ProjectListView(ListView):
 
         # IMPORTANT: Filter by student's university if user is a student
         user = self.request.user
-        if user.is_authenticated and user.user_type == 'student' and hasattr(user, 'student_profile'):
-            student_university = user.student_profile.university
+        if user.is_authenticated and user.user_type == 'student' and self.request.profile is not None:
+            student_university = self.request.profile.university
 
             # UPDATED: Handle case where student hasn't selected university yet
             if student_university:
@@ -64,14 +79,10 @@ class ProjectListView(ListView):
         if university_id:
             queryset = queryset.filter(university_id=university_id)
 
-        # Search
+        # Search (full-text index, ranked by relevance)
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search) |
-                Q(required_skills__icontains=search)
-            )
+            queryset = search_projects(queryset, search)
 
         # Filter by payment range
         min_payment = self.request.GET.get('min_payment')
@@ -81,15 +92,63 @@ class ProjectListView(ListView):
         if max_payment:
             queryset = queryset.filter(payment_amount__lte=max_payment)
 
+        # Sidebar facets
+        for field in FACET_FIELDS:
+            value = self.request.GET.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        budget = self.request.GET.get('budget')
+        if budget:
+            queryset = queryset.filter(payment_bucket_filter(budget))
+
+        # Only projects whose department/year/GPA limits the student meets
+        if self.is_eligible_mode():
+            queryset = eligible_projects(queryset, self.request.profile)
+
+        # Facet counts are taken over the filtered rows, before the card projection
+        self.filtered_queryset = queryset
+
+        # "Recommended for you": best matches first, from the in-memory matrices
+        recommended = None
+        if self.is_recommended_mode():
+            recommended = recommend_projects(self.request.profile)
+            queryset = queryset.filter(pk__in=recommended)
+
+        # Card columns + poster name/logo in one joined query
+        queryset = project_cards(queryset)
+
+        if recommended:
+            return queryset.order_by(Case(
+                *[When(pk=pk, then=Value(rank)) for rank, pk in enumerate(recommended)],
+                output_field=IntegerField(),
+            ))
+        if search:
+            return queryset.order_by('-search_rank', '-created_at')
         return queryset.order_by('-created_at')
 
+    def is_recommended_mode(self):
+        return self.request.GET.get('recommended') == '1' and self.is_student()
+
+    def is_eligible_mode(self):
+        return self.request.GET.get('eligible') == '1' and self.is_student()
+
+    def is_student(self):
+        user = self.request.user
+        return user.is_authenticated and user.user_type == 'student' and self.request.profile is not None
+
+    def use_cursor_pagination(self):
+        # Search and recommendation results are ranked, not ordered by (created_at, id)
+        if self.request.GET.get('search') or self.is_recommended_mode():
+            return False
+        return super().use_cursor_pagination()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         # For students, show only their university
         user = self.request.user
-        if user.is_authenticated and user.user_type == 'student' and hasattr(user, 'student_profile'):
-            student_university = user.student_profile.university
+        if user.is_authenticated and user.user_type == 'student' and self.request.profile is not None:
+            student_university = self.request.profile.university
             if student_university:
                 context['universities'] = University.objects.filter(
                     id=student_university.id,
@@ -103,60 +162,83 @@ class ProjectListView(ListView):
             context['universities'] = University.objects.filter(is_verified=True)
 
         context['domain_choices'] = Project.DOMAIN_CHOICES
+        context['recommended_mode'] = self.is_recommended_mode()
+        params = self.request.GET.dict()
+        if self.is_eligible_mode():
+            # The eligible rows depend on the student, not just the request
+            params['eligible'] = eligibility_key(self.request.profile)
+        context['eligible_mode'] = self.is_eligible_mode()
+        context['facets'] = get_facets(
+            self.filtered_queryset, params, university_id=self.facet_university_id()
+        )
         return context
+
+    def facet_university_id(self):
+        """The university the listing is scoped to before any request filters"""
+        user = self.request.user
+        if user.is_authenticated and user.user_type == 'student' and self.request.profile is not None:
+            return self.request.profile.university_id
+        return None
+
+
 class ProjectDetailView(DetailView):
     """View project details"""
     model = Project
     template_name = 'projects/detail.html'
     context_object_name = 'project'
+    query_budget = 4
 
     def get_queryset(self):
-        """Restrict which projects user can view"""
+        """
+        Restrict which projects user can view. Each rule is a condition on
+        the one row fetched by pk (an EXISTS probe on a unique index for the
+        student ones), so nothing is joined or deduplicated.
+        """
         user = self.request.user
+        profile = self.request.profile
+        queryset = Project.objects.select_related('company', 'university').annotate(
+            application_count=count_subquery(ProjectApplication.objects.all()),
+        )
 
         if not user.is_authenticated:
             # Anonymous users can only see open projects
-            return Project.objects.filter(status='open')
+            return queryset.filter(status='open')
 
-        # Students can see open projects + projects they applied to
-        if user.user_type == 'student' and hasattr(user, 'student_profile'):
-            return Project.objects.filter(
-                Q(status='open') |  # Open projects
-                Q(assigned_students=user.student_profile) |  # Assigned projects
-                Q(applications__student=user.student_profile)  # Applied projects
-            ).distinct()
+        # Students can see open projects + projects they applied to or are assigned to
+        if user.user_type == 'student' and profile is not None:
+            return queryset.annotate(
+                has_applied=applied_by(profile),
+                is_assigned=assigned_to(profile),
+            ).filter(Q(status='open') | Q(is_assigned=True) | Q(has_applied=True))
 
         # Companies can see only their own projects
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return Project.objects.filter(company=user.company_profile)
+        if user.user_type == 'company' and profile is not None:
+            return queryset.filter(company=profile)
 
         # Universities can see projects submitted to them
-        if user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return Project.objects.filter(university=user.university_profile)
+        if user.user_type == 'university' and profile is not None:
+            return queryset.filter(university=profile)
 
         # Default: only open projects
-        return Project.objects.filter(status='open')
+        return queryset.filter(status='open')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         project = self.object
         user = self.request.user
+        profile = self.request.profile
 
         if user.is_authenticated:
-            if user.user_type == 'student' and hasattr(user, 'student_profile'):
-                context['has_applied'] = ProjectApplication.objects.filter(
-                    project=project,
-                    student=user.student_profile
-                ).exists()
-
-            if user.user_type == 'company' and hasattr(user, 'company_profile'):
-                # FIX: Check if project.company exists before accessing .user
-                if project.company and project.company.user == user:
+            if user.user_type == 'student' and profile is not None:
+                context['has_applied'] = project.has_applied
+
+            if user.user_type == 'company' and profile is not None:
+                if project.company_id == profile.pk:
                     context['applications'] = project.applications.all()
                     context['can_manage'] = True
 
-            if user.user_type == 'university' and hasattr(user, 'university_profile'):
-                if project.university.user == user:
+            if user.user_type == 'university' and profile is not None:
+                if project.university_id == profile.pk:
                     context['can_review'] = True
                     # NEW: Add can_manage for university-posted projects
                     context['can_manage'] = project.posted_by_university
@@ -175,7 +257,7 @@ class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
     def test_func(self):
         # Allow both companies and universities to post
         if self.request.user.user_type == 'company':
-            profile = getattr(self.request.user, 'company_profile', None)
+            profile = self.request.profile
             # UPDATED: Companies must be verified to post
             if not profile or not profile.is_verified:
                 messages.error(
@@ -185,7 +267,7 @@ class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
                 return False
             return True
         elif self.request.user.user_type == 'university':
-            return hasattr(self.request.user, 'university_profile')
+            return self.request.profile is not None
         return False
 
     def get_context_data(self, **kwargs):
@@ -199,14 +281,14 @@ class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
 
         if user.user_type == 'company':
             # Company posting
-            form.instance.company = user.company_profile
+            form.instance.company = self.request.profile
             form.instance.poster_type = 'company'
             form.instance.posted_by_university = False
             form.instance.status = 'pending_review'
             form.instance.submitted_for_review_at = timezone.now()
 
             # Increment company's project count
-            company = user.company_profile
+            company = self.request.profile
             company.total_projects_posted += 1
             company.save()
 
@@ -214,7 +296,7 @@ class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
 
         elif user.user_type == 'university':
             # University posting - auto-approved
-            form.instance.university = user.university_profile
+            form.instance.university = self.request.profile
             form.instance.poster_type = 'university'
             form.instance.posted_by_university = True
             form.instance.company = None
@@ -223,7 +305,10 @@ class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
 
             messages.success(self.request, 'Project posted successfully and is now open for applications!')
 
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        if self.object.status == 'open':
+            notify_matches(self.object)
+        return response
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
@@ -235,18 +320,15 @@ class ProjectCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         return form
 
 
-class ProjectUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class ProjectUpdateView(LoginRequiredMixin, ProjectPermissionMixin, UpdateView):
     """Edit project (Company only, before approval)"""
     model = Project
     form_class = ProjectForm
     template_name = 'projects/edit.html'
+    permission_rules = ('company',)
 
     def test_func(self):
-        project = self.get_object()
-        return (self.request.user.user_type == 'company' and
-                hasattr(self.request.user, 'company_profile') and
-                project.company.user == self.request.user and
-                project.status in ['draft', 'rejected'])
+        return super().test_func() and self.get_project().status in ['draft', 'rejected']
 
     def get_success_url(self):
         return reverse_lazy('projects:detail', kwargs={'pk': self.object.pk})
@@ -256,24 +338,19 @@ class ProjectUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return super().form_valid(form)
 
 
-class ProjectDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class ProjectDeleteView(LoginRequiredMixin, ProjectPermissionMixin, DeleteView):
     """Delete project (Company only)"""
     model = Project
     template_name = 'projects/delete.html'
     success_url = reverse_lazy('projects:list')
-
-    def test_func(self):
-        project = self.get_object()
-        return (self.request.user.user_type == 'company' and
-                hasattr(self.request.user, 'company_profile') and
-                project.company.user == self.request.user)
+    permission_rules = ('company',)
 
     def delete(self, request, *args, **kwargs):
         messages.success(request, 'Project deleted successfully!')
         return super().delete(request, *args, **kwargs)
 
 
-class ProjectApplyView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
+class ProjectApplyView(LoginRequiredMixin, ProjectPermissionMixin, CreateView):
     """Apply to project (Student only)"""
     model = ProjectApplication
     form_class = ProjectApplicationForm
@@ -282,18 +359,15 @@ class ProjectApplyView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
     def test_func(self):
         if self.request.user.user_type != 'student':
             return False
-        if not hasattr(self.request.user, 'student_profile'):
+        if self.request.profile is None:
             return False
 
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        project = self.get_project()
         if project.status != 'open':
             messages.warning(self.request, 'This project is not open for applications.')
             return False
 
-        if ProjectApplication.objects.filter(
-                project=project,
-                student=self.request.user.student_profile
-        ).exists():
+        if membership(self.request).has_applied(project):
             messages.warning(self.request, 'You have already applied to this project!')
             return False
 
@@ -301,13 +375,13 @@ class ProjectApplyView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['project'] = get_object_or_404(Project, pk=self.kwargs['pk'])
+        context['project'] = self.get_project()
         return context
 
     def form_valid(self, form):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        project = self.get_project()
         form.instance.project = project
-        form.instance.student = self.request.user.student_profile
+        form.instance.student = self.request.profile
         form.instance.status = 'pending'
 
         messages.success(
@@ -320,30 +394,31 @@ class ProjectApplyView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         return reverse_lazy('projects:my_applications')
 
 
-class MyApplicationsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class MyApplicationsView(LoginRequiredMixin, UserPassesTestMixin, CursorPaginationMixin, ListView):
     """View student's applications"""
     model = ProjectApplication
     template_name = 'projects/my_applications.html'
     context_object_name = 'applications'
     paginate_by = 10
+    query_budget = 7
 
     def test_func(self):
         return (self.request.user.user_type == 'student' and
-                hasattr(self.request.user, 'student_profile'))
+                self.request.profile is not None)
 
     def get_queryset(self):
         return ProjectApplication.objects.filter(
-            student=self.request.user.student_profile
+            student=self.request.profile
         ).select_related('project', 'project__company').order_by('-created_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        student = self.request.user.student_profile
-        qs = self.get_queryset()
+        student = self.request.profile
 
-        context['pending_count'] = qs.filter(status='pending').count()
-        context['accepted_count'] = qs.filter(status='accepted').count()
-        context['rejected_count'] = qs.filter(status='rejected').count()
+        counts = owner_counts('student', student.pk, 'application')['application']
+        context['pending_count'] = counts['pending']
+        context['accepted_count'] = counts['accepted']
+        context['rejected_count'] = counts['rejected']
         context['assigned_projects'] = student.assigned_projects.filter(
             status='in_progress'
         ).order_by('-created_at')
@@ -351,49 +426,52 @@ class MyApplicationsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         return context
 
 
-class ManageApplicationsView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class ManageApplicationsView(LoginRequiredMixin, ProjectPermissionMixin, DetailView):
     """Company view to manage applications"""
     model = Project
     template_name = 'projects/manage_applications.html'
     context_object_name = 'project'
-
-    def test_func(self):
-        project = self.get_object()
-        user = self.request.user
-
-        # Allow if company owns the project
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return project.company and project.company.user == user
-
-        # Allow if university posted the project
-        if user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return project.posted_by_university and project.university.user == user
-
-        return False
+    # 5 listing all applications; ?ranked=1 also reads the required and matching skills
+    query_budget = 7
+    # The owning company, or the university if it posted the project
+    permission_rules = ('poster',)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         project = self.object
 
-        context['applications'] = project.applications.all().order_by('-created_at')
-        context['pending_count'] = project.applications.filter(status='pending').count()
-        context['accepted_count'] = project.applications.filter(status='accepted').count()
-        context['rejected_count'] = project.applications.filter(status='rejected').count()
+        if self.request.GET.get('ranked') == '1':
+            context['ranked_mode'] = True
+            applications, required_skill_count = rank_applications(project, self.get_top_k())
+            context['applications'] = applications
+            # matched_skills counts catalogue skills, so this is the denominator, not skills_list
+            context['required_skill_count'] = required_skill_count
+        else:
+            context['applications'] = project.applications.select_related('student__user').order_by('-created_at')
+        counts = owner_counts('project', project.pk, 'application')['application']
+        context['total_count'] = counts['total']
+        context['pending_count'] = counts['pending']
+        context['accepted_count'] = counts['accepted']
+        context['rejected_count'] = counts['rejected']
 
         return context
 
+    def get_top_k(self):
+        try:
+            return min(max(int(self.request.GET.get('top', DEFAULT_TOP_K)), 1), MAX_TOP_K)
+        except ValueError:
+            return DEFAULT_TOP_K
 
-class ApplicationActionView(LoginRequiredMixin, UserPassesTestMixin, View):
-    """Accept or reject an application"""
 
-    def test_func(self):
-        application = get_object_or_404(ProjectApplication, pk=self.kwargs.get('application_id'))
-        return (self.request.user.user_type == 'company' and
-                hasattr(self.request.user, 'company_profile') and
-                application.project.company.user == self.request.user)
+class ApplicationActionView(LoginRequiredMixin, ProjectPermissionMixin, View):
+    """Accept or reject an application"""
+    permission_model = ProjectApplication
+    permission_url_kwarg = 'application_id'
+    permission_rules = ('company',)
+    permission_select_related = ('student__user',)
 
     def post(self, request, pk, application_id):
-        application = get_object_or_404(ProjectApplication, pk=application_id)
+        application = self.get_permission_object()
         project = application.project
         action = request.POST.get('action')
 
@@ -435,17 +513,17 @@ class PendingReviewView(LoginRequiredMixin, UserPassesTestMixin, ListView):
 
     def test_func(self):
         return (self.request.user.user_type == 'university' and
-                hasattr(self.request.user, 'university_profile'))
+                self.request.profile is not None)
 
     def get_queryset(self):
         return Project.objects.filter(
-            university=self.request.user.university_profile,
+            university=self.request.profile,
             status='pending_review'
         ).order_by('-submitted_for_review_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        profile = self.request.user.university_profile
+        profile = self.request.profile
         context['pending_count'] = self.get_queryset().count()
         context['total_projects'] = profile.projects.count()
         return context
@@ -456,15 +534,16 @@ class ProjectReviewView(LoginRequiredMixin, UserPassesTestMixin, View):
 
     def test_func(self):
         return (self.request.user.user_type == 'university' and
-                hasattr(self.request.user, 'university_profile'))
+                self.request.profile is not None)
 
     def post(self, request, pk):
         project = get_object_or_404(
             Project,
             pk=pk,
-            university=request.user.university_profile
+            university=request.profile
         )
         action = request.POST.get('action')
+        was_open = project.status == 'open'
 
         if action == 'approve':
             project.status = 'open'
@@ -476,30 +555,27 @@ class ProjectReviewView(LoginRequiredMixin, UserPassesTestMixin, View):
             messages.warning(request, f'Project "{project.title}" rejected.')
 
         project.save()
+        # Saved searches are told once, when the project opens, not on every re-save
+        if project.status == 'open' and not was_open:
+            notify_matches(project)
         return redirect('projects:pending_review')
 
 
-class SubmitDeliverableView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
+class SubmitDeliverableView(LoginRequiredMixin, ProjectPermissionMixin, CreateView):
     """Submit project deliverable (Student only)"""
     model = Deliverable
     form_class = DeliverableForm
     template_name = 'projects/submit_deliverable.html'
-
-    def test_func(self):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        return (self.request.user.user_type == 'student' and
-                hasattr(self.request.user, 'student_profile') and
-                self.request.user.student_profile in project.assigned_students.all())
+    permission_rules = ('assigned_student',)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['project'] = get_object_or_404(Project, pk=self.kwargs['pk'])
+        context['project'] = self.get_project()
         return context
 
     def form_valid(self, form):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        form.instance.project = project
-        form.instance.student = self.request.user.student_profile
+        form.instance.project = self.get_project()
+        form.instance.student = self.request.profile
 
         messages.success(self.request, 'Deliverable submitted successfully!')
         return super().form_valid(form)
@@ -510,25 +586,13 @@ class SubmitDeliverableView(LoginRequiredMixin, UserPassesTestMixin, CreateView)
 
 # === MILESTONE & DELIVERABLE VIEWS ===
 
-class ProjectWorkspaceView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class ProjectWorkspaceView(LoginRequiredMixin, ProjectPermissionMixin, DetailView):
     """Main project workspace showing milestones and deliverables"""
     model = Project
     template_name = 'projects/workspace.html'
     context_object_name = 'project'
-
-    def test_func(self):
-        project = self.get_object()
-        user = self.request.user
-
-        # Allow company/university who posted it, or assigned students
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return project.company and project.company.user == user
-        elif user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return project.posted_by_university and project.university.user == user
-        elif user.user_type == 'student' and hasattr(user, 'student_profile'):
-            return user.student_profile in project.assigned_students.all()
-
-        return False
+    # Allow company/university who posted it, or assigned students
+    permission_rules = ('poster', 'assigned_student')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -548,59 +612,37 @@ class ProjectWorkspaceView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
         return context
 
 
-class ProjectMilestonesView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class ProjectMilestonesView(LoginRequiredMixin, ProjectPermissionMixin, ListView):
     """List all milestones for a project"""
     model = Milestone
     template_name = 'projects/milestones.html'
     context_object_name = 'milestones'
-
-    def test_func(self):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        user = self.request.user
-
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return project.company and project.company.user == user
-        elif user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return project.university.user == user
-        elif user.user_type == 'student' and hasattr(user, 'student_profile'):
-            return user.student_profile in project.assigned_students.all()
-
-        return False
+    permission_rules = ('company', 'university', 'assigned_student')
 
     def get_queryset(self):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        return project.milestones.all().order_by('order')
+        return self.get_project().milestones.all().order_by('order')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['project'] = get_object_or_404(Project, pk=self.kwargs['pk'])
+        context['project'] = self.get_project()
+        context['is_assigned'] = membership(self.request).is_assigned(self.get_project())
         return context
 
 
-class CreateMilestoneView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
+class CreateMilestoneView(LoginRequiredMixin, ProjectPermissionMixin, CreateView):
     """Create milestone (Company/University only)"""
     model = Milestone
     form_class = MilestoneForm
     template_name = 'projects/create_milestone.html'
-
-    def test_func(self):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        user = self.request.user
-
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return project.company and project.company.user == user
-        elif user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return project.posted_by_university and project.university.user == user
-
-        return False
+    permission_rules = ('poster',)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['project'] = get_object_or_404(Project, pk=self.kwargs['pk'])
+        context['project'] = self.get_project()
         return context
 
     def form_valid(self, form):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        project = self.get_project()
         form.instance.project = project
 
         # Auto-set order to be last
@@ -614,53 +656,42 @@ class CreateMilestoneView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         return reverse_lazy('projects:workspace', kwargs={'pk': self.kwargs['pk']})
 
 
-class UpdateMilestoneView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class UpdateMilestoneView(LoginRequiredMixin, ProjectPermissionMixin, UpdateView):
     """Update milestone"""
     model = Milestone
     form_class = MilestoneForm
     template_name = 'projects/edit_milestone.html'
-
-    def test_func(self):
-        milestone = self.get_object()
-        user = self.request.user
-
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return milestone.project.company and milestone.project.company.user == user
-        elif user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return milestone.project.posted_by_university and milestone.project.university.user == user
-
-        return False
+    permission_model = Milestone
+    permission_rules = ('poster',)
 
     def get_success_url(self):
         return reverse_lazy('projects:workspace', kwargs={'pk': self.object.project.pk})
 
 
-class ReviewDeliverableView(LoginRequiredMixin, UserPassesTestMixin, View):
+class ReviewDeliverableView(LoginRequiredMixin, ProjectPermissionMixin, View):
     """Company/University reviews and approves/rejects deliverable"""
+    permission_model = Deliverable
+    permission_url_kwarg = 'deliverable_id'
+    permission_rules = ('poster',)
+    permission_select_related = ('milestone',)
 
-    def test_func(self):
-        deliverable = get_object_or_404(Deliverable, pk=self.kwargs.get('deliverable_id'))
-        user = self.request.user
-
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return deliverable.project.company and deliverable.project.company.user == user
-        elif user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return deliverable.project.posted_by_university and deliverable.project.university.user == user
-
-        return False
+    def get_permission_object(self):
+        deliverable = super().get_permission_object()
+        if deliverable.project_id != self.kwargs['pk']:
+            raise Http404('No Deliverable matches the given query.')
+        return deliverable
 
     def get(self, request, pk, deliverable_id):
-        project = get_object_or_404(Project, pk=pk)
-        deliverable = get_object_or_404(Deliverable, pk=deliverable_id, project=project)
+        deliverable = self.get_permission_object()
 
         return render(request, 'projects/review_deliverable.html', {
-            'project': project,
+            'project': deliverable.project,
             'deliverable': deliverable,
         })
 
     def post(self, request, pk, deliverable_id):
-        project = get_object_or_404(Project, pk=pk)
-        deliverable = get_object_or_404(Deliverable, pk=deliverable_id, project=project)
+        deliverable = self.get_permission_object()
+        project = deliverable.project
 
         action = request.POST.get('action')
         feedback = request.POST.get('feedback', '')
@@ -699,21 +730,12 @@ class ReviewDeliverableView(LoginRequiredMixin, UserPassesTestMixin, View):
         return redirect('projects:workspace', pk=project.pk)
 
 
-class DeleteMilestoneView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class DeleteMilestoneView(LoginRequiredMixin, ProjectPermissionMixin, DeleteView):
     """Delete milestone"""
     model = Milestone
     template_name = 'projects/delete_milestone.html'
-
-    def test_func(self):
-        milestone = self.get_object()
-        user = self.request.user
-
-        if user.user_type == 'company' and hasattr(user, 'company_profile'):
-            return milestone.project.company and milestone.project.company.user == user
-        elif user.user_type == 'university' and hasattr(user, 'university_profile'):
-            return milestone.project.posted_by_university and milestone.project.university.user == user
-
-        return False
+    permission_model = Milestone
+    permission_rules = ('poster',)
 
     def get_success_url(self):
         return reverse_lazy('projects:workspace', kwargs={'pk': self.object.project.pk})
@@ -723,21 +745,22 @@ class DeleteMilestoneView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
-class UniversityApplicationsView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class UniversityApplicationsView(LoginRequiredMixin, UserPassesTestMixin, CursorPaginationMixin, ListView):
     """University view to manage applications to THEIR OWN projects"""
     model = ProjectApplication
     template_name = 'projects/university_applications.html'
     context_object_name = 'applications'
     paginate_by = 20
+    query_budget = 5
 
     def test_func(self):
         """Only allow universities"""
         return (self.request.user.user_type == 'university' and
-                hasattr(self.request.user, 'university_profile'))
+                self.request.profile is not None)
 
     def get_queryset(self):
         """Get applications to university's own projects"""
-        university = self.request.user.university_profile
+        university = self.request.profile
 
         # Get applications to projects posted BY this university
         queryset = ProjectApplication.objects.filter(
@@ -758,19 +781,14 @@ class UniversityApplicationsView(LoginRequiredMixin, UserPassesTestMixin, ListVi
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        university = self.request.user.university_profile
-
-        # Get all applications to university's projects
-        all_apps = ProjectApplication.objects.filter(
-            project__university=university,
-            project__posted_by_university=True
-        )
+        university = self.request.profile
 
-        # Stats
-        context['pending_count'] = all_apps.filter(status='pending').count()
-        context['accepted_count'] = all_apps.filter(status='accepted').count()
-        context['rejected_count'] = all_apps.filter(status='rejected').count()
-        context['total_count'] = all_apps.count()
+        # Stats of applications to projects the university posted
+        counts = owner_counts('university', university.pk, 'application')['application']
+        context['pending_count'] = counts['pending']
+        context['accepted_count'] = counts['accepted']
+        context['rejected_count'] = counts['rejected']
+        context['total_count'] = counts['total']
 
         # Current filter
         context['current_status'] = self.request.GET.get('status', 'all')
@@ -778,19 +796,15 @@ class UniversityApplicationsView(LoginRequiredMixin, UserPassesTestMixin, ListVi
         return context
 
 
-class UniversityApplicationActionView(LoginRequiredMixin, UserPassesTestMixin, View):
+class UniversityApplicationActionView(LoginRequiredMixin, ProjectPermissionMixin, View):
     """University accepts or rejects applications to their own projects"""
-
-    def test_func(self):
-        """Verify university owns this project"""
-        application = get_object_or_404(ProjectApplication, pk=self.kwargs.get('application_id'))
-        return (self.request.user.user_type == 'university' and
-                hasattr(self.request.user, 'university_profile') and
-                application.project.posted_by_university and
-                application.project.university.user == self.request.user)
+    permission_model = ProjectApplication
+    permission_url_kwarg = 'application_id'
+    permission_rules = ('posting_university',)
+    permission_select_related = ('student__user',)
 
     def post(self, request, application_id):
-        application = get_object_or_404(ProjectApplication, pk=application_id)
+        application = self.get_permission_object()
         project = application.project
         action = request.POST.get('action')
 
@@ -835,3 +849,118 @@ class UniversityApplicationActionView(LoginRequiredMixin, UserPassesTestMixin, V
         # Redirect back to applications page
         return redirect('projects:university_applications')
 
+
+class BulkApplicationActionView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Accept, reject or shortlist many applications at once (Company or posting University)"""
+
+    def test_func(self):
+        user = self.request.user
+        return ((user.user_type == 'company' and self.request.profile is not None) or
+                (user.user_type == 'university' and self.request.profile is not None))
+
+    def post(self, request):
+        action = request.POST.get('action')
+        try:
+            application_ids = list(dict.fromkeys(int(pk) for pk in request.POST.getlist('application_ids')))
+        except ValueError:
+            return self.respond_error('Invalid application id.')
+        if action not in BULK_ACTIONS:
+            return self.respond_error('Unknown action.')
+        if not application_ids:
+            return self.respond_error('Select at least one application.')
+        if len(application_ids) > MAX_BULK_IDS:
+            return self.respond_error(f'Select at most {MAX_BULK_IDS} applications at a time.')
+
+        results = apply_bulk_action(request.user.user_type, request.profile, application_ids, action)
+
+        if self.wants_json():
+            return JsonResponse({'action': action, 'results': {str(pk): result for pk, result in results.items()}})
+
+        new_status = BULK_ACTIONS[action][0]
+        done = sum(1 for result in results.values() if result == new_status)
+        skipped = len(results) - done
+        messages.success(request, f'{new_status.capitalize()} {done} application{"s" if done != 1 else ""}.')
+        if skipped:
+            messages.warning(request, f'{skipped} application{"s were" if skipped != 1 else " was"} '
+                                      f'not changed (already {new_status}, reviewed, withdrawn or not yours).')
+        return redirect(self.get_next_url())
+
+    def wants_json(self):
+        return 'application/json' in self.request.headers.get('Accept', '')
+
+    def respond_error(self, message):
+        if self.wants_json():
+            return JsonResponse({'error': message}, status=400)
+        messages.error(self.request, message)
+        return redirect(self.get_next_url())
+
+    def get_next_url(self):
+        next_url = self.request.POST.get('next', '')
+        if url_has_allowed_host_and_scheme(next_url, allowed_hosts={self.request.get_host()},
+                                           require_https=self.request.is_secure()):
+            return next_url
+        if self.request.user.user_type == 'university':
+            return reverse('projects:university_applications')
+        return reverse('accounts:company_projects')
+
+
+class SaveSearchView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Store the current project list filters as a saved search (Student only)"""
+
+    def test_func(self):
+        return (self.request.user.user_type == 'student' and
+                self.request.profile is not None)
+
+    def post(self, request):
+        student = request.profile
+        if not student.university:
+            messages.error(request, 'Select your university before saving searches.')
+            return redirect('projects:list')
+
+        form = SavedSearchForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, 'Could not save this search: ' + ' '.join(
+                error for errors in form.errors.values() for error in errors
+            ))
+            return redirect('projects:list')
+
+        saved_search = create_saved_search(student, **form.cleaned_data)
+        messages.success(request, f'Saved search "{saved_search.name}". '
+                                  f'You will be notified when a matching project opens.')
+        return redirect(saved_search.get_list_url())
+
+
+class SavedSearchListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+    """Student's saved searches and the notifications they produced"""
+    model = SavedSearch
+    template_name = 'projects/saved_searches.html'
+    context_object_name = 'saved_searches'
+    query_budget = 5
+
+    def test_func(self):
+        return (self.request.user.user_type == 'student' and
+                self.request.profile is not None)
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(student=self.request.profile)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        notifications = Notification.objects.filter(user=self.request.user)
+        context['notifications'] = list(notifications.select_related('project')[:20])
+        notifications.filter(is_read=False).update(is_read=True)
+        return context
+
+
+class SavedSearchDeleteView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Delete one of the student's saved searches"""
+
+    def test_func(self):
+        return (self.request.user.user_type == 'student' and
+                self.request.profile is not None)
+
+    def post(self, request, pk):
+        saved_search = get_object_or_404(SavedSearch, pk=pk, student=request.profile)
+        saved_search.delete()
+        messages.success(request, f'Deleted saved search "{saved_search.name}".')
+        return redirect('projects:saved_searches')
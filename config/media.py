@@ -0,0 +1,253 @@
+"""
+Purpose: Uploaded files under MEDIA_ROOT, served only to the people allowed to see them
+Contains:
+
+MEDIA_RULES (upload directory -> who may download files in it)
+is_public (is a stored file name in a public directory)
+can_download (does a rule allow the request on a stored file name)
+serve_file (hand the file to the front-end server, or stream it with ranges)
+media_view (the MEDIA_URL endpoint: check the rule, then serve_file)
+
+Every file is looked up by the name stored on the rows of its directory's
+model (the FileFields are indexed for this; with deduplicated storage
+several rows can hold the same name, and the same blob can sit behind names
+in several directories, so a name only counts where a row of that directory
+holds it). Logos and profile pictures are then public; everything else is
+checked against the owners of any of those rows: verification documents
+against the company and universities, resumes against the student, their
+university and whoever they applied to, JDs like the project page,
+deliverables like the project workspace. Files no row points at, and
+unknown directories, are staff only.
+
+With MEDIA_DELIVERY = 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache,
+lighttpd) Django only answers the access check and the front-end server
+sends the bytes, ranges and caching headers itself. Otherwise the file is
+streamed from disk in CHUNK_SIZE blocks, never read into memory whole,
+with an ETag (If-None-Match / If-Range) and single byte-range requests
+(206 / 416), so a download of a large deliverable can be resumed.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+
+from apps.accounts.models import Company, Student, University
+from apps.projects.membership import Assignment, membership
+from apps.projects.models import Project, ProjectApplication
+from apps.projects.permissions import has_access
+
+CHUNK_SIZE = 64 * 1024
+PUBLIC_MAX_AGE = 24 * 60 * 60
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _public(model, field):
+    """Rule letting anyone download a name some row of model holds in field"""
+    def rule(request, name):
+        return model.objects.filter(**{field: name}).exists()
+    rule.public = True
+    return rule
+
+
+def _company_document(request, name):
+    companies = Company.objects.filter(verification_document=name).values_list('pk', flat=True)
+    user_type, profile = request.user.user_type, request.profile
+    # Any university may verify any company
+    if user_type == 'university':
+        return companies.exists()
+    return user_type == 'company' and profile is not None and companies.filter(pk=profile.pk).exists()
+
+
+def _resume(request, name):
+    students = list(Student.objects.filter(resume=name).values_list('pk', 'university_id'))
+    profile = request.profile
+    if not students or profile is None:
+        return False
+    user_type = request.user.user_type
+    if user_type == 'student':
+        return any(pk == profile.pk for pk, _ in students)
+    if user_type == 'university' and any(university_id == profile.pk for _, university_id in students):
+        return True
+    # Companies and universities see the resumes of students on or applying to their projects
+    owner = {'company': 'project__company', 'university': 'project__university'}.get(user_type)
+    if owner is None:
+        return False
+    lookup = {'student_id__in': [pk for pk, _ in students], owner: profile.pk}
+    return (
+        ProjectApplication.objects.filter(**lookup).exists() or
+        Assignment.objects.filter(**lookup).exists()
+    )
+
+
+def _project_attachment(request, name):
+    projects = Project.objects.filter(attachment=name).only(
+        'pk', 'status', 'company_id', 'university_id', 'posted_by_university',
+    )
+    member = membership(request)
+    # The same people as ProjectDetailView
+    return any(
+        project.status == 'open' or (request.profile is not None and (
+            has_access(request, project, ('company', 'university')) or
+            member.is_assigned(project) or member.has_applied(project)
+        ))
+        for project in projects
+    )
+
+
+def _deliverable(request, name):
+    if request.profile is None:
+        return False
+    projects = Project.objects.filter(deliverables__file=name).distinct().only(
+        'pk', 'company_id', 'university_id', 'posted_by_university',
+    )
+    # The same people as the project's milestones page
+    return any(has_access(request, project, ('company', 'university', 'assigned_student')) for project in projects)
+
+
+# upload_to directory: (request, stored file name) -> bool
+MEDIA_RULES = {
+    'universities': _public(University, 'logo'),
+    'companies': _public(Company, 'logo'),
+    'students': _public(Student, 'profile_picture'),
+    'company_docs': _company_document,
+    'resumes': _resume,
+    'project_attachments': _project_attachment,
+    'deliverables': _deliverable,
+}
+
+
+def _rule(name):
+    return MEDIA_RULES.get(name.split('/', 1)[0])
+
+
+def is_public(name):
+    """Is name in a directory anyone may download from (once a row holds it)"""
+    return getattr(_rule(name), 'public', False)
+
+
+def can_download(request, name):
+    """Does the rule of name's upload directory let the request download it"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    rule = _rule(name)
+    if rule is None:
+        return False
+    if not is_public(name) and not request.user.is_authenticated:
+        return False
+    return rule(request, name)
+
+
+def _etag(stat):
+    return '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+
+
+def _byte_range(header, size):
+    """(start, end) inclusive for a single 'bytes=' range, None to send it all, or 'invalid'"""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multiple ranges or other units: a full 200 is a valid answer
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return 'invalid'
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return 'invalid'
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, name, path, public=False):
+    """Response delivering the file at path (stored as name) to an authorized request"""
+    content_type, encoding = mimetypes.guess_type(name)  # path may be an extensionless blob
+    content_type = content_type or 'application/octet-stream'
+    delivery = getattr(settings, 'MEDIA_DELIVERY', 'django')
+
+    if delivery == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        location = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + quote(location)
+    elif delivery == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        stat = os.stat(path)
+        etag = _etag(stat)
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            response = _stream(request, path, stat, etag, content_type)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Accept-Ranges'] = 'bytes'
+
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Cache-Control'] = 'public, max-age=%d' % PUBLIC_MAX_AGE if public else 'private, no-cache'
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+def _stream(request, path, stat, etag, content_type):
+    size = stat.st_size
+    requested = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if requested and if_range and if_range not in parse_etags(etag) and if_range != http_date(stat.st_mtime):
+        requested = None  # the client's partial copy is stale: send the whole file
+
+    byte_range = _byte_range(requested, size) if requested and size else None
+    if byte_range == 'invalid':
+        response = HttpResponse(status=416, content_type=content_type)
+        response['Content-Range'] = 'bytes */%d' % size
+        return response
+    if byte_range is None:
+        # FileResponse streams in blocks and lets the server use wsgi.file_wrapper (sendfile)
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+        response.block_size = CHUNK_SIZE
+        return response
+
+    start, end = byte_range
+    response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206, content_type=content_type)
+    response['Content-Length'] = str(end - start + 1)
+    response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, size)
+    return response
+
+
+def media_view(request, path):
+    """A file under MEDIA_ROOT, if MEDIA_RULES let the request have it"""
+    name = posixpath.normpath(path).lstrip('/')
+    if name.startswith('..') or name != path:
+        raise Http404('No such file.')
+    if not can_download(request, name):
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        raise PermissionDenied
+
+    try:
+        full_path = default_storage.path(name)
+    except SuspiciousFileOperation:
+        raise Http404('No such file.')
+    if not os.path.isfile(full_path):
+        raise Http404('No such file.')
+    return serve_file(request, name, full_path, public=is_public(name))
@@ -0,0 +1,202 @@
+"""
+Purpose: Request, query and cache metrics in Prometheus text format
+Contains:
+
+METRICS (name -> type, help text, label names, histogram buckets)
+observe / inc (record a histogram sample / add to a counter)
+record_cache (count cache hits and misses of one named cache)
+flush / collect (share this process's values / add up every process's)
+render (collected values -> Prometheus exposition text)
+metrics_view (the /metrics endpoint, staff or METRICS_TOKEN only)
+
+Each process keeps its own values in memory; MetricsMiddleware records one
+latency and one query-count sample per request, labelled by resolved URL
+name. With several gunicorn workers a scrape only reaches one of them, so
+when METRICS_DIR is set every process also writes its values to its own
+file there (at most every METRICS_FLUSH_INTERVAL seconds and at exit) and
+/metrics adds up all the files. Files are named per process start, not
+just per pid, so a restarted worker never overwrites the totals of the one
+it replaced; everything here is a counter, so dead workers' files keep
+counting towards the totals, the same as the prometheus_client multiprocess
+mode. Clear the directory when the whole server is (re)started.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+# name: (type, help, label names, buckets)
+METRICS = {
+    'http_request_duration_seconds': (
+        'histogram', 'Request latency by resolved URL name', ('view', 'method', 'status'), LATENCY_BUCKETS,
+    ),
+    'http_request_db_queries': (
+        'histogram', 'Database queries per request by resolved URL name', ('view', 'method'), QUERY_BUCKETS,
+    ),
+    'cache_requests_total': (
+        'counter', 'Cache lookups by cache and result', ('cache', 'result'), None,
+    ),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_lock = threading.Lock()
+_values = {}  # (name, label values): counter value, or [count per bucket..., +Inf count, sum]
+_process = {'pid': None, 'file': None, 'flushed': 0.0}
+
+
+def _reset_after_fork():
+    # A forked worker (gunicorn --preload) must not report its parent's values as its own
+    if _process['pid'] != os.getpid():
+        _values.clear()
+        _process.update(pid=os.getpid(), file='%d-%s.json' % (os.getpid(), uuid.uuid4().hex[:8]), flushed=0.0)
+
+
+def observe(name, value, **labels):
+    """Record one sample of a histogram"""
+    _, _, label_names, buckets = METRICS[name]
+    key = (name, tuple(str(labels[label]) for label in label_names))
+    with _lock:
+        _reset_after_fork()
+        row = _values.get(key)
+        if row is None:
+            row = _values[key] = [0] * (len(buckets) + 1) + [0.0]
+        row[next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))] += 1
+        row[-1] += value
+
+
+def inc(name, amount=1, **labels):
+    """Add amount to a counter"""
+    _, _, label_names, _ = METRICS[name]
+    key = (name, tuple(str(labels[label]) for label in label_names))
+    with _lock:
+        _reset_after_fork()
+        _values[key] = _values.get(key, 0) + amount
+
+
+def record_cache(cache_name, hits=0, misses=0):
+    """Count hits and misses (numbers or booleans) of one named cache"""
+    if hits:
+        inc('cache_requests_total', int(hits), cache=cache_name, result='hit')
+    if misses:
+        inc('cache_requests_total', int(misses), cache=cache_name, result='miss')
+
+
+def _directory():
+    directory = getattr(settings, 'METRICS_DIR', '')
+    return Path(directory) if directory else None
+
+
+def flush(force=False):
+    """Write this process's values to METRICS_DIR, if set and due"""
+    directory = _directory()
+    if directory is None:
+        return
+    now = time.monotonic()
+    with _lock:
+        _reset_after_fork()
+        if not force and now - _process['flushed'] < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            return
+        _process['flushed'] = now
+        rows = [[name, list(labels), value] for (name, labels), value in _values.items()]
+        path = directory / _process['file']
+    directory.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(rows))
+    os.replace(temporary, path)  # atomic, so a scrape never reads half a file
+
+
+atexit.register(lambda: flush(force=True))
+
+
+def _add(totals, key, value):
+    if isinstance(value, list):
+        row = totals.setdefault(key, [0] * len(value))
+        for i, part in enumerate(value):
+            row[i] += part
+    else:
+        totals[key] = totals.get(key, 0) + value
+
+
+def collect():
+    """{(name, label values): value} summed over every process"""
+    flush(force=True)
+    with _lock:
+        own = {key: list(value) if isinstance(value, list) else value for key, value in _values.items()}
+        own_file = _process['file']
+    directory = _directory()
+    if directory is None:
+        return own
+
+    totals = {}
+    for path in directory.glob('*.json'):
+        try:
+            rows = json.loads(path.read_text()) if path.name != own_file else []
+        except (OSError, ValueError):
+            continue  # removed or replaced while we were reading it
+        for name, labels, value in rows:
+            if name in METRICS:
+                _add(totals, (name, tuple(labels)), value)
+    for key, value in own.items():
+        _add(totals, key, value)
+    return totals
+
+
+def _escape(value):
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _labels(pairs):
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value)) for name, value in pairs) if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(values):
+    """Prometheus text exposition of collect()'s result"""
+    lines = []
+    for name, (kind, help_text, label_names, buckets) in METRICS.items():
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s %s' % (name, kind))
+        for (metric, label_values), value in sorted(values.items()):
+            if metric != name:
+                continue
+            pairs = list(zip(label_names, label_values))
+            if kind == 'counter':
+                lines.append('%s%s %s' % (name, _labels(pairs), _number(value)))
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), value[:-1]):
+                cumulative += count
+                lines.append('%s_bucket%s %d' % (name, _labels(pairs + [('le', str(bound))]), cumulative))
+            lines.append('%s_sum%s %s' % (name, _labels(pairs), _number(value[-1])))
+            lines.append('%s_count%s %d' % (name, _labels(pairs), cumulative))
+    return '\n'.join(lines) + '\n'
+
+
+def _authorized(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    if token and header.startswith('Bearer ') and constant_time_compare(header[len('Bearer '):], token):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def metrics_view(request):
+    """Every process's metrics, for staff users and scrapers holding METRICS_TOKEN"""
+    if not _authorized(request):
+        raise PermissionDenied
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
@@ -0,0 +1,124 @@
+"""
+Purpose: Per-request database instrumentation
+Contains:
+
+QueryCountMiddleware (X-DB-Queries / X-DB-Time headers, per-view query budgets)
+MetricsMiddleware (latency and query-count histograms per URL name, see config.metrics)
+QueryBudgetExceeded (raised instead of logged when QUERY_BUDGET_RAISE is on)
+view_query_budget (the budget a view declares, if any)
+
+Turned on by QUERY_INSTRUMENTATION (defaults to DEBUG); when off the
+middleware removes itself at startup. Queries are counted and timed through
+connection.execute_wrapper on every configured database, so this works
+without DEBUG's query log and sees everything that runs inside the request,
+sessions and templates included. X-DB-Time is in milliseconds. Transaction
+control statements (BEGIN, SAVEPOINT, ...) are not counted.
+
+A view declares its budget as a class attribute, e.g. query_budget = 8 (or
+as an attribute of a function view). Going over it logs a warning on the
+'query_budget' logger, or raises QueryBudgetExceeded when QUERY_BUDGET_RAISE
+is set, as it should be in tests.
+
+MetricsMiddleware is on unless METRICS_ENABLED is turned off and feeds the
+/metrics endpoint; requests that resolve to no URL are all labelled
+'<unresolved>', so scanners cannot blow up the number of series.
+"""
+import logging
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger('query_budget')
+
+TRANSACTION_CONTROL = re.compile(r'\s*(BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b', re.I)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its query_budget"""
+
+
+def view_query_budget(view_func):
+    """query_budget of a resolved view (class-based or function), or None"""
+    return getattr(getattr(view_func, 'view_class', view_func), 'query_budget', None)
+
+
+class QueryCounter:
+    """execute_wrapper that counts queries and adds up their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if TRANSACTION_CONTROL.match(sql):
+            # BEGIN / SAVEPOINT of atomic() blocks, not a query the view asked for
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class QueryCountMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        response['X-DB-Queries'] = str(counter.count)
+        response['X-DB-Time'] = '%.3f' % (counter.seconds * 1000)
+        self.check_budget(request, counter.count)
+        return response
+
+    def check_budget(self, request, count):
+        match = request.resolver_match
+        budget = view_query_budget(match.func) if match else None
+        if budget is None or count <= budget:
+            return
+        message = '%s ran %d queries, over its budget of %d (%s)' % (
+            match.view_name, count, budget, request.get_full_path(),
+        )
+        if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        metrics.observe(
+            'http_request_duration_seconds', elapsed,
+            view=view, method=request.method, status=response.status_code,
+        )
+        metrics.observe('http_request_db_queries', counter.count, view=view, method=request.method)
+        metrics.flush()
+        return response
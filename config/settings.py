@@ -37,18 +37,33 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.MetricsMiddleware',  # Times the whole request, see /metrics
+    'config.middleware.QueryCountMiddleware',  # Before the rest, so it sees every query of the request
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For serving static files
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.accounts.profiles.ProfileMiddleware',  # request.profile
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+# X-DB-Queries / X-DB-Time headers and per-view query_budget checks
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=DEBUG, cast=bool)
+# Raise instead of logging when a view goes over its query_budget (tests, CI)
+QUERY_BUDGET_RAISE = config('QUERY_BUDGET_RAISE', default=False, cast=bool)
+
+# Prometheus metrics at /metrics (staff users, or scrapers sending "Authorization: Bearer METRICS_TOKEN")
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+# Shared by all worker processes, e.g. /run/uic-metrics; unset for a single process
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=int)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -102,6 +117,11 @@ AUTH_PASSWORD_VALIDATORS = [
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User'
 
+AUTHENTICATION_BACKENDS = [
+    'apps.accounts.profiles.ProfileBackend',  # Session user + role profile in one query
+    'django.contrib.auth.backends.ModelBackend',  # Sessions started before ProfileBackend
+]
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Asia/Kolkata'  # Change to your timezone
@@ -116,6 +136,30 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 # Media files (User uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Served by config.media.media_view after its access check. 'django' streams
+# the file itself; 'x-accel-redirect' (nginx, with an internal location at
+# MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or 'x-sendfile' (Apache, lighttpd)
+# leave sending it to the front-end server.
+MEDIA_DELIVERY = config('MEDIA_DELIVERY', default='django')
+MEDIA_ACCEL_PREFIX = config('MEDIA_ACCEL_PREFIX', default='/protected-media/')
+
+# Uploads are stored once per distinct content (apps/projects/blobs.py);
+# run `manage.py collect_blobs` periodically to drop unreferenced ones
+STORAGES = {
+    'default': {'BACKEND': 'apps.projects.blobs.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Facet counts, recommendation matrices and dashboard fragments are versioned
+# through tokens in the cache, so every worker process must see the same cache:
+# set REDIS_URL (needs the redis package). Without it the cache is local to the
+# process, which is only right for a single process such as runserver; the
+# projects.W001 check warns about it when DEBUG is off.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -6,9 +6,15 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 
+from config.media import media_view
+from config.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', TemplateView.as_view(template_name='home.html'), name='home'),
+    path('metrics', metrics_view, name='metrics'),
+    # Uploads, behind their access rules (in production too, see MEDIA_DELIVERY)
+    path(settings.MEDIA_URL.lstrip('/') + '<path:path>', media_view, name='media'),
 
     # App URLs
     path('accounts/', include('apps.accounts.urls')),
@@ -18,7 +24,6 @@ urlpatterns = [
     #path('reviews/', include('apps.reviews.urls')),
 ]
 
-# Serve media files in development
+# Serve static files in development
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)